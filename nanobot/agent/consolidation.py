@@ -0,0 +1,59 @@
+"""Scheduler for background memory consolidation jobs."""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+ConsolidationJob = Callable[[], Awaitable[None]]
+
+
+class ConsolidationScheduler:
+    """
+    Runs memory consolidation jobs in the background.
+
+    Jobs for one session run one at a time, in request order; jobs of
+    different sessions run concurrently up to ``max_concurrent``. A
+    coalescable request that arrives while an identical one is already
+    waiting is dropped: the waiting job reads the session when it starts,
+    so it covers every message added in the meantime.
+    """
+
+    def __init__(self, max_concurrent: int = 2):
+        self.max_concurrent = max(1, max_concurrent)
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self._pending: dict[str, deque[tuple[ConsolidationJob, bool]]] = {}
+        self._workers: dict[str, asyncio.Task[None]] = {}
+
+    def request(self, key: str, job: ConsolidationJob, coalesce: bool = True) -> None:
+        """
+        Queue a consolidation job for a session.
+
+        Args:
+            key: Session key; jobs with the same key never overlap.
+            job: Coroutine function doing the work.
+            coalesce: If True, skip the job when a coalescable one is already waiting.
+        """
+        queue = self._pending.setdefault(key, deque())
+        if coalesce and queue and queue[-1][1]:
+            logger.debug(f"Consolidation for {key} already queued, coalescing")
+            return
+        queue.append((job, coalesce))
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain(key))
+
+    async def _drain(self, key: str) -> None:
+        """Run the queued jobs of one session, holding a global slot for each."""
+        queue = self._pending[key]
+        try:
+            while queue:
+                job, _ = queue.popleft()
+                async with self._slots:
+                    try:
+                        await job()
+                    except Exception as e:
+                        logger.error(f"Memory consolidation for {key} failed: {e}")
+        finally:
+            self._pending.pop(key, None)
+            self._workers.pop(key, None)
@@ -2,12 +2,20 @@
 
 import base64
 import mimetypes
+import os
 import platform
+import time
 from pathlib import Path
 from typing import Any
 
+from loguru import logger
+
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
+from nanobot.providers.tokens import TokenCounter
+
+MEMORY_QUERY_MESSAGES = 4  # recent history messages that also steer memory fact selection
+REQUIREMENTS_RECHECK_SECONDS = 1.0  # how often SKILL.md files and PATH are re-checked
 
 
 class ContextBuilder:
@@ -15,40 +23,121 @@ class ContextBuilder:
     Builds the context (system prompt + messages) for the agent.
     
     Assembles bootstrap files, memory, skills, and conversation history
-    into a coherent prompt for the LLM.
+    into a coherent prompt for the LLM. With a token counter, history is
+    filled newest-first until the model's token budget is used up.
+
+    The file-backed prompt sections are cached and rebuilt only when the
+    (mtime, size) of a source file, the skill directories, or the PATH
+    directories used for skill requirement checks change. The individual
+    SKILL.md files, PATH and the environment are re-checked at most once
+    per ``REQUIREMENTS_RECHECK_SECONDS``.
+
+    In cache-friendly mode the system prompt holds only stable content
+    (identity, bootstrap files, skills) so providers can reuse the cached
+    prefix across turns and chats; the volatile parts (current time, session
+    info, memory) are prepended to the current user message instead.
+
+    With ``memory_top_k`` or ``memory_max_tokens`` set, a MEMORY.md that
+    exceeds either limit is not injected whole: only pinned facts and the
+    facts most relevant to the current message and recent history are.
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        tokens: TokenCounter | None = None,
+        max_history_tokens: int = 0,
+        cache_friendly: bool = False,
+        memory_top_k: int = 0,
+        memory_max_tokens: int = 0,
+        memory_pinned: bool = True,
+    ):
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self.tokens = tokens
+        self.max_history_tokens = max_history_tokens
+        self.cache_friendly = cache_friendly
+        self.memory_top_k = memory_top_k
+        self.memory_max_tokens = memory_max_tokens
+        self.memory_pinned = memory_pinned
+        self._sections_cache: tuple[tuple, dict[str, str]] | None = None
+        self._requirements_signature: tuple[float, tuple] | None = None
     
-    def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
+    def build_system_prompt(self, skill_names: list[str] | None = None, memory: str | None = None) -> str:
         """
         Build the system prompt from bootstrap files, memory, and skills.
         
         Args:
             skill_names: Optional list of skills to include.
+            memory: Memory section to use instead of the whole MEMORY.md.
         
         Returns:
             Complete system prompt.
         """
-        parts = []
-        
-        # Core identity
-        parts.append(self._get_identity())
+        sections = dict(self._get_file_sections())
+        if self.cache_friendly:
+            del sections["memory"]
+        elif memory is not None:
+            sections["memory"] = memory
+        parts = [self._get_identity(with_time=not self.cache_friendly), *filter(None, sections.values())]
+        return "\n\n---\n\n".join(parts)
+    
+    def build_runtime_context(
+        self, channel: str | None = None, chat_id: str | None = None, memory: str | None = None
+    ) -> str:
+        """Build the volatile context block (time, session, memory) used in cache-friendly mode."""
+        parts = [f"## Current Time\n{self._current_time()}"]
+        if channel and chat_id:
+            parts.append(f"## Current Session\nChannel: {channel}\nChat ID: {chat_id}")
+        if memory is None:
+            memory = self._get_file_sections()["memory"]
+        if memory:
+            parts.append(memory)
+        body = "\n\n".join(parts)
+        return f"[Runtime Context]\n{body}\n[/Runtime Context]"
+
+    def build_memory_section(self, query: str, history: list[dict[str, Any]] | None = None) -> str:
+        """
+        Build the memory section for a message.
+
+        Returns the whole MEMORY.md when relevance selection is off or the file
+        fits the limits, else the pinned and most relevant facts.
+        """
+        if not (self.memory_top_k or self.memory_max_tokens):
+            return self._get_file_sections()["memory"]
+        recent = [
+            m["content"] for m in (history or [])[-MEMORY_QUERY_MESSAGES:]
+            if isinstance(m.get("content"), str)
+        ]
+        memory = self.memory.get_memory_context(
+            query=query,
+            context="\n".join(recent),
+            max_facts=self.memory_top_k,
+            max_tokens=self.memory_max_tokens,
+            count_tokens=self.tokens.count_text if self.tokens else None,
+            include_pinned=self.memory_pinned,
+        )
+        return f"# Memory\n\n{memory}" if memory else ""
+    
+    def _get_file_sections(self) -> dict[str, str]:
+        """Get the bootstrap, memory and skills sections, rebuilt only when their sources change."""
+        signature = self._source_signature()
+        if self._sections_cache and self._sections_cache[0] == signature:
+            return self._sections_cache[1]
+
+        parts: dict[str, str] = {}
         
         # Bootstrap files
         bootstrap = self._load_bootstrap_files()
         if bootstrap:
-            parts.append(bootstrap)
+            parts["bootstrap"] = bootstrap
         
         # Memory context
         memory = self.memory.get_memory_context()
-        if memory:
-            parts.append(f"# Memory\n\n{memory}")
+        parts["memory"] = f"# Memory\n\n{memory}" if memory else ""
         
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
@@ -56,29 +145,56 @@ class ContextBuilder:
         if always_skills:
             always_content = self.skills.load_skills_for_context(always_skills)
             if always_content:
-                parts.append(f"# Active Skills\n\n{always_content}")
+                parts["always_skills"] = f"# Active Skills\n\n{always_content}"
         
         # 2. Available skills: only show summary (agent uses read_file to load)
         skills_summary = self.skills.build_skills_summary()
         if skills_summary:
-            parts.append(f"""# Skills
+            parts["skills"] = f"""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
 Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.
 
-{skills_summary}""")
+{skills_summary}"""
         
-        return "\n\n---\n\n".join(parts)
+        logger.debug("System prompt sections rebuilt")
+        self._sections_cache = (signature, parts)
+        return parts
+
+    def _source_signature(self) -> tuple:
+        """Stat signature of every file and directory the cached sections depend on."""
+        paths = [self.workspace / f for f in self.BOOTSTRAP_FILES]
+        paths.append(self.memory.memory_file)
+        paths += [self.skills.workspace_skills, self.skills.builtin_skills]
+        now = time.monotonic()
+        if (
+            self._requirements_signature is None
+            or now - self._requirements_signature[0] >= REQUIREMENTS_RECHECK_SECONDS
+        ):
+            self._requirements_signature = (now, self._skill_sources_signature())
+        return tuple(_stat_key(p) for p in paths), self._requirements_signature[1]
+
+    def _skill_sources_signature(self) -> tuple:
+        """Stat signature of each SKILL.md and of what their requirement checks read."""
+        paths = [Path(s["path"]) for s in self.skills.list_skills(filter_unavailable=False)]
+        # Installing a required binary touches its PATH directory
+        paths += [Path(d) for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+        return tuple(_stat_key(p) for p in paths), hash(frozenset(os.environ.items()))
     
-    def _get_identity(self) -> str:
-        """Get the core identity section."""
+    @staticmethod
+    def _current_time() -> str:
+        """Current local time to the minute, with timezone."""
         from datetime import datetime
-        import time as _time
         now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        tz = _time.strftime("%Z") or "UTC"
+        tz = time.strftime("%Z") or "UTC"
+        return f"{now} ({tz})"
+    
+    def _get_identity(self, with_time: bool = True) -> str:
+        """Get the core identity section (without the clock when it must stay cacheable)."""
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
+        time_section = f"## Current Time\n{self._current_time()}\n\n" if with_time else ""
         
         return f"""# nanobot 🐈
 
@@ -89,16 +205,13 @@ You are nanobot, a helpful AI assistant. You have access to tools that allow you
 - Send messages to users on chat channels
 - Spawn subagents for complex background tasks
 
-## Current Time
-{now} ({tz})
-
-## Runtime
+{time_section}## Runtime
 {runtime}
 
 ## Workspace
 Your workspace is at: {workspace_path}
 - Long-term memory: {workspace_path}/memory/MEMORY.md
-- History log: {workspace_path}/memory/HISTORY.md (grep-searchable)
+- History log: {workspace_path}/memory/HISTORY.md (search with memory_search)
 - Custom skills: {workspace_path}/skills/{{skill-name}}/SKILL.md
 
 IMPORTANT: When responding to direct questions or conversations, reply directly with your text response.
@@ -107,7 +220,7 @@ For normal conversation, just respond with text - do not call the message tool.
 
 Always be helpful, accurate, and concise. When using tools, think step by step: what you know, what you need, and why you chose this tool.
 When remembering something important, write to {workspace_path}/memory/MEMORY.md
-To recall past events, grep {workspace_path}/memory/HISTORY.md"""
+To recall past events, use the memory_search tool"""
     
     def _load_bootstrap_files(self) -> str:
         """Load all bootstrap files from workspace."""
@@ -129,37 +242,69 @@ To recall past events, grep {workspace_path}/memory/HISTORY.md"""
         media: list[str] | None = None,
         channel: str | None = None,
         chat_id: str | None = None,
+        reserved_tokens: int = 0,
     ) -> list[dict[str, Any]]:
         """
         Build the complete message list for an LLM call.
 
         Args:
-            history: Previous conversation messages.
+            history: Previous conversation messages (oldest first).
             current_message: The new user message.
             skill_names: Optional skills to include.
             media: Optional list of local file paths for images/media.
             channel: Current channel (telegram, feishu, etc.).
             chat_id: Current chat/user ID.
+            reserved_tokens: Tokens to keep free for tool schemas and the completion.
 
         Returns:
             List of messages including system prompt.
         """
-        messages = []
-
         # System prompt
-        system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
+        memory = self.build_memory_section(current_message, history)
+        system_prompt = self.build_system_prompt(skill_names, memory=memory)
+        if self.cache_friendly:
+            # Volatile context goes after the cacheable prefix (system + history)
+            runtime = self.build_runtime_context(channel, chat_id, memory=memory)
+            current_message = f"{runtime}\n\n{current_message}"
+        elif channel and chat_id:
             system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
-        messages.append({"role": "system", "content": system_prompt})
-
-        # History
-        messages.extend(history)
+        system_msg = {"role": "system", "content": system_prompt}
 
         # Current message (with optional image attachments)
         user_content = self._build_user_content(current_message, media)
-        messages.append({"role": "user", "content": user_content})
+        user_msg = {"role": "user", "content": user_content}
 
-        return messages
+        # History, trimmed to what fits next to the system prompt and current message
+        if self.tokens:
+            fixed = self.tokens.count_messages([system_msg, user_msg]) + reserved_tokens
+            history, history_tokens = self._fit_history(history, self.tokens.context_window - fixed)
+            logger.info(
+                f"Prompt tokens: ~{fixed - reserved_tokens + history_tokens} "
+                f"({len(history)} history messages, {history_tokens} history tokens, "
+                f"{reserved_tokens} reserved)"
+            )
+
+        return [system_msg, *history, user_msg]
+
+    def _fit_history(
+        self, history: list[dict[str, Any]], budget: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Keep the newest history messages that fit in the token budget."""
+        if self.max_history_tokens:
+            budget = min(budget, self.max_history_tokens)
+        kept: list[dict[str, Any]] = []
+        used = 0
+        for msg in reversed(history):
+            n = self.tokens.count_message(msg)
+            if used + n > budget:
+                break
+            kept.append(msg)
+            used += n
+        kept.reverse()
+        # Don't open the conversation with a reply whose question was cut off
+        while kept and kept[0].get("role") == "assistant":
+            used -= self.tokens.count_message(kept.pop(0))
+        return kept, used
 
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
@@ -236,3 +381,12 @@ To recall past events, grep {workspace_path}/memory/HISTORY.md"""
         
         messages.append(msg)
         return messages
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    """(mtime_ns, size) of a path, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
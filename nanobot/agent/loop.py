@@ -1,28 +1,44 @@
 """Agent loop: the core processing engine."""
 
 import asyncio
+from collections import deque
 from contextlib import AsyncExitStack
 import json
 import json_repair
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.providers.base import LLMProvider
+from nanobot.providers.base import LLMProvider, StreamCallback
+from nanobot.providers.cache import cache_responses, session_history
+from nanobot.providers.ratelimit import RateLimiter, background
+from nanobot.providers.tokens import TokenCounter
+from nanobot.agent.consolidation import ConsolidationScheduler
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import FetchCache, SearchCache
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.cron import CronTool
+from nanobot.agent.tools.results import ReadResultTool, ToolResultStore
+from nanobot.agent.tools.memory import MemorySearchTool
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.subagent import SubagentManager
 from nanobot.session.manager import Session, SessionManager
+from nanobot.utils.helpers import get_data_path
+
+if TYPE_CHECKING:
+    from nanobot.config.schema import ExecToolConfig, WebSearchConfig
+    from nanobot.cron.service import CronService
+
+CONSOLIDATION_ATTEMPTS = 3  # LLM passes before giving up when MEMORY.md keeps changing underneath
 
 
 class AgentLoop:
@@ -47,15 +63,27 @@ class AgentLoop:
         temperature: float = 0.7,
         max_tokens: int = 4096,
         memory_window: int = 50,
+        consolidation_model: str | None = None,
+        max_concurrent_consolidations: int = 2,
+        max_history_tokens: int = 16000,
+        context_window: int = 0,
+        max_concurrent_turns: int = 4,
+        stream_responses: bool = True,
+        prompt_cache: bool = True,
+        memory_top_k: int = 20,
+        memory_max_tokens: int = 2000,
+        memory_pinned: bool = True,
+        max_result_chars: int = 8000,
+        web_fetch_cache_mb: int = 100,
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
+        web_search_config: "WebSearchConfig | None" = None,
         cron_service: "CronService | None" = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
-        from nanobot.cron.service import CronService
+        from nanobot.config.schema import ExecToolConfig, WebSearchConfig
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
@@ -64,14 +92,34 @@ class AgentLoop:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.memory_window = memory_window
+        self.consolidation_model = consolidation_model or self.model
+        self.max_concurrent_turns = max(1, max_concurrent_turns)
+        self.stream_responses = stream_responses
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.web_search_config = web_search_config or WebSearchConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
 
-        self.context = ContextBuilder(workspace)
+        self.context = ContextBuilder(
+            workspace,
+            tokens=TokenCounter(self.model, context_window=context_window or None),
+            max_history_tokens=max_history_tokens,
+            cache_friendly=prompt_cache,
+            memory_top_k=memory_top_k,
+            memory_max_tokens=memory_max_tokens,
+            memory_pinned=memory_pinned,
+        )
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
+        self.results = ToolResultStore(get_data_path() / "tool_results", max_chars=max_result_chars)
+        self.fetch_cache = FetchCache(
+            get_data_path() / "cache" / "web_fetch.db", max_bytes=web_fetch_cache_mb * 1024 * 1024
+        ) if web_fetch_cache_mb > 0 else None
+        search = self.web_search_config
+        self.search_cache = SearchCache(
+            ttl=search.cache_ttl, limiter=RateLimiter(rpm=search.rpm, max_concurrency=search.max_concurrency)
+        )
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -82,9 +130,19 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            result_store=self.results,
+            fetch_cache=self.fetch_cache,
+            search_cache=self.search_cache,
+            search_max_results=search.max_results,
         )
         
         self._running = False
+        # Turn scheduling: FIFO per session, concurrent across sessions up to the global limit
+        self._turn_slots = asyncio.Semaphore(self.max_concurrent_turns)
+        self._pending_turns: dict[str, deque[InboundMessage]] = {}
+        self._session_workers: dict[str, asyncio.Task[None]] = {}
+        self._consolidations = ConsolidationScheduler(max_concurrent=max_concurrent_consolidations)
+        self._memory_lock = asyncio.Lock()
         self._mcp_servers = mcp_servers or {}
         self._mcp_stack: AsyncExitStack | None = None
         self._mcp_connected = False
@@ -98,6 +156,8 @@ class AgentLoop:
         self.tools.register(WriteFileTool(allowed_dir=allowed_dir))
         self.tools.register(EditFileTool(allowed_dir=allowed_dir))
         self.tools.register(ListDirTool(allowed_dir=allowed_dir))
+        self.tools.register(ReadResultTool(self.results))
+        self.tools.register(MemorySearchTool(self.context.memory))
         
         # Shell tool
         self.tools.register(ExecTool(
@@ -107,8 +167,10 @@ class AgentLoop:
         ))
         
         # Web tools
-        self.tools.register(WebSearchTool(api_key=self.brave_api_key))
-        self.tools.register(WebFetchTool())
+        self.tools.register(WebSearchTool(
+            api_key=self.brave_api_key, max_results=self.web_search_config.max_results, cache=self.search_cache
+        ))
+        self.tools.register(WebFetchTool(cache=self.fetch_cache))
         
         # Message tool
         message_tool = MessageTool(send_callback=self.bus.publish_outbound)
@@ -133,7 +195,11 @@ class AgentLoop:
         await connect_mcp_servers(self._mcp_servers, self.tools, self._mcp_stack)
 
     def _set_tool_context(self, channel: str, chat_id: str) -> None:
-        """Update context for all tools that need routing info."""
+        """Update context for all tools that need routing info.
+
+        Tool context is stored in context variables, so it only applies to the
+        turn (asyncio task) that set it and concurrent turns cannot clobber it.
+        """
         if message_tool := self.tools.get("message"):
             if isinstance(message_tool, MessageTool):
                 message_tool.set_context(channel, chat_id)
@@ -146,12 +212,23 @@ class AgentLoop:
             if isinstance(cron_tool, CronTool):
                 cron_tool.set_context(channel, chat_id)
 
-    async def _run_agent_loop(self, initial_messages: list[dict]) -> tuple[str | None, list[str]]:
+    def _reserved_tokens(self) -> int:
+        """Prompt space held back from history: tool schemas plus the completion."""
+        return self.context.tokens.count_tools(self.tools.get_definitions()) + self.max_tokens
+
+    async def _run_agent_loop(
+        self,
+        initial_messages: list[dict],
+        on_delta: StreamCallback | None = None,
+        cache_key: str | None = None,
+    ) -> tuple[str | None, list[str]]:
         """
         Run the agent iteration loop.
 
         Args:
             initial_messages: Starting messages for the LLM conversation.
+            on_delta: If set, completions are streamed and each text delta is passed here.
+            cache_key: Session key passed to the provider for prompt-cache routing.
 
         Returns:
             Tuple of (final_content, list_of_tools_used).
@@ -160,47 +237,89 @@ class AgentLoop:
         iteration = 0
         final_content = None
         tools_used: list[str] = []
+        turn_id = self.results.new_turn()
+        streamed = False  # whether an earlier iteration already streamed text
+        new_iteration = False
+
+        async def stream_delta(text: str) -> None:
+            # Keep text from successive tool-call iterations apart in the preview
+            nonlocal streamed, new_iteration
+            if new_iteration and streamed:
+                await on_delta("\n\n")
+            new_iteration = False
+            streamed = True
+            await on_delta(text)
 
-        while iteration < self.max_iterations:
-            iteration += 1
+        try:
+            while iteration < self.max_iterations:
+                iteration += 1
+                new_iteration = True
+
+                if on_delta:
+                    response = await self.provider.chat_stream(
+                        messages=messages,
+                        on_delta=stream_delta,
+                        tools=self.tools.get_definitions(),
+                        model=self.model,
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                        cache_key=cache_key,
+                    )
+                else:
+                    response = await self.provider.chat(
+                        messages=messages,
+                        tools=self.tools.get_definitions(),
+                        model=self.model,
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                        cache_key=cache_key,
+                    )
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+                if response.usage:
+                    logger.debug(
+                        f"LLM usage: prompt={response.usage.get('prompt_tokens')}, "
+                        f"cached={response.usage.get('cached_tokens', 0)}, "
+                        f"cache_write={response.usage.get('cache_creation_tokens', 0)}, "
+                        f"completion={response.usage.get('completion_tokens')}"
+                    )
 
-            if response.has_tool_calls:
-                tool_call_dicts = [
-                    {
-                        "id": tc.id,
-                        "type": "function",
-                        "function": {
-                            "name": tc.name,
-                            "arguments": json.dumps(tc.arguments)
+                if response.has_tool_calls:
+                    tool_call_dicts = [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.name,
+                                "arguments": json.dumps(tc.arguments)
+                            }
                         }
-                    }
-                    for tc in response.tool_calls
-                ]
-                messages = self.context.add_assistant_message(
-                    messages, response.content, tool_call_dicts,
-                    reasoning_content=response.reasoning_content,
-                )
+                        for tc in response.tool_calls
+                    ]
+                    messages = self.context.add_assistant_message(
+                        messages, response.content, tool_call_dicts,
+                        reasoning_content=response.reasoning_content,
+                    )
 
-                for tool_call in response.tool_calls:
-                    tools_used.append(tool_call.name)
-                    args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
-                    logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
-                    messages = self.context.add_tool_result(
-                        messages, tool_call.id, tool_call.name, result
+                    for tool_call in response.tool_calls:
+                        tools_used.append(tool_call.name)
+                        args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
+                        logger.info(f"Tool call: {tool_call.name}({args_str[:200]})")
+                    # Independent calls run concurrently; results keep the call order
+                    results = await self.tools.execute_many(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
                     )
-                messages.append({"role": "user", "content": "Reflect on the results and decide next steps."})
-            else:
-                final_content = response.content
-                break
+                    for tool_call, result in zip(response.tool_calls, results):
+                        result = self.results.spill(turn_id, tool_call.name, result)
+                        messages = self.context.add_tool_result(
+                            messages, tool_call.id, tool_call.name, result
+                        )
+                    messages.append({"role": "user", "content": "Reflect on the results and decide next steps."})
+                else:
+                    final_content = response.content
+                    break
+        finally:
+            # Spilled tool results are only readable within the turn that produced them
+            self.results.discard(turn_id)
 
         return final_content, tools_used
 
@@ -208,7 +327,7 @@ class AgentLoop:
         """Run the agent loop, processing messages from the bus."""
         self._running = True
         await self._connect_mcp()
-        logger.info("Agent loop started")
+        logger.info(f"Agent loop started (max {self.max_concurrent_turns} concurrent turns)")
 
         while self._running:
             try:
@@ -216,19 +335,67 @@ class AgentLoop:
                     self.bus.consume_inbound(),
                     timeout=1.0
                 )
-                try:
-                    response = await self._process_message(msg)
-                    if response:
-                        await self.bus.publish_outbound(response)
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
-                    ))
             except asyncio.TimeoutError:
                 continue
+            self._schedule_turn(msg)
+
+    @staticmethod
+    def _turn_key(msg: InboundMessage) -> str:
+        """Get the session key a message's turn is serialized on."""
+        if msg.channel == "system":
+            # System messages carry the origin session in chat_id ("channel:chat_id")
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
+
+    def _schedule_turn(self, msg: InboundMessage) -> None:
+        """Queue a message behind earlier turns of the same session."""
+        key = self._turn_key(msg)
+        self._pending_turns.setdefault(key, deque()).append(msg)
+        if key not in self._session_workers:
+            self._session_workers[key] = asyncio.create_task(self._drain_session(key))
+
+    async def _drain_session(self, key: str) -> None:
+        """Process queued messages of one session in order, one turn at a time."""
+        pending = self._pending_turns[key]
+        try:
+            while pending:
+                msg = pending.popleft()
+                async with self._turn_slots:
+                    # The bus may have dropped it as overflow while it waited
+                    if self.bus.inbound_started(msg):
+                        await self._handle_inbound(msg)
+        finally:
+            self._pending_turns.pop(key, None)
+            self._session_workers.pop(key, None)
+
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Process one inbound message and publish the response (or an error reply)."""
+        # Stream replies to user messages as deltas; the final message closes the stream
+        stream_id = uuid.uuid4().hex[:12] if self.stream_responses and msg.channel != "system" else None
+
+        async def on_delta(text: str) -> None:
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=text,
+                metadata=msg.metadata or {},
+                stream_id=stream_id,
+                delta=True,
+            ))
+
+        try:
+            response = await self._process_message(msg, on_delta=on_delta if stream_id else None)
+            if response:
+                response.stream_id = stream_id
+                await self.bus.publish_outbound(response)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an error: {str(e)}",
+                stream_id=stream_id,
+            ))
     
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -242,15 +409,23 @@ class AgentLoop:
     def stop(self) -> None:
         """Stop the agent loop."""
         self._running = False
+        for task in list(self._session_workers.values()):
+            task.cancel()
         logger.info("Agent loop stopping")
     
-    async def _process_message(self, msg: InboundMessage, session_key: str | None = None) -> OutboundMessage | None:
+    async def _process_message(
+        self,
+        msg: InboundMessage,
+        session_key: str | None = None,
+        on_delta: StreamCallback | None = None,
+    ) -> OutboundMessage | None:
         """
         Process a single inbound message.
         
         Args:
             msg: The inbound message to process.
             session_key: Override session key (used by process_direct).
+            on_delta: Optional callback receiving streamed response text.
         
         Returns:
             The response message, or None if no response needed.
@@ -279,25 +454,31 @@ class AgentLoop:
                 temp_session.messages = messages_to_archive
                 await self._consolidate_memory(temp_session, archive_all=True)
 
-            asyncio.create_task(_consolidate_and_cleanup())
+            # Runs after any consolidation still in flight for this session
+            self._consolidations.request(session.key, _consolidate_and_cleanup, coalesce=False)
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="New session started. Memory consolidation in progress.")
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
                                   content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands")
         
-        if len(session.messages) > self.memory_window:
-            asyncio.create_task(self._consolidate_memory(session))
+        if self._consolidation_due(session):
+            self._consolidations.request(session.key, lambda: self._consolidate_if_due(session.key))
 
         self._set_tool_context(msg.channel, msg.chat_id)
         initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+            history=session.get_history(),
             current_message=msg.content,
             media=msg.media if msg.media else None,
             channel=msg.channel,
             chat_id=msg.chat_id,
+            reserved_tokens=self._reserved_tokens(),
         )
-        final_content, tools_used = await self._run_agent_loop(initial_messages)
+        # [system, *history, current]: call sites like heartbeat keep the history out of cache keys
+        with session_history(1, len(initial_messages) - 1):
+            final_content, tools_used = await self._run_agent_loop(
+                initial_messages, on_delta=on_delta, cache_key=session.key,
+            )
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -340,12 +521,13 @@ class AgentLoop:
         session = self.sessions.get_or_create(session_key)
         self._set_tool_context(origin_channel, origin_chat_id)
         initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
+            history=session.get_history(),
             current_message=msg.content,
             channel=origin_channel,
             chat_id=origin_chat_id,
+            reserved_tokens=self._reserved_tokens(),
         )
-        final_content, _ = await self._run_agent_loop(initial_messages)
+        final_content, _ = await self._run_agent_loop(initial_messages, cache_key=session_key)
 
         if final_content is None:
             final_content = "Background task completed."
@@ -360,6 +542,20 @@ class AgentLoop:
             content=final_content
         )
     
+    def _consolidation_due(self, session: Session) -> bool:
+        """Consolidate in batches: only once a full window of unconsolidated messages piled up."""
+        return len(session.messages) - session.last_consolidated > self.memory_window
+
+    async def _consolidate_if_due(self, key: str) -> None:
+        """Scheduled job; re-checks because an earlier job may have covered the range already."""
+        # An evicted session is consolidated when the next turn reloads it and asks again
+        session = self.sessions.get_cached(key)
+        if session is None or not self._consolidation_due(session):
+            return
+        # Kept cached meanwhile, so a new turn works on this same object
+        with self.sessions.in_use(key):
+            await self._consolidate_memory(session)
+
     async def _consolidate_memory(self, session, archive_all: bool = False) -> None:
         """Consolidate old messages into MEMORY.md + HISTORY.md.
 
@@ -384,7 +580,10 @@ class AgentLoop:
                 logger.debug(f"Session {session.key}: No new messages to consolidate (last_consolidated={session.last_consolidated}, total={len(session.messages)})")
                 return
 
-            old_messages = session.messages[session.last_consolidated:-keep_count]
+            # Fixed before the LLM call: messages appended meanwhile are left for the next round
+            consolidated_end = len(session.messages) - keep_count
+            messages = session.messages
+            old_messages = session.messages[session.last_consolidated:consolidated_end]
             if not old_messages:
                 return
             logger.info(f"Memory consolidation started: {len(session.messages)} total, {len(old_messages)} new to consolidate, {keep_count} keep")
@@ -396,13 +595,47 @@ class AgentLoop:
             tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
             lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
         conversation = "\n".join(lines)
-        current_memory = memory.read_long_term()
 
+        try:
+            for _ in range(CONSOLIDATION_ATTEMPTS):
+                current_memory = memory.read_long_term()
+                result = await self._summarize_for_memory(conversation, current_memory)
+                if result is None:
+                    return
+                # MEMORY.md is rewritten as a whole; only commit if nobody (another
+                # consolidation, in this or another worker process, or the agent's
+                # own file tools) changed it meanwhile
+                async with self._memory_lock:
+                    with memory.locked():
+                        if memory.read_long_term() != current_memory:
+                            logger.info("Memory consolidation: MEMORY.md changed during consolidation, retrying")
+                            continue
+                        if entry := result.get("history_entry"):
+                            memory.append_history(entry)
+                        if update := result.get("memory_update"):
+                            if update != current_memory:
+                                memory.write_long_term(update)
+                break
+            else:
+                logger.warning("Memory consolidation: MEMORY.md kept changing, will retry later")
+                return
+
+            if archive_all:
+                session.last_consolidated = 0
+            elif session.messages is messages:  # not cleared by /new meanwhile
+                session.last_consolidated = consolidated_end
+                self.sessions.save(session)  # otherwise only the next turn's save would persist it
+            logger.info(f"Memory consolidation done: {len(session.messages)} messages, last_consolidated={session.last_consolidated}")
+        except Exception as e:
+            logger.error(f"Memory consolidation failed: {e}")
+
+    async def _summarize_for_memory(self, conversation: str, current_memory: str) -> dict | None:
+        """Ask the consolidation model for a history entry and updated memory; None on a bad reply."""
         prompt = f"""You are a memory consolidation agent. Process this conversation and return a JSON object with exactly two keys:
 
-1. "history_entry": A paragraph (2-5 sentences) summarizing the key events/decisions/topics. Start with a timestamp like [YYYY-MM-DD HH:MM]. Include enough detail to be useful when found by grep search later.
+1. "history_entry": A paragraph (2-5 sentences) summarizing the key events/decisions/topics. Start with a timestamp like [YYYY-MM-DD HH:MM]. Include enough detail to be useful when found by memory_search later.
 
-2. "memory_update": The updated long-term memory content. Add any new facts: user location, preferences, personal info, habits, project context, technical decisions, tools/services used. If nothing new, return the existing content unchanged.
+2. "memory_update": The updated long-term memory content. Add any new facts: user location, preferences, personal info, habits, project context, technical decisions, tools/services used. Keep it as markdown sections of short "- " bullets, one self-contained fact per bullet, since only the facts relevant to a message are shown later; keep a "## Pinned" section for facts that must always be visible. If nothing new, return the existing content unchanged.
 
 ## Current Long-term Memory
 {current_memory or "(empty)"}
@@ -412,38 +645,25 @@ class AgentLoop:
 
 Respond with ONLY valid JSON, no markdown fences."""
 
-        try:
+        with background(), cache_responses("consolidation"):
             response = await self.provider.chat(
                 messages=[
                     {"role": "system", "content": "You are a memory consolidation agent. Respond only with valid JSON."},
                     {"role": "user", "content": prompt},
                 ],
-                model=self.model,
+                model=self.consolidation_model,
             )
-            text = (response.content or "").strip()
-            if not text:
-                logger.warning("Memory consolidation: LLM returned empty response, skipping")
-                return
-            if text.startswith("```"):
-                text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
-            result = json_repair.loads(text)
-            if not isinstance(result, dict):
-                logger.warning(f"Memory consolidation: unexpected response type, skipping. Response: {text[:200]}")
-                return
-
-            if entry := result.get("history_entry"):
-                memory.append_history(entry)
-            if update := result.get("memory_update"):
-                if update != current_memory:
-                    memory.write_long_term(update)
-
-            if archive_all:
-                session.last_consolidated = 0
-            else:
-                session.last_consolidated = len(session.messages) - keep_count
-            logger.info(f"Memory consolidation done: {len(session.messages)} messages, last_consolidated={session.last_consolidated}")
-        except Exception as e:
-            logger.error(f"Memory consolidation failed: {e}")
+        text = (response.content or "").strip()
+        if not text:
+            logger.warning("Memory consolidation: LLM returned empty response, skipping")
+            return None
+        if text.startswith("```"):
+            text = text.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+        result = json_repair.loads(text)
+        if not isinstance(result, dict):
+            logger.warning(f"Memory consolidation: unexpected response type, skipping. Response: {text[:200]}")
+            return None
+        return result
 
     async def process_direct(
         self,
@@ -451,6 +671,7 @@ Respond with ONLY valid JSON, no markdown fences."""
         session_key: str = "cli:direct",
         channel: str = "cli",
         chat_id: str = "direct",
+        on_delta: StreamCallback | None = None,
     ) -> str:
         """
         Process a message directly (for CLI or cron usage).
@@ -460,6 +681,7 @@ Respond with ONLY valid JSON, no markdown fences."""
             session_key: Session identifier (overrides channel:chat_id for session lookup).
             channel: Source channel (for tool context routing).
             chat_id: Source chat ID (for tool context routing).
+            on_delta: Optional callback receiving streamed response text.
         
         Returns:
             The agent's response.
@@ -472,5 +694,5 @@ Respond with ONLY valid JSON, no markdown fences."""
             content=content
         )
         
-        response = await self._process_message(msg, session_key=session_key)
+        response = await self._process_message(msg, session_key=session_key, on_delta=on_delta)
         return response.content if response else ""
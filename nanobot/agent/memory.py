@@ -1,17 +1,271 @@
 """Memory system for persistent agent memory."""
 
+import hashlib
+import math
+import re
+import sqlite3
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable, Iterator
+
+from loguru import logger
 
 from nanobot.utils.helpers import ensure_dir
 
+try:
+    import fcntl
+except ImportError:  # Windows: single-process only
+    fcntl = None
+
+_TIMESTAMP = re.compile(r"^\[(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2})[^\]]*\]\s*")
+HEAD_BYTES = 4096  # prefix hashed to notice HISTORY.md being rewritten rather than appended to
+
+_BULLET = re.compile(r"^([-*+]|\d+[.)])\s+")
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]+")
+PIN_MARKERS = ("[pinned]", "📌")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _terms(text: str) -> list[str]:
+    """Lowercased word terms; CJK runs (no spaces between words) become character bigrams."""
+    text = text.lower()
+    terms: list[str] = []
+    for run in _CJK.findall(text):
+        terms += [run[i:i + 2] for i in range(max(1, len(run) - 1))]
+    terms += [w for w in re.findall(r"\w+", _CJK.sub(" ", text)) if len(w) > 1]
+    return terms
+
+
+@dataclass
+class MemoryFact:
+    """One addressable fact of MEMORY.md: a top-level bullet or a paragraph."""
+    heading: str  # heading line of the section the fact is in ("" before the first heading)
+    text: str
+    pinned: bool = False
+    terms: Counter[str] = field(default_factory=Counter)
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+class MemoryFacts:
+    """
+    MEMORY.md split into facts and ranked against a query with BM25.
+
+    A fact is a top-level list item (with its indented continuation lines)
+    or a paragraph. Facts under a heading containing "pinned", or marked
+    with ``[pinned]`` or 📌, are pinned. Scoring is purely lexical and
+    local; a fact's terms include its section heading.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.facts = self._parse(text)
+        self._df: Counter[str] = Counter()
+        for fact in self.facts:
+            self._df.update(fact.terms.keys())
+        lengths = [sum(f.terms.values()) for f in self.facts]
+        self._avg_len = (sum(lengths) / len(lengths)) if lengths else 0.0
+        self._costs: tuple[Callable[[str], int], int, list[int]] | None = None
+
+    def token_costs(self, count_tokens: Callable[[str], int]) -> tuple[int, list[int]]:
+        """Tokens in the whole text and in each fact, counted once per counter."""
+        if self._costs is None or self._costs[0] != count_tokens:
+            self._costs = (count_tokens, count_tokens(self.text), [count_tokens(f.text) for f in self.facts])
+        return self._costs[1], self._costs[2]
+
+    @staticmethod
+    def _parse(text: str) -> list[MemoryFact]:
+        facts: list[MemoryFact] = []
+        heading = ""
+        lines: list[str] = []
+
+        def flush() -> None:
+            if lines:
+                body = "\n".join(lines)
+                pinned = "pinned" in heading.lower() or any(m in body.lower() for m in PIN_MARKERS)
+                facts.append(MemoryFact(heading, body, pinned, Counter(_terms(f"{heading}\n{body}"))))
+                lines.clear()
+
+        for line in text.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                flush()
+            elif stripped.startswith("#"):
+                flush()
+                heading = stripped
+            elif _BULLET.match(line):  # top-level item; indented ones continue the current fact
+                flush()
+                lines.append(line.rstrip())
+            else:
+                lines.append(line.rstrip())
+        flush()
+        return facts
+
+    def score(self, fact: MemoryFact, query: dict[str, float]) -> float:
+        """BM25 score of a fact for weighted query terms."""
+        n = len(self.facts)
+        length = sum(fact.terms.values())
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self._avg_len or 1))
+        total = 0.0
+        for term, weight in query.items():
+            tf = fact.terms.get(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (n - self._df[term] + 0.5) / (self._df[term] + 0.5))
+            total += weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return total
+
+    def select(
+        self,
+        query: dict[str, float],
+        max_facts: int,
+        max_tokens: int,
+        count_tokens: Callable[[str], int],
+        include_pinned: bool = True,
+    ) -> list[MemoryFact]:
+        """
+        Pick the facts to inject, in file order.
+
+        Pinned facts come first (when included); the rest are the best-scoring
+        facts with a non-zero score. ``max_facts`` and ``max_tokens`` (0 = no
+        limit) apply to the whole selection.
+        """
+        pinned = [i for i, f in enumerate(self.facts) if f.pinned] if include_pinned else []
+        scored = [
+            (s, i) for i, f in enumerate(self.facts)
+            if not (include_pinned and f.pinned) and (s := self.score(f, query)) > 0
+        ]
+        ranked = [i for _, i in sorted(scored, key=lambda x: (-x[0], x[1]))]
+
+        costs = self.token_costs(count_tokens)[1]
+        chosen: list[int] = []
+        used = 0
+        for i in pinned + ranked:
+            fact = self.facts[i]
+            is_pinned = include_pinned and fact.pinned
+            if max_facts and len(chosen) >= max_facts and not is_pinned:
+                break
+            cost = costs[i]
+            if max_tokens and used + cost > max_tokens and not is_pinned:
+                continue
+            chosen.append(i)
+            used += cost
+        return [self.facts[i] for i in sorted(chosen)]
+
+    @staticmethod
+    def render(facts: list[MemoryFact]) -> str:
+        """Render facts back to markdown, repeating each section heading once."""
+        parts: list[str] = []
+        heading = None
+        for fact in facts:
+            if fact.heading != heading:
+                heading = fact.heading
+                if heading:
+                    parts.append(heading)
+            parts.append(fact.text)
+        return "\n\n".join(parts)
+
+
+class HistoryIndex:
+    """
+    Incremental full-text index over HISTORY.md entries.
+
+    Entries are the blank-line separated blocks ``append_history`` writes.
+    The index remembers how many bytes of the file it has seen and only
+    reads what was appended since; if the file shrank or its head changed,
+    it is rebuilt. Uses SQLite FTS5 with BM25 ranking.
+    """
+
+    def __init__(self, history_file: Path, db_path: Path):
+        self.history_file = history_file
+        self.db_path = db_path
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS entries USING fts5(timestamp UNINDEXED, content)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def sync(self) -> None:
+        """Index entries appended to HISTORY.md since the last sync."""
+        if not self.history_file.exists():
+            return
+        conn = self._connect()
+        # IMMEDIATE: other MemoryStore instances may sync the same file concurrently
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = dict(conn.execute("SELECT key, value FROM state").fetchall())
+            offset = int(state.get("offset", 0))
+            with open(self.history_file, "rb") as f:
+                head = f.read(HEAD_BYTES)
+                f.seek(0, 2)
+                size = f.tell()
+                head_hash = hashlib.sha1(head[:min(offset, HEAD_BYTES)]).hexdigest()
+                if size < offset or head_hash != state.get("head_hash", head_hash):
+                    logger.info("HISTORY.md was rewritten, rebuilding the history index")
+                    conn.execute("DELETE FROM entries")
+                    offset = 0
+                f.seek(offset)
+                data = f.read()
+
+            # Only index up to the last complete entry; a partial one is picked up next time
+            end = data.rfind(b"\n\n")
+            if end >= 0:
+                chunk = data[:end + 2].decode("utf-8", errors="replace")
+                rows = [self._parse(block) for block in chunk.split("\n\n") if block.strip()]
+                conn.executemany("INSERT INTO entries (timestamp, content) VALUES (?, ?)", rows)
+                offset += end + 2
+            new_head = hashlib.sha1(head[:min(offset, HEAD_BYTES)]).hexdigest()
+            conn.executemany(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                [("offset", str(offset)), ("head_hash", new_head)],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _parse(block: str) -> tuple[str, str]:
+        block = block.strip()
+        match = _TIMESTAMP.match(block)
+        return (match.group(1) if match else ""), block
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[str, str]]:
+        """Return up to ``limit`` (timestamp, entry) pairs, best match first."""
+        self.sync()
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        # Quote every term so user input can't inject FTS5 syntax; any term may match
+        match = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        return self._connect().execute(
+            "SELECT timestamp, content FROM entries WHERE entries MATCH ? ORDER BY bm25(entries) LIMIT ?",
+            (match, limit),
+        ).fetchall()
+
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (searchable log)."""
 
     def __init__(self, workspace: Path):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self.history_index = HistoryIndex(self.history_file, self.memory_dir / ".history_index.db")
+        self._facts: MemoryFacts | None = None
+        self._facts_signature: tuple[int, int] | None = None
 
     def read_long_term(self) -> str:
         if self.memory_file.exists():
@@ -20,11 +274,90 @@ class MemoryStore:
 
     def write_long_term(self, content: str) -> None:
         self.memory_file.write_text(content, encoding="utf-8")
+        self._facts = None
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Exclusive lock on MEMORY.md across processes (gateway workers share the workspace).
+
+        Hold it only around short reads and writes: waiting for it blocks the caller.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self.memory_dir / ".memory.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
 
     def append_history(self, entry: str) -> None:
         with open(self.history_file, "a", encoding="utf-8") as f:
             f.write(entry.rstrip() + "\n\n")
+        try:
+            self.history_index.sync()
+        except Exception as e:
+            logger.warning(f"Failed to update history index: {e}")
+
+    def search_history(self, query: str, limit: int = 5) -> list[tuple[str, str]]:
+        """Full-text search over HISTORY.md entries, best match first."""
+        return self.history_index.search(query, limit)
+
+    def get_facts(self) -> MemoryFacts:
+        """MEMORY.md split into facts, re-read and re-parsed only when its mtime or size changes."""
+        try:
+            st = self.memory_file.stat()
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            signature = None
+        if self._facts is None or signature != self._facts_signature:
+            self._facts = MemoryFacts(self.read_long_term())
+            self._facts_signature = signature
+        return self._facts
+
+    def get_memory_context(
+        self,
+        query: str | None = None,
+        context: str = "",
+        max_facts: int = 0,
+        max_tokens: int = 0,
+        count_tokens: Callable[[str], int] | None = None,
+        include_pinned: bool = True,
+    ) -> str:
+        """
+        Build the long-term memory section.
+
+        Without a query, or when all of MEMORY.md fits within ``max_facts`` and
+        ``max_tokens`` (0 = no limit), the whole file is used. Otherwise only
+        pinned facts and the facts most relevant to ``query`` (and, at half
+        weight, ``context``, e.g. recent history) are included.
+        """
+        facts = self.get_facts()
+        long_term = facts.text
+        if not long_term:
+            return ""
+        if query is None or not (max_facts or max_tokens):
+            return f"## Long-term Memory\n{long_term}"
+
+        count_tokens = count_tokens or _estimate_tokens
+        if (not max_facts or len(facts.facts) <= max_facts) and (
+            not max_tokens or facts.token_costs(count_tokens)[0] <= max_tokens
+        ):
+            return f"## Long-term Memory\n{long_term}"
 
-    def get_memory_context(self) -> str:
-        long_term = self.read_long_term()
-        return f"## Long-term Memory\n{long_term}" if long_term else ""
+        weights: dict[str, float] = {}
+        for term in _terms(context):
+            weights[term] = 0.5
+        for term in _terms(query):
+            weights[term] = 1.0
+        selected = facts.select(weights, max_facts, max_tokens, count_tokens, include_pinned)
+        logger.debug(f"Memory: injecting {len(selected)} of {len(facts.facts)} facts")
+        if not selected:
+            return ""
+        return (
+            f"## Long-term Memory\n"
+            f"(The {len(selected)} of {len(facts.facts)} facts in {self.memory_file} most relevant "
+            f"to this conversation; read the file for the rest.)\n\n{facts.render(selected)}"
+        )
@@ -11,10 +11,13 @@ from loguru import logger
 from nanobot.bus.events import InboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.providers.base import LLMProvider
+from nanobot.providers.ratelimit import background
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.filesystem import ReadFileTool, WriteFileTool, EditFileTool, ListDirTool
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebSearchTool, WebFetchTool
+from nanobot.agent.tools.web_cache import FetchCache, SearchCache
+from nanobot.agent.tools.results import ReadResultTool, ToolResultStore
 
 
 class SubagentManager:
@@ -37,6 +40,10 @@ class SubagentManager:
         brave_api_key: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        result_store: ToolResultStore | None = None,
+        fetch_cache: FetchCache | None = None,
+        search_cache: SearchCache | None = None,
+        search_max_results: int = 5,
     ):
         from nanobot.config.schema import ExecToolConfig
         self.provider = provider
@@ -48,6 +55,10 @@ class SubagentManager:
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
+        self.result_store = result_store
+        self.fetch_cache = fetch_cache
+        self.search_cache = search_cache
+        self.search_max_results = search_max_results
         self._running_tasks: dict[str, asyncio.Task[None]] = {}
     
     async def spawn(
@@ -98,6 +109,7 @@ class SubagentManager:
     ) -> None:
         """Execute the subagent task and announce the result."""
         logger.info(f"Subagent [{task_id}] starting task: {label}")
+        turn_id = self.result_store.new_turn() if self.result_store else None
         
         try:
             # Build subagent tools (no message tool, no spawn tool)
@@ -112,8 +124,12 @@ class SubagentManager:
                 timeout=self.exec_config.timeout,
                 restrict_to_workspace=self.restrict_to_workspace,
             ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key))
-            tools.register(WebFetchTool())
+            tools.register(WebSearchTool(
+                api_key=self.brave_api_key, max_results=self.search_max_results, cache=self.search_cache
+            ))
+            tools.register(WebFetchTool(cache=self.fetch_cache))
+            if self.result_store:
+                tools.register(ReadResultTool(self.result_store))
             
             # Build messages with subagent-specific prompt
             system_prompt = self._build_subagent_prompt(task)
@@ -130,13 +146,14 @@ class SubagentManager:
             while iteration < max_iterations:
                 iteration += 1
                 
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tools.get_definitions(),
-                    model=self.model,
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                )
+                with background():
+                    response = await self.provider.chat(
+                        messages=messages,
+                        tools=tools.get_definitions(),
+                        model=self.model,
+                        temperature=self.temperature,
+                        max_tokens=self.max_tokens,
+                    )
                 
                 if response.has_tool_calls:
                     # Add assistant message with tool calls
@@ -157,11 +174,16 @@ class SubagentManager:
                         "tool_calls": tool_call_dicts,
                     })
                     
-                    # Execute tools
+                    # Execute tools (independent calls concurrently, results in call order)
                     for tool_call in response.tool_calls:
                         args_str = json.dumps(tool_call.arguments)
                         logger.debug(f"Subagent [{task_id}] executing: {tool_call.name} with arguments: {args_str}")
-                        result = await tools.execute(tool_call.name, tool_call.arguments)
+                    results = await tools.execute_many(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
+                    )
+                    for tool_call, result in zip(response.tool_calls, results):
+                        if turn_id:
+                            result = self.result_store.spill(turn_id, tool_call.name, result)
                         messages.append({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
@@ -182,6 +204,9 @@ class SubagentManager:
             error_msg = f"Error: {str(e)}"
             logger.error(f"Subagent [{task_id}] failed: {e}")
             await self._announce_result(task_id, label, task, error_msg, origin, "error")
+        finally:
+            if turn_id:
+                self.result_store.discard(turn_id)
     
     async def _announce_result(
         self,
@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+BARRIER = "*"  # conflict key of calls whose effects are unknown (shell, MCP, ...)
+
 
 class Tool(ABC):
     """
@@ -52,6 +54,22 @@ class Tool(ABC):
         """
         pass
 
+    @property
+    def read_only(self) -> bool:
+        """Whether the tool has no side effects (safe to run alongside other calls)."""
+        return False
+
+    def conflict_key(self, params: dict[str, Any]) -> str | None:
+        """
+        Resource a call touches, used to order calls from one LLM response.
+
+        Calls sharing a key run in their original order unless all of them are
+        read-only; calls with no key run concurrently with everything else.
+        Side-effecting tools default to ``BARRIER``: they may touch anything,
+        so they are ordered against every keyed or side-effecting call.
+        """
+        return None if self.read_only else BARRIER
+
     def validate_params(self, params: dict[str, Any]) -> list[str]:
         """Validate tool parameters against JSON schema. Returns error list (empty if valid)."""
         schema = self.parameters or {}
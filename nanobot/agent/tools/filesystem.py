@@ -14,6 +14,16 @@ def _resolve_path(path: str, allowed_dir: Path | None = None) -> Path:
     return resolved
 
 
+def _path_key(path: Any) -> str | None:
+    """Conflict key for a file path argument (resolved so aliases collide)."""
+    if not isinstance(path, str):
+        return None
+    try:
+        return f"path:{Path(path).expanduser().resolve()}"
+    except Exception:
+        return f"path:{path}"
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents."""
     
@@ -27,6 +37,13 @@ class ReadFileTool(Tool):
     @property
     def description(self) -> str:
         return "Read the contents of a file at the given path."
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    def conflict_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -70,6 +87,9 @@ class WriteFileTool(Tool):
     @property
     def description(self) -> str:
         return "Write content to a file at the given path. Creates parent directories if needed."
+
+    def conflict_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -113,6 +133,9 @@ class EditFileTool(Tool):
     @property
     def description(self) -> str:
         return "Edit a file by replacing old_text with new_text. The old_text must exist exactly in the file."
+
+    def conflict_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -174,6 +197,13 @@ class ListDirTool(Tool):
     @property
     def description(self) -> str:
         return "List the contents of a directory."
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    def conflict_key(self, params: dict[str, Any]) -> str | None:
+        return _path_key(params.get("path"))
     
     @property
     def parameters(self) -> dict[str, Any]:
@@ -0,0 +1,64 @@
+"""Memory search tool for recalling past conversations."""
+
+from typing import Any
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.base import Tool
+
+MAX_ENTRY_CHARS = 1000
+
+
+class MemorySearchTool(Tool):
+    """Tool to search the HISTORY.md log of past conversations."""
+
+    def __init__(self, store: MemoryStore):
+        self._store = store
+
+    @property
+    def name(self) -> str:
+        return "memory_search"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search the history log of past conversations (HISTORY.md) by keywords. "
+            "Returns the best matching entries with their timestamps."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords to search for"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of entries to return",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            },
+            "required": ["query"]
+        }
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    async def execute(self, query: str, limit: int = 5, **kwargs: Any) -> str:
+        try:
+            results = self._store.search_history(query, limit)
+        except Exception as e:
+            return f"Error searching history: {str(e)}"
+        if not results:
+            return f"No history entries found for: {query}"
+
+        lines = []
+        for i, (timestamp, entry) in enumerate(results, 1):
+            if len(entry) > MAX_ENTRY_CHARS:
+                entry = entry[:MAX_ENTRY_CHARS] + "..."
+            lines.append(f"{i}. ({timestamp or 'unknown time'}) {entry}")
+        return "\n\n".join(lines)
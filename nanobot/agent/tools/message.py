@@ -1,5 +1,6 @@
 """Message tool for sending messages to users."""
 
+from contextvars import ContextVar
 from typing import Any, Callable, Awaitable
 
 from nanobot.agent.tools.base import Tool
@@ -16,13 +17,14 @@ class MessageTool(Tool):
         default_chat_id: str = ""
     ):
         self._send_callback = send_callback
-        self._default_channel = default_channel
-        self._default_chat_id = default_chat_id
+        # Context vars keep routing info local to the turn (asyncio task) that set it
+        self._default_channel: ContextVar[str] = ContextVar("message_channel", default=default_channel)
+        self._default_chat_id: ContextVar[str] = ContextVar("message_chat_id", default=default_chat_id)
     
     def set_context(self, channel: str, chat_id: str) -> None:
         """Set the current message context."""
-        self._default_channel = channel
-        self._default_chat_id = chat_id
+        self._default_channel.set(channel)
+        self._default_chat_id.set(chat_id)
     
     def set_send_callback(self, callback: Callable[[OutboundMessage], Awaitable[None]]) -> None:
         """Set the callback for sending messages."""
@@ -64,8 +66,8 @@ class MessageTool(Tool):
         chat_id: str | None = None,
         **kwargs: Any
     ) -> str:
-        channel = channel or self._default_channel
-        chat_id = chat_id or self._default_chat_id
+        channel = channel or self._default_channel.get()
+        chat_id = chat_id or self._default_chat_id.get()
         
         if not channel or not chat_id:
             return "Error: No target channel/chat specified"
@@ -1,8 +1,18 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
 from typing import Any
 
-from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.base import BARRIER, Tool
+
+
+def _conflicts(key: str | None, read_only: bool, earlier_key: str | None, earlier_read_only: bool) -> bool:
+    """Whether a call must wait for an earlier call of the same LLM response."""
+    if key == BARRIER:
+        return earlier_key is not None or not earlier_read_only
+    if earlier_key == BARRIER:
+        return key is not None or not read_only
+    return key is not None and key == earlier_key and not (read_only and earlier_read_only)
 
 
 class ToolRegistry:
@@ -61,6 +71,43 @@ class ToolRegistry:
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    async def execute_many(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute several tool calls concurrently, respecting conflicts.
+
+        A call waits for every earlier call with the same conflict key unless
+        both are read-only, so writes to one path keep their order while
+        independent fetches and reads overlap. Barrier calls (shell commands,
+        MCP tools) are ordered against every earlier and later call that has
+        a key or side effects: ``exec("... > out.txt")`` then
+        ``read_file("out.txt")`` reads the new file.
+
+        Args:
+            calls: (name, params) pairs in the order the LLM emitted them.
+
+        Returns:
+            Results in the same order as ``calls``.
+        """
+        tasks: list[asyncio.Task[str]] = []
+        seen: list[tuple[str | None, bool]] = []
+
+        for name, params in calls:
+            tool = self._tools.get(name)
+            key = tool.conflict_key(params) if tool else None
+            read_only = tool.read_only if tool else True
+            deps = [tasks[i] for i, (k, ro) in enumerate(seen) if _conflicts(key, read_only, k, ro)]
+            tasks.append(asyncio.create_task(self._execute_after(deps, name, params)))
+            seen.append((key, read_only))
+
+        return list(await asyncio.gather(*tasks))
+
+    async def _execute_after(
+        self, deps: list["asyncio.Task[str]"], name: str, params: dict[str, Any]
+    ) -> str:
+        if deps:
+            await asyncio.wait(deps)
+        return await self.execute(name, params)
+    
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -0,0 +1,148 @@
+"""Tool result store: spill oversized results to disk and page through them."""
+
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.tools.base import Tool
+from nanobot.utils.helpers import ensure_dir
+
+HEAD_CHARS = 2000  # preview head/tail at most; smaller when max_chars leaves less room
+TAIL_CHARS = 500
+NOTICE_CHARS = 400  # room kept for the truncation notice / page footer
+STALE_AFTER_S = 24 * 3600  # leftovers from crashed processes
+
+
+class ToolResultStore:
+    """
+    Keeps oversized tool results out of the prompt.
+
+    Results longer than ``max_chars`` are written to a spill file under a
+    per-turn directory; the model gets a head/tail preview plus a handle it
+    can pass to the ``read_result`` tool. Spill files are discarded when the
+    turn ends.
+    """
+
+    def __init__(self, root: Path, max_chars: int = 8000):
+        self.root = ensure_dir(root)
+        self.max_chars = max_chars
+        self._cleanup_stale()
+
+    def new_turn(self) -> str:
+        """Return a fresh turn ID for grouping spill files."""
+        return uuid.uuid4().hex[:12]
+
+    def spill(self, turn_id: str, tool_name: str, result: str) -> str:
+        """Return the result unchanged if small, else spill it and return a preview."""
+        # read_result pages are already bounded; spilling one again would hand out a new handle forever
+        if not self.max_chars or len(result) <= self.max_chars or tool_name == "read_result":
+            return result
+        handle = f"{turn_id}-{uuid.uuid4().hex[:8]}"
+        try:
+            path = ensure_dir(self.root / turn_id) / f"{handle}.txt"
+            path.write_text(result, encoding="utf-8")
+        except Exception as e:
+            logger.warning(f"Failed to spill {tool_name} result, truncating instead: {e}")
+            return result[:self.max_chars] + f"\n... (truncated, {len(result) - self.max_chars} more chars)"
+
+        logger.debug(f"Spilled {tool_name} result ({len(result)} chars) to {handle}")
+        head, tail = self._preview_sizes()
+        omitted = len(result) - head - tail
+        return (
+            f"{result[:head]}\n\n... [{omitted} chars omitted] ...\n\n{result[len(result) - tail:]}\n\n"
+            f"[Result too long ({len(result)} chars); shown head and tail only. "
+            f"Full result saved as handle \"{handle}\". "
+            f"Use read_result(handle=\"{handle}\", offset={head}, limit=...) to read more.]"
+        )
+
+    def _preview_sizes(self) -> tuple[int, int]:
+        """Head and tail lengths such that the preview stays within ``max_chars``."""
+        budget = max(0, self.max_chars - NOTICE_CHARS)
+        return min(HEAD_CHARS, budget * 4 // 5), min(TAIL_CHARS, budget // 5)
+
+    def read(self, handle: str, offset: int = 0, limit: int | None = None) -> str:
+        """Read a character range from a spilled result."""
+        turn_id, sep, _ = handle.partition("-")
+        if not sep or not handle.replace("-", "").isalnum():
+            return f"Error: Invalid result handle: {handle}"
+        path = self.root / turn_id / f"{handle}.txt"
+        if not path.is_file():
+            return f"Error: Result {handle} not found (results are only kept for the current turn)"
+
+        text = path.read_text(encoding="utf-8")
+        # The page plus its footer must fit in max_chars, or it would be spilled again
+        page_max = max(1, self.max_chars - NOTICE_CHARS) if self.max_chars else len(text)
+        limit = min(limit or page_max, page_max)
+        chunk = text[offset:offset + limit]
+        end = offset + len(chunk)
+        if end < len(text):
+            return f"{chunk}\n\n[chars {offset}-{end} of {len(text)}; next offset={end}]"
+        return f"{chunk}\n\n[chars {offset}-{end} of {len(text)}; end of result]"
+
+    def discard(self, turn_id: str) -> None:
+        """Delete all spill files of a finished turn."""
+        shutil.rmtree(self.root / turn_id, ignore_errors=True)
+
+    def _cleanup_stale(self) -> None:
+        cutoff = time.time() - STALE_AFTER_S
+        for path in self.root.iterdir():
+            try:
+                if path.is_dir() and path.stat().st_mtime < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+
+
+class ReadResultTool(Tool):
+    """Tool to page through a tool result that was too long to show in full."""
+
+    def __init__(self, store: ToolResultStore):
+        self._store = store
+
+    @property
+    def name(self) -> str:
+        return "read_result"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read part of a long tool result that was truncated to a preview. "
+            "Pass the handle from the truncation notice and a character offset."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": "Result handle from the truncation notice"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to start reading from",
+                    "minimum": 0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of characters to return",
+                    "minimum": 1
+                }
+            },
+            "required": ["handle"]
+        }
+
+    @property
+    def read_only(self) -> bool:
+        return True
+
+    async def execute(self, handle: str, offset: int = 0, limit: int | None = None, **kwargs: Any) -> str:
+        try:
+            return self._store.read(handle, offset, limit)
+        except Exception as e:
+            return f"Error reading result: {str(e)}"
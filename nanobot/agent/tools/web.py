@@ -1,33 +1,77 @@
 """Web tools: web_search and web_fetch."""
 
-import html
+import asyncio
+import codecs
 import json
 import os
-import re
+import time
 from typing import Any
 from urllib.parse import urlparse
 
 import httpx
 
 from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.web_cache import CachedPage, FetchCache, SearchCache, normalize_query
+from nanobot.utils.http import http_client
+from nanobot.utils.markup import extract_page
+from nanobot.utils.workers import INLINE_LIMIT, extraction_pool
 
 # Shared constants
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
-MAX_REDIRECTS = 5  # Limit redirects to prevent DoS attacks
 
+MAX_QUERIES = 5  # web_search queries per call
 
-def _strip_tags(text: str) -> str:
-    """Remove HTML tags and decode entities."""
-    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
-    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
-    text = re.sub(r'<[^>]+>', '', text)
-    return html.unescape(text).strip()
+# web_fetch download limits: bytes read per requested character of output
+HTML_BYTES_PER_CHAR = 20  # markup, scripts and styles around the readable text
+TEXT_BYTES_PER_CHAR = 4   # worst case for UTF-8
+FETCH_DEADLINE = 60.0     # seconds for the whole body; a trickling stream is cut off
+BINARY_TYPES = ("image/", "audio/", "video/", "font/", "application/octet-stream", "application/pdf",
+                "application/zip", "application/gzip")
+BINARY_MAGIC = (b"%PDF", b"PK\x03\x04", b"\x1f\x8b", b"\x89PNG", b"GIF8", b"\xff\xd8\xff", b"7z\xbc\xaf")
 
 
-def _normalize(text: str) -> str:
-    """Normalize whitespace."""
-    text = re.sub(r'[ \t]+', ' ', text)
-    return re.sub(r'\n{3,}', '\n\n', text).strip()
+def _is_html(content_type: str) -> bool:
+    return not content_type or "html" in content_type
+
+
+def _is_binary(content_type: str, head: bytes) -> bool:
+    """Whether a response is binary, from its Content-Type and first bytes."""
+    ctype = content_type.split(";")[0].strip().lower()
+    if ctype.startswith(BINARY_TYPES) and not ctype.endswith(("+xml", "+json")):
+        return True
+    wide = "utf-16" in content_type.lower() or "utf-32" in content_type.lower()  # NUL bytes are legitimate
+    return head.startswith(BINARY_MAGIC) or (not wide and b"\x00" in head[:1024])
+
+
+def _decoder(encoding: str | None) -> codecs.IncrementalDecoder:
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+async def _read_capped(r: httpx.Response, max_bytes: int, max_chars: int | None) -> tuple[bytes, bool]:
+    """
+    Stream a response body, stopping at ``max_bytes`` (or ``max_chars`` decoded characters).
+
+    Returns the body, cut at a character boundary, and whether it was
+    truncated. Raises ValueError for binary content, detected from the
+    first chunk before anything else is read.
+    """
+    decoder = _decoder(r.encoding)
+    body = bytearray()
+    chars = 0
+    deadline = time.monotonic() + FETCH_DEADLINE
+    async for chunk in r.aiter_bytes():
+        if not body and _is_binary(r.headers.get("content-type", ""), chunk):
+            raise ValueError(f"Unsupported binary content ({r.headers.get('content-type') or 'unknown type'})")
+        chunk = chunk[:max_bytes - len(body)]
+        body += chunk
+        chars += len(decoder.decode(chunk))
+        if len(body) >= max_bytes or (max_chars is not None and chars > max_chars) or time.monotonic() > deadline:
+            pending = len(decoder.getstate()[0])  # bytes of a character split by the cut
+            return bytes(body[:len(body) - pending]), True
+    return bytes(body), False
 
 
 def _validate_url(url: str) -> tuple[bool, str]:
@@ -47,47 +91,99 @@ class WebSearchTool(Tool):
     """Search the web using Brave Search API."""
     
     name = "web_search"
-    description = "Search the web. Returns titles, URLs, and snippets."
+    description = (
+        "Search the web. Returns titles, URLs, and snippets. "
+        "Pass extra phrasings in queries to run them in parallel; results are merged."
+    )
     parameters = {
         "type": "object",
         "properties": {
             "query": {"type": "string", "description": "Search query"},
-            "count": {"type": "integer", "description": "Results (1-10)", "minimum": 1, "maximum": 10}
+            "queries": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": f"Additional queries searched alongside query (up to {MAX_QUERIES - 1})",
+            },
+            "count": {"type": "integer", "description": "Results per query (1-10)", "minimum": 1, "maximum": 10}
         },
         "required": ["query"]
     }
+    read_only = True
     
-    def __init__(self, api_key: str | None = None, max_results: int = 5):
+    def __init__(self, api_key: str | None = None, max_results: int = 5, cache: SearchCache | None = None):
         self.api_key = api_key or os.environ.get("BRAVE_API_KEY", "")
         self.max_results = max_results
+        self.cache = cache or SearchCache(ttl=0)  # single-flight and pacing even without a shared cache
     
-    async def execute(self, query: str, count: int | None = None, **kwargs: Any) -> str:
+    async def execute(
+        self, query: str, queries: list[str] | None = None, count: int | None = None, **kwargs: Any
+    ) -> str:
         if not self.api_key:
             return "Error: BRAVE_API_KEY not configured"
-        
-        try:
-            n = min(max(count or self.max_results, 1), 10)
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    params={"q": query, "count": n},
-                    headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
-                    timeout=10.0
-                )
-                r.raise_for_status()
-            
-            results = r.json().get("web", {}).get("results", [])
-            if not results:
-                return f"No results for: {query}"
-            
-            lines = [f"Results for: {query}\n"]
-            for i, item in enumerate(results[:n], 1):
-                lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
-                if desc := item.get("description"):
-                    lines.append(f"   {desc}")
-            return "\n".join(lines)
-        except Exception as e:
-            return f"Error: {e}"
+
+        n = min(max(count or self.max_results, 1), 10)
+        searches, seen = [], set()
+        for q in [query, *(queries or [])]:
+            if q.strip() and (key := normalize_query(q)) not in seen:  # trivial variants are searched once
+                seen.add(key)
+                searches.append(q.strip())
+        searches = searches[:MAX_QUERIES]
+        if not searches:
+            return "Error: empty query"
+        outcomes = await asyncio.gather(
+            *(self.cache.search(q, n, self._request) for q in searches), return_exceptions=True
+        )
+
+        errors = [f"Error for '{q}': {o}" for q, o in zip(searches, outcomes) if isinstance(o, BaseException)]
+        if len(errors) == len(searches):
+            return f"Error: {outcomes[0]}" if len(searches) == 1 else "\n".join(errors)
+        ranked = [o[0] for o in outcomes if not isinstance(o, BaseException)]
+        results = _merge_results(ranked)
+        label = "; ".join(searches)
+        if not results:
+            return "\n".join([f"No results for: {label}", *errors])
+
+        lines = [f"Results for: {label}\n"]
+        for i, item in enumerate(results, 1):
+            lines.append(f"{i}. {item.get('title', '')}\n   {item.get('url', '')}")
+            if desc := item.get("description"):
+                lines.append(f"   {desc}")
+        return "\n".join([*lines, *errors])
+
+    async def _request(self, query: str, count: int) -> list[dict[str, Any]]:
+        """One Brave API call, paced by the shared limiter."""
+        async with self.cache.limiter.slot() as permit:
+            r = await http_client().get(
+                "https://api.search.brave.com/res/v1/web/search",
+                params={"q": query, "count": count},
+                headers={"Accept": "application/json", "X-Subscription-Token": self.api_key},
+                timeout=10.0
+            )
+            permit.rate_limited = r.status_code == 429
+            r.raise_for_status()
+        results = r.json().get("web", {}).get("results", [])
+        return [{k: item.get(k, "") for k in ("title", "url", "description")} for item in results[:count]]
+
+
+def _merge_results(ranked: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """Interleave result lists by rank, keeping the first occurrence of each URL."""
+    merged, seen = [], set()
+    for rank in range(max(map(len, ranked), default=0)):
+        for results in ranked:
+            if rank < len(results):
+                item = results[rank]
+                key = _url_key(item.get("url", ""))
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(item)
+    return merged
+
+
+def _url_key(url: str) -> str:
+    """URL identity for deduplication: scheme, www., fragment and trailing slash are ignored."""
+    p = urlparse(url)
+    host = p.netloc.lower().removeprefix("www.")
+    return f"{host}{p.path.rstrip('/')}{'?' + p.query if p.query else ''}"
 
 
 class WebFetchTool(Tool):
@@ -104,13 +200,13 @@ class WebFetchTool(Tool):
         },
         "required": ["url"]
     }
+    read_only = True
     
-    def __init__(self, max_chars: int = 50000):
+    def __init__(self, max_chars: int = 50000, cache: FetchCache | None = None):
         self.max_chars = max_chars
+        self.cache = cache
     
     async def execute(self, url: str, extractMode: str = "markdown", maxChars: int | None = None, **kwargs: Any) -> str:
-        from readability import Document
-
         max_chars = maxChars or self.max_chars
 
         # Validate URL before fetching
@@ -119,45 +215,73 @@ class WebFetchTool(Tool):
             return json.dumps({"error": f"URL validation failed: {error_msg}", "url": url})
 
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True,
-                max_redirects=MAX_REDIRECTS,
-                timeout=30.0
-            ) as client:
-                r = await client.get(url, headers={"User-Agent": USER_AGENT})
-                r.raise_for_status()
-            
-            ctype = r.headers.get("content-type", "")
+            page, cache_status, cached = await self._fetch(url, max_chars)
+            extracted = self.cache.get_extraction(url, extractMode, page.body_hash) if cached else None
+            if extracted is None:
+                extracted = await self._extract(page, extractMode)
+                if cached:
+                    self.cache.put_extraction(url, extractMode, page.body_hash, *extracted)
+            text, extractor = extracted
             
-            # JSON
-            if "application/json" in ctype:
-                text, extractor = json.dumps(r.json(), indent=2), "json"
-            # HTML
-            elif "text/html" in ctype or r.text[:256].lower().startswith(("<!doctype", "<html")):
-                doc = Document(r.text)
-                content = self._to_markdown(doc.summary()) if extractMode == "markdown" else _strip_tags(doc.summary())
-                text = f"# {doc.title()}\n\n{content}" if doc.title() else content
-                extractor = "readability"
-            else:
-                text, extractor = r.text, "raw"
-            
-            truncated = len(text) > max_chars
+            truncated = len(text) > max_chars or page.truncated
             if truncated:
                 text = text[:max_chars]
             
-            return json.dumps({"url": url, "finalUrl": str(r.url), "status": r.status_code,
-                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text})
+            return json.dumps({"url": url, "finalUrl": page.final_url, "status": page.status,
+                              "extractor": extractor, "truncated": truncated, "length": len(text), "text": text,
+                              "cache": cache_status})
         except Exception as e:
             return json.dumps({"error": str(e), "url": url})
     
-    def _to_markdown(self, html: str) -> str:
-        """Convert HTML to markdown."""
-        # Convert links, headings, lists before stripping tags
-        text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
-                      lambda m: f'[{_strip_tags(m[2])}]({m[1]})', html, flags=re.I)
-        text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
-                      lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
-        text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
-        text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
-        text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
-        return _normalize(_strip_tags(text))
+    async def _fetch(self, url: str, max_chars: int) -> tuple[CachedPage, str, bool]:
+        """
+        Get a page from the cache or the network.
+
+        The body is streamed and only as much is read as ``max_chars`` of
+        output can need; binary responses are rejected after the first chunk.
+        Returns the page, the cache status ("hit", "revalidated" or "miss")
+        and whether the page is in the cache (truncated bodies never are).
+        """
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached.fresh:
+            return cached, "hit", True
+
+        headers = {"User-Agent": USER_AGENT, **(cached.validators() if cached else {})}
+        # The shared client caps redirects (MAX_REDIRECTS) to prevent DoS attacks
+        async with http_client().stream(
+            "GET", url, headers=headers, follow_redirects=True, timeout=30.0
+        ) as r:
+            if r.status_code == 304 and cached:
+                self.cache.refresh(cached, r.headers)
+                return cached, "revalidated", True
+            r.raise_for_status()
+            ctype = r.headers.get("content-type", "")
+            if _is_binary(ctype, b""):
+                raise ValueError(f"Unsupported binary content ({ctype})")
+            if _is_html(ctype):
+                body, truncated = await _read_capped(r, max_chars * HTML_BYTES_PER_CHAR, None)
+            elif "json" in ctype:  # pretty-printed afterwards, so cap bytes rather than characters
+                body, truncated = await _read_capped(r, max_chars * TEXT_BYTES_PER_CHAR, None)
+            else:
+                body, truncated = await _read_capped(r, max_chars * TEXT_BYTES_PER_CHAR, max_chars)
+
+        page = CachedPage(
+            url=url,
+            final_url=str(r.url),
+            status=r.status_code,
+            content_type=ctype,
+            encoding=r.encoding,
+            body=body,
+            etag=r.headers.get("etag"),
+            last_modified=r.headers.get("last-modified"),
+            truncated=truncated,
+        )
+        stored = self.cache.put(page, r.headers) if self.cache and not truncated else False
+        return page, "miss", stored
+    
+    async def _extract(self, page: CachedPage, mode: str) -> tuple[str, str]:
+        """Extract (text, extractor) from a page body; large pages are parsed in a worker process."""
+        args = (page.text, page.content_type, mode, page.truncated)
+        if len(page.body) < INLINE_LIMIT:
+            return extract_page(*args)
+        return await extraction_pool().run(extract_page, *args)
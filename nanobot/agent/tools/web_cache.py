@@ -0,0 +1,344 @@
+"""Caches for the web tools: web_fetch responses and extractions on disk, web_search results in memory."""
+
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Mapping
+
+from loguru import logger
+
+from nanobot.providers.ratelimit import RateLimiter
+
+MAX_HEURISTIC_TTL = 24 * 3600  # cap for freshness guessed from Last-Modified
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_type TEXT NOT NULL,
+    encoding TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    body BLOB NOT NULL,
+    body_hash TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS extractions (
+    url TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    extractor TEXT NOT NULL,
+    text TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (url, mode)
+);
+"""
+
+
+@dataclass
+class CachedPage:
+    """A fetched response body with the metadata needed to revalidate it."""
+    url: str
+    final_url: str
+    status: int
+    content_type: str
+    encoding: str | None
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    expires_at: float = 0.0
+    body_hash: str = field(default="")
+    truncated: bool = False  # body cut at the download cap (never stored)
+
+    def __post_init__(self) -> None:
+        if not self.body_hash:
+            self.body_hash = hashlib.sha256(self.body).hexdigest()
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _cache_control(headers: Mapping[str, str]) -> dict[str, str]:
+    directives = {}
+    for part in headers.get("cache-control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness(headers: Mapping[str, str]) -> float | None:
+    """
+    Seconds a response may be served without revalidation (RFC 9111, as a private cache).
+
+    Returns None if the response must not be stored.
+    """
+    cc = _cache_control(headers)
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0.0
+    if "max-age" in cc:
+        try:
+            return max(0.0, float(cc["max-age"]) - float(headers.get("age", 0)))
+        except ValueError:
+            return 0.0
+    date = _http_date(headers.get("date")) or time.time()
+    if expires := headers.get("expires"):
+        expires_at = _http_date(expires)
+        return max(0.0, expires_at - date) if expires_at else 0.0
+    if last_modified := _http_date(headers.get("last-modified")):
+        return min(MAX_HEURISTIC_TTL, max(0.0, (date - last_modified) / 10))
+    return 0.0
+
+
+class FetchCache:
+    """
+    Size-bounded on-disk cache for web_fetch (one SQLite database).
+
+    Raw responses are stored per URL with their ETag / Last-Modified, so
+    stale entries are revalidated with a conditional GET. Extracted text is
+    stored per URL and extract mode, tied to the body it came from, so a
+    304 (or a fresh hit) skips parsing entirely. When responses and
+    extractions together exceed ``max_bytes``, the least recently used
+    URLs are evicted.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 100 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10.0)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def get(self, url: str) -> CachedPage | None:
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT final_url, status, content_type, encoding, etag, last_modified, body, body_hash, expires_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with db:
+                db.execute("UPDATE responses SET last_used = ? WHERE url = ?", (time.time(), url))
+        final_url, status, content_type, encoding, etag, last_modified, body, body_hash, expires_at = row
+        return CachedPage(
+            url=url, final_url=final_url, status=status, content_type=content_type, encoding=encoding,
+            body=body, etag=etag, last_modified=last_modified, expires_at=expires_at, body_hash=body_hash,
+        )
+
+    def put(self, page: CachedPage, headers: Mapping[str, str]) -> bool:
+        """Store a 200 response if its headers allow it; returns whether it was stored."""
+        ttl = freshness(headers)
+        if page.status != 200 or ttl is None or (ttl <= 0 and not (page.etag or page.last_modified)):
+            return False
+        page.expires_at = time.time() + ttl
+        size = len(page.body)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (url, final_url, status, content_type, encoding, etag, "
+                    "last_modified, body, body_hash, expires_at, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (page.url, page.final_url, page.status, page.content_type, page.encoding, page.etag,
+                     page.last_modified, page.body, page.body_hash, page.expires_at, size, time.time()),
+                )
+                self._evict(db)
+        return True
+
+    def refresh(self, page: CachedPage, headers: Mapping[str, str]) -> None:
+        """Record a 304 for ``page``: new freshness and validators, body unchanged."""
+        ttl = freshness(headers)
+        page.expires_at = time.time() + (ttl or 0.0)
+        page.etag = headers.get("etag") or page.etag
+        page.last_modified = headers.get("last-modified") or page.last_modified
+        with self._lock:
+            db = self._db()
+            with db:
+                if ttl is None:
+                    db.execute("DELETE FROM responses WHERE url = ?", (page.url,))
+                    db.execute("DELETE FROM extractions WHERE url = ?", (page.url,))
+                    return
+                db.execute(
+                    "UPDATE responses SET expires_at = ?, etag = ?, last_modified = ?, last_used = ? WHERE url = ?",
+                    (page.expires_at, page.etag, page.last_modified, time.time(), page.url),
+                )
+
+    def get_extraction(self, url: str, mode: str, body_hash: str) -> tuple[str, str] | None:
+        """Cached (text, extractor) for a body, if it was extracted in this mode before."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT text, extractor FROM extractions WHERE url = ? AND mode = ? AND body_hash = ?",
+                (url, mode, body_hash),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put_extraction(self, url: str, mode: str, body_hash: str, text: str, extractor: str) -> None:
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO extractions (url, mode, body_hash, extractor, text, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, mode, body_hash, extractor, text, len(text.encode("utf-8"))),
+                )
+                self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute(
+            "SELECT (SELECT COALESCE(SUM(size), 0) FROM responses) + (SELECT COALESCE(SUM(size), 0) FROM extractions)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims, freed = [], 0
+        for url, size in db.execute(
+            "SELECT r.url, r.size + COALESCE((SELECT SUM(e.size) FROM extractions e WHERE e.url = r.url), 0) "
+            "FROM responses r ORDER BY r.last_used"
+        ):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((url,))
+            freed += size
+        db.executemany("DELETE FROM responses WHERE url = ?", victims)
+        db.executemany("DELETE FROM extractions WHERE url = ?", victims)
+        logger.debug(f"web_fetch cache: evicted {len(victims)} pages ({freed} bytes)")
+
+
+# Words that rarely change what a search engine returns
+# Direction words (from, to, ...) are not stopwords: "paris to london" and "london to paris" differ
+STOPWORDS = frozenset(
+    "a an and are as at be by for how i in is it of on or that the this what when where which who why".split()
+)
+_QUERY_TERM = re.compile(r'-?"[^"]*"|\S+')
+
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key for a search query: case, spacing, punctuation and stopwords are ignored.
+
+    Term order is kept, since it carries meaning ("java to python").
+    Quoted phrases and operators (``site:``, ``-term``) are kept as whole
+    terms. A query made only of stopwords keeps them.
+    """
+    terms = [t.strip(",;!?.") if not t.endswith('"') else t for t in _QUERY_TERM.findall(query.casefold())]
+    terms = [t for t in terms if t]
+    kept = [t for t in terms if t not in STOPWORDS] or terms
+    return " ".join(kept)
+
+
+class SearchCache:
+    """
+    In-memory web_search results, shared by the agent and its subagents.
+
+    Results are keyed by normalized query and count, and kept for ``ttl``
+    seconds; an entry for a larger count also serves smaller ones.
+    Concurrent searches for the same key share one request (single-flight).
+    ``limiter`` paces every request to the search API.
+    """
+
+    def __init__(self, ttl: float = 900.0, max_entries: int = 1000, limiter: RateLimiter | None = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.limiter = limiter or RateLimiter(max_concurrency=4)
+        self._entries: dict[tuple[str, int], tuple[float, list[dict[str, Any]]]] = {}
+        self._in_flight: dict[tuple[str, int], asyncio.Future[list[dict[str, Any]]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, count: int) -> list[dict[str, Any]] | None:
+        key = normalize_query(query)
+        now = time.monotonic()
+        for n in range(count, 11):
+            entry = self._entries.get((key, n))
+            if entry and entry[0] > now:
+                return entry[1][:count]
+        return None
+
+    def put(self, query: str, count: int, results: list[dict[str, Any]]) -> None:
+        if self.ttl <= 0:
+            return
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]  # oldest insertion
+        self._entries[(normalize_query(query), count)] = (now + self.ttl, results)
+
+    async def search(
+        self,
+        query: str,
+        count: int,
+        fetch: Callable[[str, int], Awaitable[list[dict[str, Any]]]],
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Results for ``query`` from the cache, an identical search in flight, or ``fetch``; returns (results, cached)."""
+        if (cached := self.get(query, count)) is not None:
+            self.hits += 1
+            return cached, True
+        key = (normalize_query(query), count)
+        if shared := self._in_flight.get(key):
+            self.hits += 1
+            return await asyncio.shield(shared), True
+        self.misses += 1
+        future = asyncio.ensure_future(self._fetch(query, count, fetch))
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # retrieved even if every caller left
+        self._in_flight[key] = future
+        # A cancelled caller must not cancel the search other callers are waiting for
+        return await asyncio.shield(future), False
+
+    async def _fetch(
+        self, query: str, count: int, fetch: Callable[[str, int], Awaitable[list[dict[str, Any]]]]
+    ) -> list[dict[str, Any]]:
+        try:
+            results = await fetch(query, count)
+        finally:
+            self._in_flight.pop((normalize_query(query), count), None)
+        self.put(query, count, results)
+        logger.debug(f"web_search: fetched '{query}' ({len(results)} results, {self.hits} hits / {self.misses} misses)")
+        return results
@@ -0,0 +1,148 @@
+"""Outbound dispatcher with an independent queue and workers per channel."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+
+OutboundCallback = Callable[[OutboundMessage], Awaitable[None]]
+SLOW_DELIVERY_SECONDS = 30.0  # deliveries slower than this (end to end) are logged as warnings
+
+
+@dataclass
+class DeliveryStats:
+    """Delivery counters and end-to-end latency (bus publish -> send done) for one channel."""
+    sent: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    dropped: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    def record(self, latency: float) -> None:
+        self.sent += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.sent if self.sent else 0.0
+
+
+@dataclass
+class _Lane:
+    """Queues and workers of one channel; a chat always maps to the same worker."""
+    queues: list[asyncio.Queue[OutboundMessage]]
+    workers: list[asyncio.Task[None]] = field(default_factory=list)
+
+
+class OutboundDispatcher:
+    """
+    Routes outbound messages to per-channel lanes.
+
+    Each subscribed channel gets its own bounded queues and
+    ``workers_per_channel`` workers, so a channel that is rate limited or
+    stalled only delays its own messages. Messages of one chat always go
+    to the same worker and are delivered in order (which also keeps the
+    deltas of a streamed reply in order). Each send is bounded by
+    ``send_timeout`` seconds (0 = no limit). When a channel's queue is full,
+    new messages for it are dropped rather than blocking other channels.
+    """
+
+    def __init__(self, workers_per_channel: int = 1, send_timeout: float = 0.0, max_pending: int = 0):
+        self.workers_per_channel = max(1, workers_per_channel)
+        self.send_timeout = send_timeout
+        self.max_pending = max_pending
+        self._subscribers: dict[str, list[OutboundCallback]] = {}
+        self._lanes: dict[str, _Lane] = {}
+        self._stats: dict[str, DeliveryStats] = {}
+        self._running = True  # cleared by stop(), even if that comes before run() starts
+
+    def subscribe(self, channel: str, callback: OutboundCallback) -> None:
+        """Deliver a channel's outbound messages to ``callback``."""
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    async def run(self, consume: Callable[[], Awaitable[OutboundMessage]]) -> None:
+        """Route messages from ``consume`` until stopped; stops the workers on exit."""
+        try:
+            while self._running:
+                try:
+                    msg = await asyncio.wait_for(consume(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                self.route(msg)
+        finally:
+            await self._stop_workers()
+
+    def stop(self) -> None:
+        """Stop routing after the current message."""
+        self._running = False
+
+    def route(self, msg: OutboundMessage) -> None:
+        """Queue a message on its channel's lane (never blocks)."""
+        if not self._subscribers.get(msg.channel):
+            logger.warning(f"Unknown channel: {msg.channel}")
+            return
+        lane = self._lanes.get(msg.channel) or self._start_lane(msg.channel)
+        queue = lane.queues[hash(msg.chat_id) % len(lane.queues)]
+        try:
+            queue.put_nowait(msg)
+        except asyncio.QueueFull:
+            self._stats[msg.channel].dropped += 1
+            logger.warning(f"Outbound queue for {msg.channel} is full, dropping message to {msg.chat_id}")
+
+    def _start_lane(self, channel: str) -> _Lane:
+        maxsize = -(-self.max_pending // self.workers_per_channel) if self.max_pending > 0 else 0
+        lane = _Lane(queues=[asyncio.Queue(maxsize=maxsize) for _ in range(self.workers_per_channel)])
+        lane.workers = [asyncio.create_task(self._work(channel, q)) for q in lane.queues]
+        self._lanes[channel] = lane
+        self._stats.setdefault(channel, DeliveryStats())
+        return lane
+
+    async def _work(self, channel: str, queue: asyncio.Queue[OutboundMessage]) -> None:
+        while True:
+            msg = await queue.get()
+            for callback in self._subscribers.get(channel, []):
+                await self._deliver(channel, self._stats[channel], callback, msg)
+
+    async def _deliver(
+        self, channel: str, stats: DeliveryStats, callback: OutboundCallback, msg: OutboundMessage
+    ) -> None:
+        try:
+            if self.send_timeout > 0:
+                await asyncio.wait_for(callback(msg), timeout=self.send_timeout)
+            else:
+                await callback(msg)
+        except asyncio.TimeoutError:
+            stats.timed_out += 1
+            logger.error(f"Sending to {channel}:{msg.chat_id} timed out after {self.send_timeout}s")
+            return
+        except Exception as e:
+            stats.failed += 1
+            logger.error(f"Error sending to {channel}: {e}")
+            return
+        latency = time.monotonic() - (msg.enqueued_at or time.monotonic())
+        stats.record(latency)
+        if latency > SLOW_DELIVERY_SECONDS:
+            logger.warning(f"Delivery to {channel}:{msg.chat_id} took {latency:.1f}s")
+
+    async def _stop_workers(self) -> None:
+        lanes, self._lanes = self._lanes, {}
+        tasks = [t for lane in lanes.values() for t in lane.workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def pending(self, channel: str) -> int:
+        """Messages queued for a channel but not delivered yet."""
+        lane = self._lanes.get(channel)
+        return sum(q.qsize() for q in lane.queues) if lane else 0
+
+    @property
+    def stats(self) -> dict[str, DeliveryStats]:
+        """Delivery stats per channel."""
+        return dict(self._stats)
@@ -16,6 +16,8 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    enqueued_at: float | None = None  # Monotonic time the bus accepted the message
+    queue_wait: float | None = None  # Seconds between publishing and the agent starting the turn
     
     @property
     def session_key(self) -> str:
@@ -25,7 +27,13 @@ class InboundMessage:
 
 @dataclass
 class OutboundMessage:
-    """Message to send to a chat channel."""
+    """
+    Message to send to a chat channel.
+
+    A streamed reply is a series of messages sharing ``stream_id``: deltas
+    (``delta=True``, content is only the new text) followed by one final
+    message with the complete content.
+    """
     
     channel: str
     chat_id: str
@@ -33,5 +41,9 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    stream_id: str | None = None  # Groups the deltas and final message of one streamed reply
+    delta: bool = False  # True for a partial chunk of a streamed reply
+    enqueued_at: float | None = None  # Monotonic time the bus accepted the message
+    queue_wait: float | None = None  # Seconds spent in the outbound queue
 
 
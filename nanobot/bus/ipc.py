@@ -0,0 +1,304 @@
+"""Cross-process message bus transport over a Unix domain socket (msgpack framed)."""
+
+import asyncio
+import bisect
+import dataclasses
+import hashlib
+import itertools
+from collections.abc import AsyncIterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import msgpack
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+
+DirectHandler = Callable[[str, str, str, str], Awaitable[str]]
+RESTART_DELAY_S = 2.0  # wait before restarting a worker process that exited
+CONNECT_ATTEMPTS = 50  # worker connection retries (0.2s apart) while the front starts up
+
+
+def encode_message(msg: InboundMessage | OutboundMessage) -> dict[str, Any]:
+    """Bus message as a msgpack-friendly dict (process-local timing fields dropped)."""
+    data = dataclasses.asdict(msg)
+    data.pop("enqueued_at", None)
+    data.pop("queue_wait", None)
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+    return data
+
+
+def decode_inbound(data: dict[str, Any]) -> InboundMessage:
+    return InboundMessage(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+
+
+def decode_outbound(data: dict[str, Any]) -> OutboundMessage:
+    return OutboundMessage(**data)
+
+
+def _pack(frame: dict[str, Any]) -> bytes:
+    # Channel metadata may hold odd types (e.g. SDK objects); send those as strings
+    return msgpack.packb(frame, use_bin_type=True, default=str)
+
+
+async def _read_frames(reader: asyncio.StreamReader) -> AsyncIterator[dict[str, Any]]:
+    """Yield frames until EOF; msgpack objects are self-delimiting on the stream."""
+    unpacker = msgpack.Unpacker(raw=False)
+    while chunk := await reader.read(65536):
+        unpacker.feed(chunk)
+        for frame in unpacker:
+            yield frame
+
+
+def routing_key(msg: InboundMessage) -> str:
+    """Session a message belongs to (system messages carry it in chat_id)."""
+    if msg.channel == "system":
+        return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+    return msg.session_key
+
+
+class HashRing:
+    """Consistent hash ring mapping session keys to worker indexes."""
+
+    def __init__(self, nodes: int, replicas: int = 64):
+        points = sorted((self._hash(f"worker-{n}#{r}"), n) for n in range(nodes) for r in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._nodes = [n for _, n in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def node_for(self, key: str) -> int:
+        i = bisect.bisect(self._hashes, self._hash(key)) % len(self._hashes)
+        return self._nodes[i]
+
+
+class IpcFront:
+    """
+    Front-process side of the multi-process gateway.
+
+    Holds the channels' bus: consumes its inbound messages and routes each
+    to an agent worker process by consistent hash of its session key, so a
+    session's state stays in one worker. Outbound messages from workers are
+    published back on the bus for the channel dispatcher. Messages for a
+    worker that is (re)connecting are queued until it is back.
+
+    Frames are msgpack maps with an ``op``: front -> worker ``inbound`` and
+    ``direct`` (a request answered with ``result``, used by cron and
+    heartbeat); worker -> front ``hello``, ``outbound`` and ``result``.
+    """
+
+    def __init__(self, bus: MessageBus, socket_path: Path, workers: int):
+        self.bus = bus
+        self.socket_path = socket_path
+        self.workers = max(1, workers)
+        self.ring = HashRing(self.workers)
+        self._outgoing: list[asyncio.Queue[dict[str, Any]]] = [asyncio.Queue() for _ in range(self.workers)]
+        self._unsent: dict[int, dict[str, Any]] = {}  # frame a lost connection failed to send, sent first
+        self._connections: dict[int, asyncio.Task[None]] = {}
+        self._results: dict[int, tuple[int, asyncio.Future[str]]] = {}
+        self._ids = itertools.count(1)
+        self._server: asyncio.AbstractServer | None = None
+        self._processes: list[asyncio.subprocess.Process | None] = [None] * self.workers
+        self._supervisors: list[asyncio.Task[None]] = []
+        self._running = False
+
+    async def start(self) -> None:
+        """Listen on the Unix socket."""
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._on_connect, path=str(self.socket_path))
+        self._running = True
+        logger.info(f"IPC bus listening on {self.socket_path} for {self.workers} workers")
+
+    def spawn_workers(self, argv: Callable[[int], list[str]]) -> None:
+        """Start the worker processes (``argv(index)``) and restart any that exit."""
+        self._supervisors = [asyncio.create_task(self._supervise(i, argv(i))) for i in range(self.workers)]
+
+    async def _supervise(self, index: int, argv: list[str]) -> None:
+        while self._running:
+            proc = await asyncio.create_subprocess_exec(*argv)
+            self._processes[index] = proc
+            code = await proc.wait()
+            if self._running:
+                logger.error(f"Agent worker {index} exited with code {code}, restarting")
+                await asyncio.sleep(RESTART_DELAY_S)
+
+    async def run(self) -> None:
+        """Route inbound messages from the bus to the workers."""
+        while self._running:
+            try:
+                msg = await asyncio.wait_for(self.bus.consume_inbound(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            if not self.bus.inbound_started(msg):
+                continue
+            worker = self.ring.node_for(routing_key(msg))
+            await self._outgoing[worker].put({"op": "inbound", "msg": encode_message(msg)})
+
+    async def process_direct(
+        self, content: str, session_key: str, channel: str = "cli", chat_id: str = "direct"
+    ) -> str:
+        """Run a message through the agent on the session's worker and return the reply."""
+        worker = self.ring.node_for(session_key)
+        request_id = next(self._ids)
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._results[request_id] = (worker, future)
+        await self._outgoing[worker].put({
+            "op": "direct", "id": request_id, "content": content,
+            "session_key": session_key, "channel": channel, "chat_id": chat_id,
+        })
+        try:
+            return await future
+        finally:
+            self._results.pop(request_id, None)
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        frames = _read_frames(reader)
+        try:
+            hello = await anext(frames)
+            index = int(hello["worker"])
+            if hello.get("op") != "hello" or not 0 <= index < self.workers:
+                raise ValueError(f"bad hello frame: {hello}")
+        except (StopAsyncIteration, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rejecting IPC connection: {e}")
+            writer.close()
+            return
+
+        if old := self._connections.get(index):
+            old.cancel()
+        logger.info(f"Agent worker {index} connected")
+        sender = asyncio.create_task(self._send_loop(index, writer))
+        self._connections[index] = sender
+        try:
+            async for frame in frames:
+                await self._on_frame(frame)
+        except Exception as e:
+            logger.error(f"IPC connection to worker {index} failed: {e}")
+        finally:
+            sender.cancel()
+            if self._connections.get(index) is sender:
+                del self._connections[index]
+            writer.close()
+            logger.warning(f"Agent worker {index} disconnected")
+            for request_id, (worker, future) in list(self._results.items()):
+                if worker == index and not future.done():
+                    future.set_exception(ConnectionError(f"agent worker {index} disconnected"))
+
+    async def _on_frame(self, frame: dict[str, Any]) -> None:
+        op = frame.get("op")
+        if op == "outbound":
+            await self.bus.publish_outbound(decode_outbound(frame["msg"]))
+        elif op == "result":
+            _, future = self._results.get(frame["id"], (None, None))
+            if future and not future.done():
+                if frame.get("error"):
+                    future.set_exception(RuntimeError(frame["error"]))
+                else:
+                    future.set_result(frame.get("content") or "")
+        else:
+            logger.warning(f"Unknown IPC frame from worker: {op}")
+
+    async def _send_loop(self, index: int, writer: asyncio.StreamWriter) -> None:
+        queue = self._outgoing[index]
+        while True:
+            frame = self._unsent.pop(index, None) or await queue.get()
+            try:
+                writer.write(_pack(frame))
+                await writer.drain()  # backpressure: a busy worker stops reading
+            except (ConnectionError, OSError):
+                # Resent before anything queued after it, once the worker reconnects (keeps session order)
+                self._unsent[index] = frame
+                return
+            except asyncio.CancelledError:
+                self._unsent[index] = frame
+                raise
+
+    async def close(self) -> None:
+        """Stop routing, terminate the workers and close the socket."""
+        self._running = False
+        for task in [*self._supervisors, *self._connections.values()]:
+            task.cancel()
+        for proc in self._processes:
+            if proc and proc.returncode is None:
+                proc.terminate()
+        await asyncio.gather(
+            *(p.wait() for p in self._processes if p and p.returncode is None), return_exceptions=True
+        )
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class IpcWorker:
+    """
+    Agent-worker side of the multi-process gateway.
+
+    Publishes inbound messages from the front on the worker's local bus
+    (where ``AgentLoop`` consumes them), forwards the local bus's outbound
+    messages to the front, and answers ``direct`` requests with ``handle_direct``.
+    """
+
+    def __init__(self, bus: MessageBus, socket_path: Path, index: int, handle_direct: DirectHandler):
+        self.bus = bus
+        self.socket_path = socket_path
+        self.index = index
+        self.handle_direct = handle_direct
+        self._writer: asyncio.StreamWriter | None = None
+        self._write_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        """Connect to the front and relay messages until the connection closes."""
+        reader, self._writer = await self._connect()
+        await self._send({"op": "hello", "worker": self.index})
+        logger.info(f"Agent worker {self.index} connected to {self.socket_path}")
+        forwarder = asyncio.create_task(self._forward_outbound())
+        requests: set[asyncio.Task[None]] = set()
+        try:
+            async for frame in _read_frames(reader):
+                if frame.get("op") == "inbound":
+                    await self.bus.publish_inbound(decode_inbound(frame["msg"]))
+                elif frame.get("op") == "direct":
+                    task = asyncio.create_task(self._answer(frame))
+                    requests.add(task)
+                    task.add_done_callback(requests.discard)
+        finally:
+            forwarder.cancel()
+            for task in requests:
+                task.cancel()
+            self._writer.close()
+        logger.info(f"Agent worker {self.index}: front closed the connection")
+
+    async def _connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        for _ in range(CONNECT_ATTEMPTS - 1):
+            try:
+                return await asyncio.open_unix_connection(str(self.socket_path))
+            except (ConnectionError, FileNotFoundError):
+                await asyncio.sleep(0.2)
+        return await asyncio.open_unix_connection(str(self.socket_path))
+
+    async def _send(self, frame: dict[str, Any]) -> None:
+        async with self._write_lock:
+            self._writer.write(_pack(frame))
+            await self._writer.drain()
+
+    async def _forward_outbound(self) -> None:
+        while True:
+            msg = await self.bus.consume_outbound()
+            await self._send({"op": "outbound", "msg": encode_message(msg)})
+
+    async def _answer(self, frame: dict[str, Any]) -> None:
+        try:
+            content = await self.handle_direct(
+                frame["content"], frame["session_key"], frame["channel"], frame["chat_id"]
+            )
+            reply = {"op": "result", "id": frame["id"], "content": content}
+        except Exception as e:
+            logger.error(f"Direct request on worker {self.index} failed: {e}")
+            reply = {"op": "result", "id": frame["id"], "error": str(e)}
+        await self._send(reply)
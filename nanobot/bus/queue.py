@@ -1,80 +1,256 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
-from typing import Callable, Awaitable
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Callable, Awaitable, Literal
 
 from loguru import logger
 
+from nanobot.bus.dispatcher import OutboundDispatcher
 from nanobot.bus.events import InboundMessage, OutboundMessage
 
+OverflowPolicy = Literal["drop_oldest", "merge", "reject"]
+SLOW_WAIT_SECONDS = 30.0  # queue waits longer than this are logged as warnings
+DEFAULT_BUSY_MESSAGE = "I'm busy with earlier messages right now, please try again in a moment."
+
+
+@dataclass
+class QueueStats:
+    """Counters and queue-wait totals for one direction of the bus."""
+    accepted: int = 0
+    dropped: int = 0
+    merged: int = 0
+    rejected: int = 0
+    delivered: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.delivered += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.delivered if self.delivered else 0.0
+
 
 class MessageBus:
     """
     Async message bus that decouples chat channels from the agent core.
-    
+
     Channels push messages to the inbound queue, and the agent processes
     them and pushes responses to the outbound queue.
+
+    An inbound message counts as pending from when it is published until the
+    agent starts its turn (``inbound_started``), including the time it waits
+    behind earlier turns of its session. Limits (0 = unlimited):
+
+    - ``max_inbound``: pending messages overall; publishers wait for room
+      (backpressure).
+    - ``max_per_channel`` / ``max_per_session``: pending messages per channel
+      or chat; on overflow ``overflow`` decides: merge into the newest
+      pending message of the chat (or reject, if it has none), reject with a
+      busy reply, or drop the oldest pending message without notice.
+    - ``max_outbound``: queued replies; the agent waits for room.
+
+    Outbound messages are delivered by an ``OutboundDispatcher`` with
+    independent queues and workers per channel (see ``subscribe_outbound``
+    and ``dispatch_outbound``).
+
+    System messages (e.g. subagent results) are never limited or shed. The
+    queue wait of each message is stored in ``msg.queue_wait``.
     """
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        max_inbound: int = 0,
+        max_outbound: int = 0,
+        max_per_channel: int = 0,
+        max_per_session: int = 0,
+        overflow: OverflowPolicy = "merge",
+        busy_message: str = DEFAULT_BUSY_MESSAGE,
+        outbound_workers: int = 1,
+        send_timeout: float = 0.0,
+        max_outbound_per_channel: int = 0,
+    ):
         self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
-        self._outbound_subscribers: dict[str, list[Callable[[OutboundMessage], Awaitable[None]]]] = {}
-        self._running = False
-    
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
+        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue(maxsize=max(0, max_outbound))
+        self.max_inbound = max_inbound
+        self.max_per_channel = max_per_channel
+        self.max_per_session = max_per_session
+        self.overflow = overflow
+        self.busy_message = busy_message
+        self.inbound_stats = QueueStats()
+        self.outbound_stats = QueueStats()
+        self._inbound_slots = asyncio.Semaphore(max_inbound) if max_inbound > 0 else None
+        # Pending (published, not started) messages per session, oldest first
+        self._pending: dict[str, deque[InboundMessage]] = {}
+        self._pending_per_channel: Counter[str] = Counter()
+        self._pending_system = 0
+        self._busy_notified: set[str] = set()  # sessions already sent a busy reply
+        self.dispatcher = OutboundDispatcher(
+            workers_per_channel=outbound_workers,
+            send_timeout=send_timeout,
+            max_pending=max_outbound_per_channel,
+        )
+
+    async def publish_inbound(self, msg: InboundMessage) -> bool:
+        """
+        Publish a message from a channel to the agent.
+
+        Returns:
+            False if the message was rejected or merged into a pending one.
+        """
+        msg.enqueued_at = time.monotonic()
+        if msg.channel != "system":
+            if self._over_limit(msg):
+                if not await self._shed(msg):
+                    return False
+            if self._inbound_slots:
+                await self._inbound_slots.acquire()
+            self._pending.setdefault(msg.session_key, deque()).append(msg)
+            self._pending_per_channel[msg.channel] += 1
+        else:
+            self._pending_system += 1
+        self.inbound_stats.accepted += 1
         await self.inbound.put(msg)
-    
+        return True
+
     async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
-    
+        """Consume the next inbound message (blocks until available), skipping dropped ones."""
+        while True:
+            msg = await self.inbound.get()
+            if msg.channel == "system" or self._is_pending(msg):
+                return msg
+
+    def inbound_started(self, msg: InboundMessage) -> bool:
+        """
+        Mark a consumed message as being processed now and record its queue wait.
+
+        Returns:
+            False if the message was dropped while pending and must be skipped.
+        """
+        if msg.enqueued_at is None:
+            return True  # not published through the bus
+        if msg.channel == "system":
+            self._pending_system -= 1
+        elif self._is_pending(msg):
+            self._remove_pending(msg)
+            self._busy_notified.discard(msg.session_key)
+        else:
+            return False
+        msg.queue_wait = time.monotonic() - (msg.enqueued_at or time.monotonic())
+        self.inbound_stats.record_wait(msg.queue_wait)
+        self._log_wait("Inbound", msg.channel, msg.chat_id, msg.queue_wait)
+        return True
+
+    def _is_pending(self, msg: InboundMessage) -> bool:
+        return any(m is msg for m in self._pending.get(msg.session_key, ()))
+
+    def _over_limit(self, msg: InboundMessage) -> bool:
+        session_full = self.max_per_session and len(self._pending.get(msg.session_key, ())) >= self.max_per_session
+        channel_full = self.max_per_channel and self._pending_per_channel[msg.channel] >= self.max_per_channel
+        return bool(session_full or channel_full)
+
+    async def _shed(self, msg: InboundMessage) -> bool:
+        """Apply the overflow policy; True if ``msg`` should still be queued."""
+        session = self._pending.get(msg.session_key)
+        if self.overflow == "merge" and session:
+            target = session[-1]
+            target.content = f"{target.content}\n{msg.content}"
+            target.media.extend(msg.media)
+            self.inbound_stats.merged += 1
+            logger.info(f"Inbound queue full for {msg.session_key}, merged message into a pending one")
+            return False
+        if self.overflow == "drop_oldest":
+            if self.max_per_session and session and len(session) >= self.max_per_session:
+                victim = session[0]
+            else:
+                victim = min(
+                    (q[0] for q in self._pending.values() if q and q[0].channel == msg.channel),
+                    key=lambda m: m.enqueued_at or 0.0,
+                    default=None,
+                )
+            if victim is not None:
+                self._remove_pending(victim)
+                self.inbound_stats.dropped += 1
+                logger.warning(f"Inbound queue full for {msg.channel}, dropped oldest message of {victim.session_key}")
+                return True
+        self.inbound_stats.rejected += 1
+        logger.warning(f"Inbound queue full for {msg.session_key}, rejecting message")
+        if msg.session_key in self._busy_notified:
+            return False
+        self._busy_notified.add(msg.session_key)
+        await self.publish_outbound(OutboundMessage(
+            channel=msg.channel,
+            chat_id=msg.chat_id,
+            content=self.busy_message,
+            metadata=msg.metadata or {},
+        ))
+        return False
+
+    def _remove_pending(self, msg: InboundMessage) -> None:
+        pending = self._pending[msg.session_key]
+        for i, m in enumerate(pending):
+            if m is msg:
+                del pending[i]
+                break
+        if not pending:
+            del self._pending[msg.session_key]
+        self._pending_per_channel[msg.channel] -= 1
+        if self._pending_per_channel[msg.channel] <= 0:
+            del self._pending_per_channel[msg.channel]
+        if self._inbound_slots:
+            self._inbound_slots.release()
+
     async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels."""
+        """Publish a response from the agent to channels (waits while the queue is full)."""
+        msg.enqueued_at = time.monotonic()
+        self.outbound_stats.accepted += 1
         await self.outbound.put(msg)
-    
+
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
-        return await self.outbound.get()
-    
+        msg = await self.outbound.get()
+        msg.queue_wait = time.monotonic() - (msg.enqueued_at or time.monotonic())
+        self.outbound_stats.record_wait(msg.queue_wait)
+        self._log_wait("Outbound", msg.channel, msg.chat_id, msg.queue_wait)
+        return msg
+
+    @staticmethod
+    def _log_wait(direction: str, channel: str, chat_id: str, wait: float) -> None:
+        if wait > SLOW_WAIT_SECONDS:
+            logger.warning(f"{direction} message for {channel}:{chat_id} waited {wait:.1f}s in queue")
+        else:
+            logger.debug(f"{direction} message for {channel}:{chat_id} waited {wait:.3f}s in queue")
+
     def subscribe_outbound(
-        self, 
-        channel: str, 
+        self,
+        channel: str,
         callback: Callable[[OutboundMessage], Awaitable[None]]
     ) -> None:
         """Subscribe to outbound messages for a specific channel."""
-        if channel not in self._outbound_subscribers:
-            self._outbound_subscribers[channel] = []
-        self._outbound_subscribers[channel].append(callback)
-    
+        self.dispatcher.subscribe(channel, callback)
+
     async def dispatch_outbound(self) -> None:
         """
         Dispatch outbound messages to subscribed channels.
         Run this as a background task.
         """
-        self._running = True
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
-                subscribers = self._outbound_subscribers.get(msg.channel, [])
-                for callback in subscribers:
-                    try:
-                        await callback(msg)
-                    except Exception as e:
-                        logger.error(f"Error dispatching to {msg.channel}: {e}")
-            except asyncio.TimeoutError:
-                continue
-    
+        await self.dispatcher.run(self.consume_outbound)
+
     def stop(self) -> None:
         """Stop the dispatcher loop."""
-        self._running = False
-    
+        self.dispatcher.stop()
+
     @property
     def inbound_size(self) -> int:
-        """Number of pending inbound messages."""
-        return self.inbound.qsize()
-    
+        """Number of pending inbound messages (published, turn not started yet)."""
+        return sum(len(q) for q in self._pending.values()) + self._pending_system
+
     @property
     def outbound_size(self) -> int:
         """Number of pending outbound messages."""
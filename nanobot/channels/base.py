@@ -1,6 +1,9 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 from loguru import logger
@@ -9,15 +12,60 @@ from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
 
 
+@dataclass
+class _StreamState:
+    """Progress of one streamed reply being rendered by message edits."""
+    text: str = ""
+    handle: Any = None  # Platform message reference returned by _stream_start
+    rendered: str = ""
+    last_edit: float = 0.0
+
+
+@dataclass
+class _Burst:
+    """Messages from one chat held back to be merged into a single turn."""
+    messages: list[InboundMessage] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    timer: asyncio.Task | None = None
+
+
+def merge_inbound(messages: list[InboundMessage]) -> InboundMessage:
+    """Merge consecutive messages of one sender into one (text joined by newlines, media appended)."""
+    if len(messages) == 1:
+        return messages[0]
+    first, last = messages[0], messages[-1]
+    return replace(
+        last,
+        content="\n".join(m.content for m in messages if m.content),
+        timestamp=first.timestamp,
+        media=[path for m in messages for path in m.media],
+        metadata={**last.metadata, "coalesced_count": len(messages)},
+    )
+
+
 class BaseChannel(ABC):
     """
     Abstract base class for chat channel implementations.
     
     Each channel (Telegram, Discord, etc.) should implement this interface
     to integrate with the nanobot message bus.
+
+    Channels that can edit sent messages set ``supports_streaming`` and
+    implement ``_stream_start``/``_stream_edit`` to render streamed replies
+    progressively.
+
+    With ``coalesce_window`` set, a burst of messages from the same sender
+    in a chat is merged into one inbound message once the chat has been
+    quiet for that long (or ``coalesce_max`` after the first message), so
+    it costs one turn instead of one per message. Slash commands are never
+    merged.
     """
     
     name: str = "base"
+    supports_streaming: bool = False
+    stream_edit_interval: float = 1.0  # Minimum seconds between progressive edits
+    coalesce_window: float = 0.0  # Seconds of quiet before a burst is published (0 = off)
+    coalesce_max: float = 0.0  # Longest a burst is held back, in seconds (0 = no limit)
     
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -30,6 +78,8 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._streams: dict[str, _StreamState] = {}
+        self._bursts: dict[str, _Burst] = {}
     
     @abstractmethod
     async def start(self) -> None:
@@ -58,6 +108,67 @@ class BaseChannel(ABC):
         """
         pass
     
+    async def deliver(self, msg: OutboundMessage) -> None:
+        """Deliver an outbound message: a stream delta, the end of a stream, or a plain send."""
+        if msg.delta:
+            await self.send_delta(msg)
+        elif not await self.finish_stream(msg):
+            await self.send(msg)
+
+    async def send_delta(self, msg: OutboundMessage) -> None:
+        """
+        Render a partial chunk of a streamed reply.
+
+        The first chunk posts a message, later ones edit it at most once per
+        ``stream_edit_interval``. Channels without streaming ignore deltas and
+        only send the final message.
+        """
+        if not self.supports_streaming or not msg.stream_id:
+            return
+        state = self._streams.setdefault(msg.stream_id, _StreamState())
+        state.text += msg.content
+        if not state.text.strip():
+            return
+
+        now = time.monotonic()
+        if state.handle is None:
+            state.handle = await self._stream_start(msg, state.text)
+        elif now - state.last_edit >= self.stream_edit_interval and state.text != state.rendered:
+            await self._stream_edit(msg.chat_id, state.handle, state.text)
+        else:
+            return
+        state.rendered = state.text
+        state.last_edit = now
+
+    async def finish_stream(self, msg: OutboundMessage) -> bool:
+        """
+        Apply the final message of a streamed reply to the message posted for it.
+
+        Returns:
+            True if handled, False if the message should be sent normally.
+        """
+        state = self._streams.pop(msg.stream_id, None) if msg.stream_id else None
+        if state is None or state.handle is None:
+            return False
+        try:
+            await self._stream_finish(msg, state.handle)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to finalize streamed message on {self.name}: {e}")
+            return False
+
+    async def _stream_start(self, msg: OutboundMessage, text: str) -> Any:
+        """Post the first partial text of a streamed reply and return a handle for edits."""
+        raise NotImplementedError
+
+    async def _stream_edit(self, chat_id: str, handle: Any, text: str) -> None:
+        """Replace the text of a streamed reply's message."""
+        raise NotImplementedError
+
+    async def _stream_finish(self, msg: OutboundMessage, handle: Any) -> None:
+        """Render the final content of a streamed reply (default: one last edit)."""
+        await self._stream_edit(msg.chat_id, handle, msg.content)
+    
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
@@ -119,7 +230,44 @@ class BaseChannel(ABC):
             metadata=metadata or {}
         )
         
-        await self.bus.publish_inbound(msg)
+        if self.coalesce_window <= 0 or content.startswith("/"):
+            await self._flush_burst(msg.chat_id)  # keep earlier messages first
+            await self.bus.publish_inbound(msg)
+            return
+        
+        burst = self._bursts.get(msg.chat_id)
+        if burst and burst.messages[-1].sender_id != msg.sender_id:
+            await self._flush_burst(msg.chat_id)
+            burst = None
+        if burst is None:
+            burst = self._bursts[msg.chat_id] = _Burst()
+        burst.messages.append(msg)
+        if burst.timer:
+            burst.timer.cancel()
+        delay = self.coalesce_window
+        if self.coalesce_max > 0:
+            delay = min(delay, max(0.0, burst.started + self.coalesce_max - time.monotonic()))
+        burst.timer = asyncio.create_task(self._flush_burst_after(msg.chat_id, delay))
+    
+    async def _flush_burst_after(self, chat_id: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self._flush_burst(chat_id)
+    
+    async def _flush_burst(self, chat_id: str) -> None:
+        """Publish the held-back messages of a chat as one message."""
+        burst = self._bursts.pop(chat_id, None)
+        if not burst:
+            return
+        if burst.timer and burst.timer is not asyncio.current_task():
+            burst.timer.cancel()
+        if len(burst.messages) > 1:
+            logger.debug(f"Coalesced {len(burst.messages)} messages from {self.name}:{chat_id}")
+        await self.bus.publish_inbound(merge_inbound(burst.messages))
+    
+    async def flush_pending(self) -> None:
+        """Publish all held-back bursts now (e.g. before stopping)."""
+        for chat_id in list(self._bursts):
+            await self._flush_burst(chat_id)
     
     @property
     def is_running(self) -> bool:
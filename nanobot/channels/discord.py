@@ -23,6 +23,7 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -107,6 +108,53 @@ class DiscordChannel(BaseChannel):
         finally:
             await self._stop_typing(msg.chat_id)
 
+    async def _stream_start(self, msg: OutboundMessage, text: str) -> str | None:
+        """Post the first partial text of a streamed reply and return its message ID."""
+        if not self._http:
+            return None
+        response = await self._http.post(
+            f"{DISCORD_API_BASE}/channels/{msg.chat_id}/messages",
+            headers={"Authorization": f"Bot {self.config.token}"},
+            json={"content": text[:2000]},
+        )
+        response.raise_for_status()
+        return response.json().get("id")
+
+    async def _patch_message(self, chat_id: str, message_id: str, text: str) -> httpx.Response:
+        """Edit the content of a previously sent message."""
+        return await self._http.patch(
+            f"{DISCORD_API_BASE}/channels/{chat_id}/messages/{message_id}",
+            headers={"Authorization": f"Bot {self.config.token}"},
+            json={"content": text[:2000]},
+        )
+
+    async def _stream_edit(self, chat_id: str, handle: str, text: str) -> None:
+        if not self._http:
+            return
+        response = await self._patch_message(chat_id, handle, text)
+        if response.status_code == 429:
+            # Skip this edit; a later delta or the final message catches up
+            logger.debug("Discord rate limited while streaming, skipping edit")
+            return
+        response.raise_for_status()
+
+    async def _stream_finish(self, msg: OutboundMessage, handle: str) -> None:
+        """Write the final content, waiting out rate limits (unlike progressive edits)."""
+        try:
+            for _ in range(3):
+                if not self._http:
+                    return
+                response = await self._patch_message(msg.chat_id, handle, msg.content)
+                if response.status_code == 429:
+                    retry_after = float(response.json().get("retry_after", 1.0))
+                    logger.warning(f"Discord rate limited, retrying in {retry_after}s")
+                    await asyncio.sleep(retry_after)
+                    continue
+                response.raise_for_status()
+                return
+        finally:
+            await self._stop_typing(msg.chat_id)
+
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
         if not self._ws:
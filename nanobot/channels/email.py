@@ -20,6 +20,8 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import EmailConfig
+from nanobot.utils.markup import html_to_text
+from nanobot.utils.workers import INLINE_LIMIT, extraction_pool
 
 
 class EmailChannel(BaseChannel):
@@ -390,10 +392,16 @@ class EmailChannel(BaseChannel):
 
     @staticmethod
     def _html_to_text(raw_html: str) -> str:
-        text = re.sub(r"<\s*br\s*/?>", "\n", raw_html, flags=re.IGNORECASE)
-        text = re.sub(r"<\s*/\s*p\s*>", "\n", text, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", "", text)
-        return html.unescape(text)
+        # Runs in the IMAP polling thread; large newsletters go to a worker process
+        if len(raw_html) < INLINE_LIMIT:
+            return html_to_text(raw_html)
+        try:
+            return extraction_pool().run_sync(html_to_text, raw_html)
+        except Exception as e:
+            # A timeout or broken pool must not abort the poll (messages already marked seen would be lost);
+            # the HTML that stalled a worker is not retried in this thread, only stripped of its tags
+            logger.warning(f"Email HTML conversion failed ({type(e).__name__}: {e}), stripping tags instead")
+            return html.unescape(re.sub(r"<[^>]*>", " ", raw_html))
 
     def _reply_subject(self, base_subject: str) -> str:
         subject = (base_subject or "").strip() or "nanobot reply"
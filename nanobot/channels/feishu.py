@@ -23,6 +23,8 @@ try:
         CreateMessageReactionRequestBody,
         Emoji,
         P2ImMessageReceiveV1,
+        PatchMessageRequest,
+        PatchMessageRequestBody,
     )
     FEISHU_AVAILABLE = True
 except ImportError:
@@ -99,6 +101,7 @@ class FeishuChannel(BaseChannel):
     """
     
     name = "feishu"
+    supports_streaming = True
     
     def __init__(self, config: FeishuConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -329,6 +332,56 @@ class FeishuChannel(BaseChannel):
         except Exception as e:
             logger.error(f"Error sending Feishu message: {e}")
     
+    def _build_card_json(self, content: str) -> str:
+        """Serialize content as an updatable interactive card."""
+        card = {
+            "config": {"wide_screen_mode": True, "update_multi": True},
+            "elements": self._build_card_elements(content),
+        }
+        return json.dumps(card, ensure_ascii=False)
+
+    def _create_card_sync(self, chat_id: str, content: str) -> str | None:
+        """Sync helper posting a streamed reply's card (runs in thread pool)."""
+        receive_id_type = "chat_id" if chat_id.startswith("oc_") else "open_id"
+        request = CreateMessageRequest.builder() \
+            .receive_id_type(receive_id_type) \
+            .request_body(
+                CreateMessageRequestBody.builder()
+                .receive_id(chat_id)
+                .msg_type("interactive")
+                .content(self._build_card_json(content))
+                .build()
+            ).build()
+        response = self._client.im.v1.message.create(request)
+        if not response.success():
+            raise RuntimeError(f"code={response.code}, msg={response.msg}")
+        return response.data.message_id if response.data else None
+
+    def _patch_card_sync(self, message_id: str, content: str) -> None:
+        """Sync helper replacing a streamed reply's card (runs in thread pool)."""
+        request = PatchMessageRequest.builder() \
+            .message_id(message_id) \
+            .request_body(
+                PatchMessageRequestBody.builder()
+                .content(self._build_card_json(content))
+                .build()
+            ).build()
+        response = self._client.im.v1.message.patch(request)
+        if not response.success():
+            raise RuntimeError(f"code={response.code}, msg={response.msg}")
+
+    async def _stream_start(self, msg: OutboundMessage, text: str) -> str | None:
+        if not self._client:
+            return None
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._create_card_sync, msg.chat_id, text)
+
+    async def _stream_edit(self, chat_id: str, handle: str, text: str) -> None:
+        if not self._client:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._patch_card_sync, handle, text)
+
     def _on_message_sync(self, data: "P2ImMessageReceiveV1") -> None:
         """
         Sync handler for incoming messages (called from WebSocket thread).
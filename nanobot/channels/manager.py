@@ -20,7 +20,7 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages (through the bus's per-channel dispatcher)
     """
     
     def __init__(self, config: Config, bus: MessageBus):
@@ -30,6 +30,9 @@ class ChannelManager:
         self._dispatch_task: asyncio.Task | None = None
         
         self._init_channels()
+        for name, channel in self.channels.items():
+            self._configure_coalescing(name, channel)
+            self.bus.subscribe_outbound(name, channel.deliver)
     
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
@@ -137,6 +140,15 @@ class ChannelManager:
             except ImportError as e:
                 logger.warning(f"QQ channel not available: {e}")
     
+    def _configure_coalescing(self, name: str, channel: BaseChannel) -> None:
+        """Apply the burst merge window (per-channel override or the global default)."""
+        channels = self.config.channels
+        window_ms = getattr(getattr(channels, name, None), "coalesce_ms", None)
+        if window_ms is None:
+            window_ms = channels.coalesce_ms
+        channel.coalesce_window = max(0, window_ms) / 1000
+        channel.coalesce_max = max(0, channels.coalesce_max_ms) / 1000
+    
     async def _start_channel(self, name: str, channel: BaseChannel) -> None:
         """Start a channel and log any exceptions."""
         try:
@@ -151,7 +163,7 @@ class ChannelManager:
             return
         
         # Start outbound dispatcher
-        self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
+        self._dispatch_task = asyncio.create_task(self.bus.dispatch_outbound())
         
         # Start channels
         tasks = []
@@ -167,6 +179,7 @@ class ChannelManager:
         logger.info("Stopping all channels...")
         
         # Stop dispatcher
+        self.bus.stop()
         if self._dispatch_task:
             self._dispatch_task.cancel()
             try:
@@ -177,46 +190,25 @@ class ChannelManager:
         # Stop all channels
         for name, channel in self.channels.items():
             try:
+                await channel.flush_pending()
                 await channel.stop()
                 logger.info(f"Stopped {name} channel")
             except Exception as e:
                 logger.error(f"Error stopping {name}: {e}")
     
-    async def _dispatch_outbound(self) -> None:
-        """Dispatch outbound messages to the appropriate channel."""
-        logger.info("Outbound dispatcher started")
-        
-        while True:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_outbound(),
-                    timeout=1.0
-                )
-                
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error(f"Error sending to {msg.channel}: {e}")
-                else:
-                    logger.warning(f"Unknown channel: {msg.channel}")
-                    
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
-    
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
         return self.channels.get(name)
     
     def get_status(self) -> dict[str, Any]:
         """Get status of all channels."""
+        stats = self.bus.dispatcher.stats
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                "outbound_pending": self.bus.dispatcher.pending(name),
+                "delivery": vars(stats[name]) if name in stats else {},
             }
             for name, channel in self.channels.items()
         }
@@ -22,6 +22,7 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -92,6 +93,25 @@ class SlackChannel(BaseChannel):
         except Exception as e:
             logger.error(f"Error sending Slack message: {e}")
 
+    async def _stream_start(self, msg: OutboundMessage, text: str) -> str | None:
+        """Post the first partial text of a streamed reply and return its ts."""
+        if not self._web_client:
+            return None
+        slack_meta = msg.metadata.get("slack", {}) if msg.metadata else {}
+        thread_ts = slack_meta.get("thread_ts")
+        use_thread = thread_ts and slack_meta.get("channel_type") != "im"
+        response = await self._web_client.chat_postMessage(
+            channel=msg.chat_id,
+            text=self._to_mrkdwn(text),
+            thread_ts=thread_ts if use_thread else None,
+        )
+        return response.get("ts")
+
+    async def _stream_edit(self, chat_id: str, handle: str, text: str) -> None:
+        if not self._web_client:
+            return
+        await self._web_client.chat_update(channel=chat_id, ts=handle, text=self._to_mrkdwn(text))
+
     async def _on_socket_request(
         self,
         client: SocketModeClient,
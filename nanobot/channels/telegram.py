@@ -98,6 +98,11 @@ def _split_message(content: str, max_len: int = 4000) -> list[str]:
     return chunks
 
 
+def _stream_preview(text: str, max_len: int = 4000) -> str:
+    """The first chunk ``_split_message`` will make of ``text`` (it only depends on that prefix)."""
+    return _split_message(text[:max_len + 1], max_len)[0]
+
+
 class TelegramChannel(BaseChannel):
     """
     Telegram channel using long polling.
@@ -106,6 +111,7 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
@@ -126,6 +132,7 @@ class TelegramChannel(BaseChannel):
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._stream_previews: dict[int, str] = {}  # streamed message_id -> text it shows
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -213,15 +220,59 @@ class TelegramChannel(BaseChannel):
             return
 
         for chunk in _split_message(msg.content):
+            await self._send_chunk(chat_id, chunk)
+
+    async def _send_chunk(self, chat_id: int, chunk: str) -> None:
+        """Send one message chunk as HTML, falling back to plain text."""
+        try:
+            html = _markdown_to_telegram_html(chunk)
+            await self._app.bot.send_message(chat_id=chat_id, text=html, parse_mode="HTML")
+        except Exception as e:
+            logger.warning(f"HTML parse failed, falling back to plain text: {e}")
             try:
-                html = _markdown_to_telegram_html(chunk)
-                await self._app.bot.send_message(chat_id=chat_id, text=html, parse_mode="HTML")
-            except Exception as e:
-                logger.warning(f"HTML parse failed, falling back to plain text: {e}")
-                try:
-                    await self._app.bot.send_message(chat_id=chat_id, text=chunk)
-                except Exception as e2:
-                    logger.error(f"Error sending Telegram message: {e2}")
+                await self._app.bot.send_message(chat_id=chat_id, text=chunk)
+            except Exception as e2:
+                logger.error(f"Error sending Telegram message: {e2}")
+
+    async def _stream_start(self, msg: OutboundMessage, text: str) -> int | None:
+        """Post the first partial text of a streamed reply (plain text until final)."""
+        if not self._app:
+            return None
+        preview = _stream_preview(text)
+        sent = await self._app.bot.send_message(chat_id=int(msg.chat_id), text=preview)
+        self._stream_previews[sent.message_id] = preview
+        return sent.message_id
+
+    async def _stream_edit(self, chat_id: str, handle: int, text: str) -> None:
+        """Show the streamed text, up to the first chunk; the rest is sent when the reply ends."""
+        preview = _stream_preview(text)
+        if not self._app or self._stream_previews.get(handle) == preview:
+            return
+        await self._app.bot.edit_message_text(chat_id=int(chat_id), message_id=handle, text=preview)
+        self._stream_previews[handle] = preview
+
+    async def _stream_finish(self, msg: OutboundMessage, handle: int) -> None:
+        """Edit the streamed message into the formatted first chunk, send the rest normally."""
+        self._stop_typing(msg.chat_id)
+        self._stream_previews.pop(handle, None)
+        if not self._app:
+            return
+        chat_id = int(msg.chat_id)
+        first, *rest = _split_message(msg.content)
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=chat_id, message_id=handle,
+                text=_markdown_to_telegram_html(first), parse_mode="HTML",
+            )
+        except Exception as e:
+            logger.warning(f"HTML parse failed, falling back to plain text: {e}")
+            try:
+                await self._app.bot.edit_message_text(chat_id=chat_id, message_id=handle, text=first)
+            except Exception as e2:
+                # "Message is not modified" when the preview already matches
+                logger.debug(f"Telegram final edit skipped: {e2}")
+        for chunk in rest:
+            await self._send_chunk(chat_id, chunk)
     
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
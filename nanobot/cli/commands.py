@@ -107,6 +107,32 @@ def _print_agent_response(response: str, render_markdown: bool) -> None:
     console.print()
 
 
+class _StreamPrinter:
+    """Print streamed response text as it arrives, replacing the thinking spinner."""
+
+    def __init__(self, status=None):
+        self._status = status
+        self.started = False
+        self.text = ""
+
+    async def __call__(self, delta: str) -> None:
+        self.text += delta
+        if not self.started:
+            self.started = True
+            if self._status:
+                self._status.stop()
+            console.print()
+            console.print(f"[cyan]{__logo__} nanobot[/cyan]")
+        console.print(delta, end="", markup=False, highlight=False, soft_wrap=True)
+
+    def finish(self, response: str, render_markdown: bool) -> None:
+        """End the streamed text; print the final response too if it is not what was streamed."""
+        console.print("\n")
+        final = (response or "").strip()
+        if final and not self.text.rstrip().endswith(final):
+            _print_agent_response(response, render_markdown=render_markdown)
+
+
 def _is_exit_command(command: str) -> bool:
     """Return True when input should end interactive chat."""
     return command.lower() in EXIT_COMMANDS
@@ -280,11 +306,64 @@ This file stores important information that should persist across sessions.
 
 
 def _make_provider(config: Config):
-    """Create LiteLLMProvider from config. Exits if no API key found."""
+    """Create the LLM provider from config (with retries and failover). Exits if no API key found."""
+    from nanobot.providers.cache import CachingProvider
+    from nanobot.providers.resilient import CircuitBreaker, Endpoint, ResilientProvider
+
+    r = config.resilience
+    model = config.agents.defaults.model
+    endpoints = [Endpoint(
+        name=config.get_provider_name(model) or model,
+        provider=_make_model_provider(config, model),
+        breaker=CircuitBreaker(r.breaker_threshold, r.breaker_cooldown),
+    )]
+    for fallback in r.failover:
+        if not config.get_provider(fallback) and not fallback.startswith("bedrock/"):
+            console.print(f"[yellow]Warning: no provider configured for failover model {fallback}, skipping[/yellow]")
+            continue
+        endpoints.append(Endpoint(
+            name=f"{config.get_provider_name(fallback) or 'default'}:{fallback}",
+            provider=_make_model_provider(config, fallback),
+            model=fallback,
+            breaker=CircuitBreaker(r.breaker_threshold, r.breaker_cooldown),
+        ))
+    provider = ResilientProvider(
+        endpoints,
+        max_retries=r.max_retries,
+        backoff_base=r.backoff_base,
+        backoff_max=r.backoff_max,
+        hedge=r.hedge,
+        hedge_percentile=r.hedge_percentile,
+        hedge_min_samples=r.hedge_min_samples,
+    )
+    if config.response_cache.enabled:
+        provider = CachingProvider(
+            provider,
+            _make_response_cache(config),
+            sites=set(config.response_cache.sites),
+            allow_temperature=config.response_cache.allow_temperature,
+        )
+    return provider
+
+
+def _make_response_cache(config: Config):
+    """Open the persistent LLM response cache."""
+    from nanobot.providers.cache import ResponseCache
+    from nanobot.utils.helpers import get_data_path
+
+    c = config.response_cache
+    return ResponseCache(
+        get_data_path() / "cache" / "llm_responses.db",
+        max_bytes=c.max_mb * 1024 * 1024,
+        default_ttl=c.ttl,
+    )
+
+
+def _make_model_provider(config: Config, model: str):
+    """Create the provider serving ``model``. Exits if no API key found."""
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.providers.openai_codex_provider import OpenAICodexProvider
 
-    model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
     p = config.get_provider(model)
 
@@ -303,6 +382,9 @@ def _make_provider(config: Config):
         default_model=model,
         extra_headers=p.extra_headers if p else None,
         provider_name=provider_name,
+        rpm=p.rpm if p else 0,
+        tpm=p.tpm if p else 0,
+        max_concurrency=p.max_concurrency if p else 8,
     )
 
 
@@ -311,20 +393,135 @@ def _make_provider(config: Config):
 # ============================================================================
 
 
+def _make_bus(config: Config):
+    """Create the MessageBus with the configured queue limits."""
+    from nanobot.bus.queue import MessageBus
+
+    return MessageBus(
+        max_inbound=config.bus.max_inbound,
+        max_outbound=config.bus.max_outbound,
+        max_per_channel=config.bus.max_per_channel,
+        max_per_session=config.bus.max_per_session,
+        overflow=config.bus.overflow,
+        busy_message=config.bus.busy_message,
+        outbound_workers=config.bus.outbound_workers,
+        send_timeout=config.bus.send_timeout,
+        max_outbound_per_channel=config.bus.max_outbound_per_channel,
+    )
+
+
+def _configure_http(config: Config) -> None:
+    """Apply the HTTP settings to the shared client pool used by tools and providers."""
+    from nanobot.utils.http import shared_http
+
+    h = config.http
+    shared_http().configure(
+        proxy=h.proxy or None,
+        http2=h.http2,
+        max_connections=h.max_connections,
+        max_per_host=h.max_per_host,
+        keepalive_expiry=h.keepalive_expiry,
+        dns_ttl=h.dns_ttl,
+    )
+
+
+def _configure_extraction(config: Config) -> None:
+    """Apply the extraction settings to the shared worker pool."""
+    from nanobot.utils.workers import extraction_pool
+
+    extraction_pool().configure(workers=config.extraction.workers, timeout=config.extraction.timeout)
+
+
+def _cache_scheduled(site: str):
+    """
+    Response-cache policy for heartbeat and cron turns.
+
+    Both resend the same prompt on a persistent session, so the session's
+    own (ever-growing) history is left out of the key; repeating a sampled
+    answer is fine for these sites. Heartbeats keep the hour in the key:
+    ticks within an hour share an answer, but time-dependent tasks in
+    HEARTBEAT.md ("at 09:00 ...") are decided afresh each hour.
+    """
+    from nanobot.providers.cache import cache_responses
+
+    return cache_responses(site, allow_temperature=True, hourly=site == "heartbeat", ignore_history=True)
+
+
+def _make_session_manager(config: Config):
+    """Create the SessionManager with the configured storage backend and cache limits."""
+    from nanobot.session.manager import SessionManager
+
+    return SessionManager(
+        config.workspace_path,
+        backend=config.sessions.backend,
+        fsync=config.sessions.fsync,
+        compact_after=config.sessions.compact_after,
+        max_sessions=config.sessions.max_cached,
+        max_cache_bytes=config.sessions.max_cache_mb * 1024 * 1024,
+        idle_ttl=config.sessions.idle_ttl,
+        tail_messages=config.sessions.tail_messages,
+    )
+
+
+def _make_gateway_agent(config: Config, bus, cron):
+    """Create the AgentLoop used by the gateway (single process or agent worker)."""
+    from nanobot.agent.loop import AgentLoop
+
+    return AgentLoop(
+        bus=bus,
+        provider=_make_provider(config),
+        workspace=config.workspace_path,
+        model=config.agents.defaults.model,
+        temperature=config.agents.defaults.temperature,
+        max_tokens=config.agents.defaults.max_tokens,
+        max_iterations=config.agents.defaults.max_tool_iterations,
+        memory_window=config.agents.defaults.memory_window,
+        consolidation_model=config.agents.defaults.consolidation_model or None,
+        max_concurrent_consolidations=config.agents.defaults.max_concurrent_consolidations,
+        max_history_tokens=config.agents.defaults.max_history_tokens,
+        prompt_cache=config.agents.defaults.prompt_cache,
+        memory_top_k=config.agents.defaults.memory_top_k,
+        memory_max_tokens=config.agents.defaults.memory_max_tokens,
+        memory_pinned=config.agents.defaults.memory_pinned,
+        context_window=config.agents.defaults.context_window,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        stream_responses=config.agents.defaults.stream_responses,
+        brave_api_key=config.tools.web.search.api_key or None,
+        exec_config=config.tools.exec,
+        web_search_config=config.tools.web.search,
+        cron_service=cron,
+        restrict_to_workspace=config.tools.restrict_to_workspace,
+        max_result_chars=config.tools.max_result_chars,
+        web_fetch_cache_mb=config.tools.web.fetch.cache_mb,
+        session_manager=_make_session_manager(config),
+        mcp_servers=config.tools.mcp_servers,
+    )
+
+
+def _gateway_socket_path(config: Config) -> Path:
+    from nanobot.config.loader import get_data_dir
+
+    return Path(config.gateway.socket).expanduser() if config.gateway.socket else get_data_dir() / "gateway.sock"
+
+
 @app.command()
 def gateway(
     port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    workers: int | None = typer.Option(
+        None, "--workers", "-w", help="Agent worker processes (0 = run the agent in this process)"
+    ),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Start the nanobot gateway."""
     from nanobot.config.loader import load_config, get_data_dir
-    from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.events import OutboundMessage
     from nanobot.channels.manager import ChannelManager
-    from nanobot.session.manager import SessionManager
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
+    from nanobot.utils.http import shared_http
+    from nanobot.utils.workers import extraction_pool
+    from nanobot.providers.ratelimit import background
     
     if verbose:
         import logging
@@ -333,43 +530,39 @@ def gateway(
     console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
     
     config = load_config()
-    bus = MessageBus()
-    provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    workers = config.gateway.workers if workers is None else workers
+    _configure_http(config)
+    _configure_extraction(config)
+    bus = _make_bus(config)
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
     cron = CronService(cron_store_path)
     
-    # Create agent with cron service
-    agent = AgentLoop(
-        bus=bus,
-        provider=provider,
-        workspace=config.workspace_path,
-        model=config.agents.defaults.model,
-        temperature=config.agents.defaults.temperature,
-        max_tokens=config.agents.defaults.max_tokens,
-        max_iterations=config.agents.defaults.max_tool_iterations,
-        memory_window=config.agents.defaults.memory_window,
-        brave_api_key=config.tools.web.search.api_key or None,
-        exec_config=config.tools.exec,
-        cron_service=cron,
-        restrict_to_workspace=config.tools.restrict_to_workspace,
-        session_manager=session_manager,
-        mcp_servers=config.tools.mcp_servers,
-    )
+    if workers > 0:
+        # Channels, cron and heartbeat stay here; agent turns run in worker processes
+        from nanobot.bus.ipc import IpcFront
+
+        _make_provider(config)  # fail fast on a missing API key
+        agent = None
+        front = IpcFront(bus, _gateway_socket_path(config), workers)
+        process_direct = front.process_direct
+    else:
+        agent = _make_gateway_agent(config, bus, cron)
+        front = None
+        process_direct = agent.process_direct
     
     # Set cron callback (needs agent)
     async def on_cron_job(job: CronJob) -> str | None:
-        """Execute a cron job through the agent."""
-        response = await agent.process_direct(
-            job.payload.message,
-            session_key=f"cron:{job.id}",
-            channel=job.payload.channel or "cli",
-            chat_id=job.payload.to or "direct",
-        )
+        """Execute a cron job through the agent (at background LLM priority)."""
+        with background(), _cache_scheduled("cron"):
+            response = await process_direct(
+                job.payload.message,
+                session_key=f"cron:{job.id}",
+                channel=job.payload.channel or "cli",
+                chat_id=job.payload.to or "direct",
+            )
         if job.payload.deliver and job.payload.to:
-            from nanobot.bus.events import OutboundMessage
             await bus.publish_outbound(OutboundMessage(
                 channel=job.payload.channel or "cli",
                 chat_id=job.payload.to,
@@ -380,8 +573,9 @@ def gateway(
     
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
-        """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        """Execute heartbeat through the agent (at background LLM priority)."""
+        with background(), _cache_scheduled("heartbeat"):
+            return await process_direct(prompt, session_key="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -398,6 +592,9 @@ def gateway(
     else:
         console.print("[yellow]Warning: No channels enabled[/yellow]")
     
+    if workers > 0:
+        console.print(f"[green]✓[/green] Agent workers: {workers} processes")
+    
     cron_status = cron.status()
     if cron_status["jobs"] > 0:
         console.print(f"[green]✓[/green] Cron: {cron_status['jobs']} scheduled jobs")
@@ -406,24 +603,83 @@ def gateway(
     
     async def run():
         try:
+            if front:
+                await front.start()
+                front.spawn_workers(lambda i: [
+                    sys.executable, "-m", "nanobot", "gateway-worker",
+                    "--index", str(i), "--socket", str(front.socket_path),
+                ] + (["--verbose"] if verbose else []))
             await cron.start()
             await heartbeat.start()
             await asyncio.gather(
-                agent.run(),
+                front.run() if front else agent.run(),
                 channels.start_all(),
             )
         except KeyboardInterrupt:
             console.print("\nShutting down...")
         finally:
-            await agent.close_mcp()
             heartbeat.stop()
             cron.stop()
-            agent.stop()
+            if front:
+                await front.close()
+            else:
+                await agent.close_mcp()
+                agent.stop()
             await channels.stop_all()
+            await shared_http().aclose()
+            extraction_pool().shutdown()
     
     asyncio.run(run())
 
 
+@app.command("gateway-worker", hidden=True)
+def gateway_worker(
+    index: int = typer.Option(..., "--index", help="Worker index"),
+    socket: str = typer.Option(..., "--socket", help="Front process IPC socket"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+):
+    """Run one agent worker process of a multi-process gateway."""
+    from nanobot.bus.ipc import IpcWorker
+    from nanobot.config.loader import get_data_dir, load_config
+    from nanobot.cron.service import CronService
+    from nanobot.providers.ratelimit import background
+    from nanobot.utils.http import shared_http
+    from nanobot.utils.workers import extraction_pool
+
+    if verbose:
+        import logging
+        logging.basicConfig(level=logging.DEBUG)
+
+    config = load_config()
+    _configure_http(config)
+    _configure_extraction(config)
+    bus = _make_bus(config)
+    # The cron tool edits the shared job store; the front process runs the timer
+    cron = CronService(get_data_dir() / "cron" / "jobs.json")
+    agent = _make_gateway_agent(config, bus, cron)
+
+    async def handle_direct(content: str, session_key: str, channel: str, chat_id: str) -> str:
+        # Direct requests come from cron and heartbeat in the front process
+        site = "heartbeat" if session_key == "heartbeat" else "cron"
+        with background(), _cache_scheduled(site):
+            return await agent.process_direct(content, session_key=session_key, channel=channel, chat_id=chat_id)
+
+    worker = IpcWorker(bus, Path(socket), index, handle_direct)
+
+    async def run():
+        agent_task = asyncio.create_task(agent.run())
+        try:
+            await worker.run()  # returns when the front process goes away
+        finally:
+            agent.stop()
+            agent_task.cancel()
+            await agent.close_mcp()
+            await shared_http().aclose()
+            extraction_pool().shutdown()
+
+    asyncio.run(run())
+
+
 
 
 # ============================================================================
@@ -437,17 +693,22 @@ def agent(
     session_id: str = typer.Option("cli:direct", "--session", "-s", help="Session ID"),
     markdown: bool = typer.Option(True, "--markdown/--no-markdown", help="Render assistant output as Markdown"),
     logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs during chat"),
+    stream: bool = typer.Option(True, "--stream/--no-stream", help="Print response tokens as they arrive"),
 ):
     """Interact with the agent directly."""
     from nanobot.config.loader import load_config
-    from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
+    from nanobot.utils.http import shared_http
+    from nanobot.utils.workers import extraction_pool
     from loguru import logger
     
     config = load_config()
     
-    bus = MessageBus()
+    _configure_http(config)
+    _configure_extraction(config)
+    bus = _make_bus(config)
     provider = _make_provider(config)
+    session_manager = _make_session_manager(config)
 
     if logs:
         logger.enable("nanobot")
@@ -463,9 +724,21 @@ def agent(
         max_tokens=config.agents.defaults.max_tokens,
         max_iterations=config.agents.defaults.max_tool_iterations,
         memory_window=config.agents.defaults.memory_window,
+        consolidation_model=config.agents.defaults.consolidation_model or None,
+        max_concurrent_consolidations=config.agents.defaults.max_concurrent_consolidations,
+        max_history_tokens=config.agents.defaults.max_history_tokens,
+        prompt_cache=config.agents.defaults.prompt_cache,
+        memory_top_k=config.agents.defaults.memory_top_k,
+        memory_max_tokens=config.agents.defaults.memory_max_tokens,
+        memory_pinned=config.agents.defaults.memory_pinned,
+        context_window=config.agents.defaults.context_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        web_search_config=config.tools.web.search,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        max_result_chars=config.tools.max_result_chars,
+        web_fetch_cache_mb=config.tools.web.fetch.cache_mb,
+        session_manager=session_manager,
         mcp_servers=config.tools.mcp_servers,
     )
     
@@ -480,10 +753,16 @@ def agent(
     if message:
         # Single message mode
         async def run_once():
-            with _thinking_ctx():
-                response = await agent_loop.process_direct(message, session_id)
-            _print_agent_response(response, render_markdown=markdown)
+            with _thinking_ctx() as status:
+                printer = _StreamPrinter(status) if stream else None
+                response = await agent_loop.process_direct(message, session_id, on_delta=printer)
+            if printer and printer.started:
+                printer.finish(response, render_markdown=markdown)
+            else:
+                _print_agent_response(response, render_markdown=markdown)
             await agent_loop.close_mcp()
+            await shared_http().aclose()
+            extraction_pool().shutdown()
         
         asyncio.run(run_once())
     else:
@@ -513,9 +792,13 @@ def agent(
                             console.print("\nGoodbye!")
                             break
                         
-                        with _thinking_ctx():
-                            response = await agent_loop.process_direct(user_input, session_id)
-                        _print_agent_response(response, render_markdown=markdown)
+                        with _thinking_ctx() as status:
+                            printer = _StreamPrinter(status) if stream else None
+                            response = await agent_loop.process_direct(user_input, session_id, on_delta=printer)
+                        if printer and printer.started:
+                            printer.finish(response, render_markdown=markdown)
+                        else:
+                            _print_agent_response(response, render_markdown=markdown)
                     except KeyboardInterrupt:
                         _restore_terminal()
                         console.print("\nGoodbye!")
@@ -526,6 +809,8 @@ def agent(
                         break
             finally:
                 await agent_loop.close_mcp()
+                await shared_http().aclose()
+                extraction_pool().shutdown()
         
         asyncio.run(run_interactive())
 
@@ -883,6 +1168,13 @@ def status():
                 has_key = bool(p.api_key)
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
+        if config.response_cache.enabled:
+            stats = _make_response_cache(config).stats
+            console.print(
+                f"Response cache: {stats.entries} entries, {stats.size_bytes / 1024 / 1024:.1f} MB, "
+                f"{stats.hits} hits / {stats.misses} misses ({stats.hit_rate:.0%})"
+            )
+
 
 # ============================================================================
 # OAuth Login
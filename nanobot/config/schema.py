@@ -8,6 +8,7 @@ from pydantic_settings import BaseSettings
 class WhatsAppConfig(BaseModel):
     """WhatsApp channel configuration."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     bridge_url: str = "ws://localhost:3001"
     bridge_token: str = ""  # Shared token for bridge auth (optional, recommended)
     allow_from: list[str] = Field(default_factory=list)  # Allowed phone numbers
@@ -16,6 +17,7 @@ class WhatsAppConfig(BaseModel):
 class TelegramConfig(BaseModel):
     """Telegram channel configuration."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     token: str = ""  # Bot token from @BotFather
     allow_from: list[str] = Field(default_factory=list)  # Allowed user IDs or usernames
     proxy: str | None = None  # HTTP/SOCKS5 proxy URL, e.g. "http://127.0.0.1:7890" or "socks5://127.0.0.1:1080"
@@ -24,6 +26,7 @@ class TelegramConfig(BaseModel):
 class FeishuConfig(BaseModel):
     """Feishu/Lark channel configuration using WebSocket long connection."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     app_id: str = ""  # App ID from Feishu Open Platform
     app_secret: str = ""  # App Secret from Feishu Open Platform
     encrypt_key: str = ""  # Encrypt Key for event subscription (optional)
@@ -34,6 +37,7 @@ class FeishuConfig(BaseModel):
 class DingTalkConfig(BaseModel):
     """DingTalk channel configuration using Stream mode."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     client_id: str = ""  # AppKey
     client_secret: str = ""  # AppSecret
     allow_from: list[str] = Field(default_factory=list)  # Allowed staff_ids
@@ -42,6 +46,7 @@ class DingTalkConfig(BaseModel):
 class DiscordConfig(BaseModel):
     """Discord channel configuration."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     token: str = ""  # Bot token from Discord Developer Portal
     allow_from: list[str] = Field(default_factory=list)  # Allowed user IDs
     gateway_url: str = "wss://gateway.discord.gg/?v=10&encoding=json"
@@ -50,6 +55,7 @@ class DiscordConfig(BaseModel):
 class EmailConfig(BaseModel):
     """Email channel configuration (IMAP inbound + SMTP outbound)."""
     enabled: bool = False
+    coalesce_ms: int | None = 0  # Separate emails are separate turns (see ChannelsConfig.coalesce_ms)
     consent_granted: bool = False  # Explicit owner permission to access mailbox data
 
     # IMAP (receive)
@@ -91,6 +97,7 @@ class MochatGroupRule(BaseModel):
 class MochatConfig(BaseModel):
     """Mochat channel configuration."""
     enabled: bool = False
+    coalesce_ms: int | None = 0  # Off: Mochat buffers messages itself (see reply_delay_ms)
     base_url: str = "https://mochat.io"
     socket_url: str = ""
     socket_path: str = "/socket.io"
@@ -124,6 +131,7 @@ class SlackDMConfig(BaseModel):
 class SlackConfig(BaseModel):
     """Slack channel configuration."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     mode: str = "socket"  # "socket" supported
     webhook_path: str = "/slack/events"
     bot_token: str = ""  # xoxb-...
@@ -137,6 +145,7 @@ class SlackConfig(BaseModel):
 class QQConfig(BaseModel):
     """QQ channel configuration using botpy SDK."""
     enabled: bool = False
+    coalesce_ms: int | None = None  # Burst merge window (None = ChannelsConfig.coalesce_ms)
     app_id: str = ""  # 机器人 ID (AppID) from q.qq.com
     secret: str = ""  # 机器人密钥 (AppSecret) from q.qq.com
     allow_from: list[str] = Field(default_factory=list)  # Allowed user openids (empty = public access)
@@ -153,6 +162,8 @@ class ChannelsConfig(BaseModel):
     email: EmailConfig = Field(default_factory=EmailConfig)
     slack: SlackConfig = Field(default_factory=SlackConfig)
     qq: QQConfig = Field(default_factory=QQConfig)
+    coalesce_ms: int = 0  # Merge messages a chat sends within this window into one turn (0 = off, e.g. 1000)
+    coalesce_max_ms: int = 5000  # Longest a burst is held back, however fast messages keep coming
 
 
 class AgentDefaults(BaseModel):
@@ -163,6 +174,16 @@ class AgentDefaults(BaseModel):
     temperature: float = 0.7
     max_tool_iterations: int = 20
     memory_window: int = 50
+    consolidation_model: str = ""  # Cheaper model for memory consolidation ("" = same as model)
+    max_concurrent_consolidations: int = 2  # Consolidation jobs running at once across sessions
+    max_history_tokens: int = 16000  # Token budget for conversation history (0 = fill the context window)
+    context_window: int = 0  # Override the model's context window (0 = from the provider registry)
+    max_concurrent_turns: int = 4  # Turns processed in parallel across different sessions
+    stream_responses: bool = True  # Stream replies to channels that support message edits
+    prompt_cache: bool = True  # Keep the prompt prefix stable so providers can cache it
+    memory_top_k: int = 20  # Max MEMORY.md facts injected per message (0 = no limit)
+    memory_max_tokens: int = 2000  # Token cap for injected memory (0 = no limit)
+    memory_pinned: bool = True  # Always inject pinned facts ("Pinned" section, [pinned] or 📌)
 
 
 class AgentsConfig(BaseModel):
@@ -175,6 +196,9 @@ class ProviderConfig(BaseModel):
     api_key: str = ""
     api_base: str | None = None
     extra_headers: dict[str, str] | None = None  # Custom headers (e.g. APP-Code for AiHubMix)
+    rpm: int = 0  # Requests per minute per model (0 = unlimited)
+    tpm: int = 0  # Tokens per minute per model (0 = unlimited)
+    max_concurrency: int = 8  # Upper bound for adaptive concurrent requests per model
 
 
 class ProvidersConfig(BaseModel):
@@ -195,21 +219,70 @@ class ProvidersConfig(BaseModel):
     openai_codex: ProviderConfig = Field(default_factory=ProviderConfig)  # OpenAI Codex (OAuth)
 
 
+class ResilienceConfig(BaseModel):
+    """Retries, hedged requests and failover for LLM calls."""
+    max_retries: int = 2  # Retries per provider on timeouts, 429s, 5xx and connection errors
+    backoff_base: float = 1.0  # Seconds; backoff doubles per retry, with full jitter
+    backoff_max: float = 20.0
+    hedge: bool = False  # Resend interactive calls slower than the recent p95 (first answer wins)
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20  # Calls observed before hedging starts
+    failover: list[str] = Field(default_factory=list)  # Fallback models in order, each via its configured provider
+    breaker_threshold: int = 5  # Consecutive failures before a provider is skipped
+    breaker_cooldown: float = 30.0  # Seconds a failing provider is skipped before it is probed again
+
+
+class ResponseCacheConfig(BaseModel):
+    """Persistent cache of LLM responses for repeated prompts."""
+    enabled: bool = False
+    sites: list[str] = Field(default_factory=lambda: ["heartbeat", "cron", "consolidation"])  # Call sites that may use it
+    allow_temperature: bool = False  # Also cache calls with temperature > 0
+    ttl: int = 3600  # Seconds a cached response stays valid
+    max_mb: int = 64  # Least recently used responses are evicted beyond this
+
+
+class HttpConfig(BaseModel):
+    """Shared HTTP client pool for tools and providers."""
+    proxy: str = ""  # e.g. "http://127.0.0.1:7890" or "socks5://..." ("" = HTTP(S)_PROXY env vars)
+    http2: bool = True  # Used when the h2 package is installed
+    max_connections: int = 100
+    max_per_host: int = 10  # Concurrent requests per host (0 = no limit)
+    keepalive_expiry: float = 30.0  # Seconds an idle connection is kept open
+    dns_ttl: float = 300.0  # Seconds DNS answers are cached
+
+
+class ExtractionConfig(BaseModel):
+    """Worker processes for CPU-heavy HTML extraction (web_fetch, email)."""
+    workers: int = 2  # Processes (0 = run extraction in a thread)
+    timeout: float = 20.0  # Seconds per page before the workers are restarted
+
+
 class GatewayConfig(BaseModel):
     """Gateway/server configuration."""
     host: str = "0.0.0.0"
     port: int = 18790
+    workers: int = 0  # Agent worker processes (0 = channels and agent share one process)
+    socket: str = ""  # Unix socket between front and workers ("" = ~/.nanobot/gateway.sock)
 
 
 class WebSearchConfig(BaseModel):
     """Web search tool configuration."""
     api_key: str = ""  # Brave Search API key
     max_results: int = 5
+    cache_ttl: int = 900  # Seconds results are reused for the same normalized query (0 = off)
+    rpm: int = 60  # Brave API requests per minute, shared by all searches (0 = no limit)
+    max_concurrency: int = 4  # Brave API requests in flight
+
+
+class WebFetchConfig(BaseModel):
+    """Web fetch tool configuration."""
+    cache_mb: int = 100  # On-disk HTTP cache for fetched pages and their extracted text (0 = off)
 
 
 class WebToolsConfig(BaseModel):
     """Web tools configuration."""
     search: WebSearchConfig = Field(default_factory=WebSearchConfig)
+    fetch: WebFetchConfig = Field(default_factory=WebFetchConfig)
 
 
 class ExecToolConfig(BaseModel):
@@ -230,16 +303,49 @@ class ToolsConfig(BaseModel):
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
+    max_result_chars: int = 8000  # Longer tool results are spilled to disk and paged via read_result (0 = off)
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
+class SessionsConfig(BaseModel):
+    """Session persistence configuration."""
+    backend: str = "jsonl"  # "jsonl" (file per session) or "sqlite" (imports existing JSONL files once)
+    fsync: str = "compact"  # "never", "compact" (fsync compacted files) or "always" (also every append)
+    compact_after: int = 100  # Appended saves before a session file is compacted in the background
+    max_cached: int = 256  # Sessions kept in memory (least recently used are dropped)
+    max_cache_mb: int = 64  # Approximate memory budget for cached sessions
+    idle_ttl: int = 3600  # Seconds before an unused session is dropped from memory
+    tail_messages: int = 500  # Recent messages loaded per session (older ones stay on disk)
+
+
+class BusConfig(BaseModel):
+    """Message bus queue limits (0 = unlimited)."""
+    max_inbound: int = 1000  # Pending inbound messages overall; channels wait for room beyond this
+    max_outbound: int = 1000  # Queued outbound messages; the agent waits for room beyond this
+    max_per_channel: int = 200  # Pending inbound messages per channel
+    max_per_session: int = 20  # Pending inbound messages per chat
+    # Per-channel/chat overflow: "merge" (into the chat's pending message; busy reply if it has none),
+    # "reject" (busy reply) or "drop_oldest" (silently drops the oldest pending message)
+    overflow: str = "merge"
+    busy_message: str = "I'm busy with earlier messages right now, please try again in a moment."
+    outbound_workers: int = 2  # Send workers per channel (one chat always uses the same worker)
+    send_timeout: float = 120.0  # Seconds before a single send is abandoned (0 = no limit)
+    max_outbound_per_channel: int = 500  # Queued sends per channel; beyond this new ones are dropped
+
+
 class Config(BaseSettings):
     """Root configuration for nanobot."""
     agents: AgentsConfig = Field(default_factory=AgentsConfig)
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
+    resilience: ResilienceConfig = Field(default_factory=ResilienceConfig)
+    response_cache: ResponseCacheConfig = Field(default_factory=ResponseCacheConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    extraction: ExtractionConfig = Field(default_factory=ExtractionConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
     
     @property
     def workspace_path(self) -> Path:
@@ -2,16 +2,25 @@
 
 import asyncio
 import json
+import os
 import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Iterator
 
 from loguru import logger
 
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
 
+try:
+    import fcntl
+except ImportError:  # Windows: single-process only
+    fcntl = None
+
+MAX_SLEEP_S = 60  # re-check the store at least this often (other processes may add jobs)
+
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
@@ -45,7 +54,15 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
 
 
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    The store is reloaded when jobs.json changes on disk, so several
+    processes (e.g. gateway agent workers) can add jobs while one of them
+    runs the timer. Changes are made under a file lock and written
+    atomically, so processes never see half-written files or lose each
+    other's updates.
+    """
     
     def __init__(
         self,
@@ -55,13 +72,17 @@ class CronService:
         self.store_path = store_path
         self.on_job = on_job  # Callback to execute job, returns response text
         self._store: CronStore | None = None
+        self._store_mtime: int | None = None
+        self._load_failed = False
         self._timer_task: asyncio.Task | None = None
         self._running = False
     
     def _load_store(self) -> CronStore:
-        """Load jobs from disk."""
-        if self._store:
+        """Load jobs from disk (cached until the file changes)."""
+        mtime = self._mtime()
+        if self._store and mtime == self._store_mtime:
             return self._store
+        self._store_mtime = mtime
         
         if self.store_path.exists():
             try:
@@ -97,18 +118,46 @@ class CronService:
                         delete_after_run=j.get("deleteAfterRun", False),
                     ))
                 self._store = CronStore(jobs=jobs)
+                self._load_failed = False
             except Exception as e:
-                logger.warning(f"Failed to load cron store: {e}")
-                self._store = CronStore()
+                # Keep what we had; saving now would replace the file's jobs with it
+                logger.warning(f"Failed to load cron store, not saving until it loads: {e}")
+                self._load_failed = True
+                self._store = self._store or CronStore()
         else:
             self._store = CronStore()
+            self._load_failed = False
         
         return self._store
     
+    def _load_for_update(self) -> CronStore:
+        """Load the store to change it (under ``_locked``); refuses while jobs.json is unreadable."""
+        store = self._load_store()
+        if self._load_failed:
+            raise RuntimeError(f"Cron store {self.store_path} could not be loaded; fix or remove it first")
+        return store
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive lock on jobs.json across processes, held around each load-modify-save."""
+        if fcntl is None:
+            yield
+            return
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.store_path.with_name(self.store_path.name + ".lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
     def _save_store(self) -> None:
-        """Save jobs to disk."""
+        """Save jobs to disk (atomically: readers see the old or the new file)."""
         if not self._store:
             return
+        if self._load_failed:
+            logger.warning(f"Cron store {self.store_path} could not be loaded; not overwriting it")
+            return
         
         self.store_path.parent.mkdir(parents=True, exist_ok=True)
         
@@ -147,14 +196,24 @@ class CronService:
             ]
         }
         
-        self.store_path.write_text(json.dumps(data, indent=2))
+        tmp = self.store_path.with_name(f"{self.store_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, indent=2))
+        os.replace(tmp, self.store_path)
+        self._store_mtime = self._mtime()
+
+    def _mtime(self) -> int | None:
+        try:
+            return self.store_path.stat().st_mtime_ns
+        except OSError:
+            return None
     
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
-        self._load_store()
-        self._recompute_next_runs()
-        self._save_store()
+        with self._locked():
+            self._load_store()
+            self._recompute_next_runs()
+            self._save_store()
         self._arm_timer()
         logger.info(f"Cron service started with {len(self._store.jobs if self._store else [])} jobs")
     
@@ -187,12 +246,11 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
         
-        next_wake = self._get_next_wake_ms()
-        if not next_wake or not self._running:
+        if not self._running:
             return
-        
-        delay_ms = max(0, next_wake - _now_ms())
-        delay_s = delay_ms / 1000
+        next_wake = self._get_next_wake_ms()
+        delay_ms = max(0, next_wake - _now_ms()) if next_wake else MAX_SLEEP_S * 1000
+        delay_s = min(delay_ms / 1000, MAX_SLEEP_S)
         
         async def tick():
             await asyncio.sleep(delay_s)
@@ -203,8 +261,7 @@ class CronService:
     
     async def _on_timer(self) -> None:
         """Handle timer tick - run due jobs."""
-        if not self._store:
-            return
+        self._load_store()
         
         now = _now_ms()
         due_jobs = [
@@ -212,11 +269,37 @@ class CronService:
             if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
         ]
         
+        kept_ids = {j.id for j in self._store.jobs}
         for job in due_jobs:
             await self._execute_job(job)
         
-        self._save_store()
+        if due_jobs:
+            with self._locked():
+                self._merge_executed(due_jobs, kept_ids)
+                self._save_store()
         self._arm_timer()
+
+    def _merge_executed(self, executed: list[CronJob], kept_ids: set[str]) -> None:
+        """
+        Apply the executed jobs' new state to a fresh copy of the store.
+
+        Other processes may add or remove jobs while the jobs run; saving
+        the store loaded before the run would undo those changes.
+        """
+        ran = {j.id: j for j in executed}
+        kept_ids = kept_ids & {j.id for j in self._store.jobs}  # minus jobs deleted after their run
+        store = self._load_store()
+        jobs = []
+        for job in store.jobs:
+            if job.id in ran:
+                if job.id not in kept_ids:
+                    continue
+                done = ran[job.id]
+                job.enabled = done.enabled
+                job.state = done.state
+                job.updated_at_ms = done.updated_at_ms
+            jobs.append(job)
+        store.jobs = jobs
     
     async def _execute_job(self, job: CronJob) -> None:
         """Execute a single job."""
@@ -270,9 +353,7 @@ class CronService:
         delete_after_run: bool = False,
     ) -> CronJob:
         """Add a new job."""
-        store = self._load_store()
         now = _now_ms()
-        
         job = CronJob(
             id=str(uuid.uuid4())[:8],
             name=name,
@@ -291,8 +372,9 @@ class CronService:
             delete_after_run=delete_after_run,
         )
         
-        store.jobs.append(job)
-        self._save_store()
+        with self._locked():
+            self._load_for_update().jobs.append(job)
+            self._save_store()
         self._arm_timer()
         
         logger.info(f"Cron: added job '{name}' ({job.id})")
@@ -300,13 +382,15 @@ class CronService:
     
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
-        store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        with self._locked():
+            store = self._load_for_update()
+            before = len(store.jobs)
+            store.jobs = [j for j in store.jobs if j.id != job_id]
+            removed = len(store.jobs) < before
+            if removed:
+                self._save_store()
         
         if removed:
-            self._save_store()
             self._arm_timer()
             logger.info(f"Cron: removed job {job_id}")
         
@@ -314,19 +398,21 @@ class CronService:
     
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        with self._locked():
+            for job in self._load_for_update().jobs:
+                if job.id == job_id:
+                    job.enabled = enabled
+                    job.updated_at_ms = _now_ms()
+                    if enabled:
+                        job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+                    else:
+                        job.state.next_run_at_ms = None
+                    self._save_store()
+                    break
+            else:
+                return None
+        self._arm_timer()
+        return job
     
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
@@ -335,8 +421,11 @@ class CronService:
             if job.id == job_id:
                 if not force and not job.enabled:
                     return False
+                kept_ids = {j.id for j in store.jobs}
                 await self._execute_job(job)
-                self._save_store()
+                with self._locked():
+                    self._merge_executed([job], kept_ids)
+                    self._save_store()
                 self._arm_timer()
                 return True
         return False
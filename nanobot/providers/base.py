@@ -2,7 +2,33 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+# Callback receiving each text delta of a streamed completion
+StreamCallback = Callable[[str], Awaitable[None]]
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Classify a failed provider call for retry decisions.
+
+    Returns one of "timeout", "rate_limit", "server" (5xx), "connection",
+    "auth" (401/403) or "client" (anything else, not worth retrying).
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(error, (TimeoutError, httpx.TimeoutException)) or status == 408:
+        return "timeout"
+    if status == 429:
+        return "rate_limit"
+    if status in (401, 403):
+        return "auth"
+    if isinstance(status, int) and status >= 500:
+        return "server"
+    if isinstance(error, (ConnectionError, httpx.TransportError)):
+        return "connection"
+    return "client"
 
 
 @dataclass
@@ -21,6 +47,7 @@ class LLMResponse:
     finish_reason: str = "stop"
     usage: dict[str, int] = field(default_factory=dict)
     reasoning_content: str | None = None  # Kimi, DeepSeek-R1 etc.
+    error_kind: str | None = None  # set with finish_reason "error", see classify_error()
     
     @property
     def has_tool_calls(self) -> bool:
@@ -48,6 +75,7 @@ class LLMProvider(ABC):
         model: str | None = None,
         max_tokens: int = 4096,
         temperature: float = 0.7,
+        cache_key: str | None = None,
     ) -> LLMResponse:
         """
         Send a chat completion request.
@@ -58,11 +86,48 @@ class LLMProvider(ABC):
             model: Model identifier (provider-specific).
             max_tokens: Maximum tokens in response.
             temperature: Sampling temperature.
+            cache_key: Stable key (e.g. the session key) for provider prompt-cache routing.
         
         Returns:
             LLMResponse with content and/or tool calls.
         """
         pass
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        on_delta: StreamCallback,
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request, reporting text deltas as they arrive.
+
+        Providers without native streaming fall back to ``chat`` and emit
+        the whole content as a single delta.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            on_delta: Awaited with each new piece of assistant text.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+            cache_key: Stable key (e.g. the session key) for provider prompt-cache routing.
+
+        Returns:
+            The complete LLMResponse, same as ``chat``.
+        """
+        response = await self.chat(
+            messages=messages, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature, cache_key=cache_key,
+        )
+        if response.content and response.finish_reason != "error":
+            await on_delta(response.content)
+        return response
     
     @abstractmethod
     def get_default_model(self) -> str:
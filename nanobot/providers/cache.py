@@ -0,0 +1,317 @@
+"""Persistent cache of LLM responses for repeated prompts (heartbeat, cron, consolidation)."""
+
+import dataclasses
+import hashlib
+import json
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamCallback, ToolCallRequest
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# The runtime context's clock line; stripped from the key when a call site ignores time
+_TIME_LINE = re.compile(r"## Current Time\n[^\n]*\n?")
+# Its minutes; masked when a call site only cares about the hour
+_TIME_MINUTES = re.compile(r"(## Current Time\n[^\n]*?\d{2}):\d{2}")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How calls made in a ``cache_responses`` block use the cache."""
+    site: str
+    ttl: float | None = None  # None = the cache's default TTL
+    allow_temperature: bool = False  # also cache calls with temperature > 0
+    ignore_time: bool = False  # leave the runtime "Current Time" line out of the key
+    hourly: bool = False  # keep only the hour of the "Current Time" line in the key
+    ignore_history: bool = False  # leave the session's history (see ``session_history``) out of the key
+
+
+_policy: ContextVar[CachePolicy | None] = ContextVar("llm_cache_policy", default=None)
+# Slice of the message list holding the session's earlier turns, as marked by the agent loop
+_history: ContextVar[tuple[int, int] | None] = ContextVar("llm_cache_history", default=None)
+
+
+@contextmanager
+def cache_responses(
+    site: str,
+    ttl: float | None = None,
+    allow_temperature: bool = False,
+    ignore_time: bool = False,
+    ignore_history: bool = False,
+    hourly: bool = False,
+) -> Iterator[None]:
+    """Let LLM calls made in this block (and tasks it spawns) be answered from the response cache."""
+    token = _policy.set(CachePolicy(site, ttl, allow_temperature, ignore_time, hourly, ignore_history))
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+@contextmanager
+def session_history(start: int, end: int) -> Iterator[None]:
+    """Mark ``messages[start:end]`` of the LLM calls in this block as the session's history."""
+    token = _history.set((start, end))
+    try:
+        yield
+    finally:
+        _history.reset(token)
+
+
+def make_key(
+    model: str | None,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    max_tokens: int,
+    temperature: float,
+    ignore_time: bool = False,
+    skip: tuple[int, int] | None = None,
+    hourly: bool = False,
+) -> str:
+    """Canonical hash of everything that determines a completion (except ``messages[skip[0]:skip[1]]``)."""
+    if skip:
+        messages = [*messages[:skip[0]], *messages[skip[1]:]]
+    if ignore_time:
+        messages = [_sub_time(m, _TIME_LINE, "") for m in messages]
+    elif hourly:
+        messages = [_sub_time(m, _TIME_MINUTES, r"\1:--") for m in messages]
+    payload = {
+        "model": model,
+        "messages": messages,
+        "tools": tools or [],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _sub_time(message: dict[str, Any], pattern: re.Pattern[str], repl: str) -> dict[str, Any]:
+    content = message.get("content")
+    if isinstance(content, str):
+        return {**message, "content": pattern.sub(repl, content)}
+    if isinstance(content, list):
+        return {**message, "content": [
+            {**part, "text": pattern.sub(repl, part["text"])} if isinstance(part.get("text"), str) else part
+            for part in content
+        ]}
+    return message
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache:
+    """
+    Disk-backed response cache in one SQLite database.
+
+    Entries expire after their TTL; when the stored responses exceed
+    ``max_bytes``, the least recently used ones are evicted. Hit, miss,
+    store and eviction counters are kept in the database too, so they
+    survive restarts and are shared by gateway worker processes.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 64 * 1024 * 1024, default_ttl: float = 3600.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> LLMResponse | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._count("hits")
+        data = json.loads(row[0])
+        # Replayed tool calls get fresh ids: ids must stay unique within a conversation
+        data["tool_calls"] = [
+            ToolCallRequest(**{**tc, "id": f"{tc['id']}_{secrets.token_hex(4)}"})
+            for tc in data.get("tool_calls", [])
+        ]
+        return LLMResponse(**data)
+
+    def put(self, key: str, response: LLMResponse, ttl: float | None = None) -> None:
+        data = json.dumps(dataclasses.asdict(response), ensure_ascii=False)
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, data, size, expires_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), expires_at, now),
+            )
+            self._count("stores")
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        evicted = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            victims, freed = [], 0
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                if freed >= excess:
+                    break
+                victims.append((key,))
+                freed += size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            evicted += len(victims)
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _count(self, name: str, n: int = 1) -> None:
+        self._conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, n),
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters"))
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return CacheStats(
+            hits=counters.get("hits", 0),
+            misses=counters.get("misses", 0),
+            stores=counters.get("stores", 0),
+            evictions=counters.get("evictions", 0),
+            entries=entries,
+            size_bytes=size,
+        )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM counters")
+
+
+class CachingProvider(LLMProvider):
+    """
+    Answers repeated requests from a ResponseCache.
+
+    Only calls made inside a ``cache_responses`` block whose site is in
+    ``sites`` are looked up; others go straight to the wrapped provider.
+    Calls with temperature > 0 are skipped unless the block (or
+    ``allow_temperature``) allows them. Error responses are never stored.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        cache: ResponseCache,
+        sites: set[str] | None = None,
+        allow_temperature: bool = False,
+    ):
+        super().__init__(provider.api_key, provider.api_base)
+        self.provider = provider
+        self.cache = cache
+        self.sites = sites
+        self.allow_temperature = allow_temperature
+
+    def _policy(self, temperature: float) -> CachePolicy | None:
+        policy = _policy.get()
+        if policy is None or (self.sites is not None and policy.site not in self.sites):
+            return None
+        if temperature > 0 and not (policy.allow_temperature or self.allow_temperature):
+            return None
+        return policy
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        policy = self._policy(temperature)
+        key = None
+        if policy:
+            skip = _history.get() if policy.ignore_history else None
+            key = make_key(
+                model or self.get_default_model(), messages, tools, max_tokens, temperature,
+                policy.ignore_time, skip, policy.hourly,
+            )
+            if cached := self.cache.get(key):
+                logger.debug(f"LLM response cache hit ({policy.site})")
+                return cached
+        response = await self.provider.chat(
+            messages=messages, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature, cache_key=cache_key,
+        )
+        if key and response.finish_reason != "error":
+            self.cache.put(key, response, policy.ttl)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        on_delta: StreamCallback,
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        if self._policy(temperature) is None:
+            return await self.provider.chat_stream(
+                messages=messages, on_delta=on_delta, tools=tools, model=model,
+                max_tokens=max_tokens, temperature=temperature, cache_key=cache_key,
+            )
+        # Cached calls are answered whole; a hit is emitted as a single delta
+        return await super().chat_stream(
+            messages=messages, on_delta=on_delta, tools=tools, model=model,
+            max_tokens=max_tokens, temperature=temperature, cache_key=cache_key,
+        )
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
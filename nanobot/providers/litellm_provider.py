@@ -1,5 +1,6 @@
 """LiteLLM provider implementation for multi-provider support."""
 
+import hashlib
 import json
 import json_repair
 import os
@@ -8,8 +9,10 @@ from typing import Any
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamCallback, ToolCallRequest, classify_error
+from nanobot.providers.ratelimit import Permit, RateLimiter
 from nanobot.providers.registry import find_by_model, find_gateway
+from nanobot.providers.tokens import TokenCounter
 
 
 class LiteLLMProvider(LLMProvider):
@@ -19,6 +22,9 @@ class LiteLLMProvider(LLMProvider):
     Supports OpenRouter, Anthropic, OpenAI, Gemini, MiniMax, and many other providers through
     a unified interface.  Provider-specific logic is driven by the registry
     (see providers/registry.py) — no if-elif chains needed here.
+
+    Requests go through a RateLimiter per model (RPM/TPM quotas, adaptive
+    concurrency, interactive before background work).
     """
     
     def __init__(
@@ -28,10 +34,18 @@ class LiteLLMProvider(LLMProvider):
         default_model: str = "anthropic/claude-opus-4-5",
         extra_headers: dict[str, str] | None = None,
         provider_name: str | None = None,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 8,
     ):
         super().__init__(api_key, api_base)
         self.default_model = default_model
         self.extra_headers = extra_headers or {}
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self._limiters: dict[str, RateLimiter] = {}
+        self._counters: dict[str, TokenCounter] = {}
         
         # Detect gateway / local deployment.
         # provider_name (from config key) is the primary signal;
@@ -42,9 +56,6 @@ class LiteLLMProvider(LLMProvider):
         if api_key:
             self._setup_env(api_key, api_base, default_model)
         
-        if api_base:
-            litellm.api_base = api_base
-        
         # Disable LiteLLM logging noise
         litellm.suppress_debug_info = True
         # Drop unsupported parameters for providers (e.g., gpt-5 rejects some params)
@@ -103,28 +114,88 @@ class LiteLLMProvider(LLMProvider):
                     kwargs.update(overrides)
                     return
     
-    async def chat(
+    def _supports_cache_control(self, model: str) -> bool:
+        """Whether the model (and gateway, if any) accepts cache_control breakpoints."""
+        if self._gateway and not self._gateway.supports_prompt_caching:
+            return False
+        spec = find_by_model(model)
+        return bool(spec and spec.supports_prompt_caching)
+    
+    @staticmethod
+    def _apply_cache_control(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Mark cache breakpoints after the system prompt and after the last message.
+
+        The caller's messages are left untouched; marked messages are copied.
+        """
+        marker = {"type": "ephemeral"}
+        marked = list(messages)
+        targets = {len(marked) - 1}
+        if marked and marked[0].get("role") == "system":
+            targets.add(0)
+        for i in targets:
+            msg = dict(marked[i])
+            content = msg.get("content")
+            if msg.get("role") == "tool":
+                msg["cache_control"] = marker
+            elif isinstance(content, str) and content:
+                msg["content"] = [{"type": "text", "text": content, "cache_control": marker}]
+            elif isinstance(content, list) and content:
+                msg["content"] = [*content[:-1], {**content[-1], "cache_control": marker}]
+            else:
+                continue
+            marked[i] = msg
+        return marked
+    
+    def _limiter(self, model: str) -> RateLimiter:
+        """Rate limiter for a model (quotas apply per model)."""
+        if model not in self._limiters:
+            self._limiters[model] = RateLimiter(self.rpm, self.tpm, self.max_concurrency)
+        return self._limiters[model]
+    
+    def _estimate_tokens(self, kwargs: dict[str, Any]) -> int:
+        """Tokens to reserve for a request: the prompt plus the completion budget."""
+        if not self.tpm:
+            return 0
+        model = kwargs["model"]
+        if model not in self._counters:
+            self._counters[model] = TokenCounter(model)
+        counter = self._counters[model]
+        return counter.count_messages(kwargs["messages"]) + counter.count_tools(kwargs.get("tools")) + kwargs["max_tokens"]
+    
+    @staticmethod
+    def _classify_error(error: Exception) -> str:
+        """classify_error() plus LiteLLM exception types that carry misleading status codes."""
+        if isinstance(error, litellm.Timeout):
+            return "timeout"
+        if isinstance(error, litellm.APIConnectionError):
+            return "connection"
+        return classify_error(error)
+    
+    @staticmethod
+    def _settle(permit: Permit, error: Exception | None = None, response: LLMResponse | None = None) -> None:
+        """Report the outcome of a request to its limiter permit."""
+        if error is not None:
+            permit.rate_limited = LiteLLMProvider._classify_error(error) == "rate_limit"
+            permit.failed = not permit.rate_limited
+        elif response is not None and response.usage:
+            permit.used_tokens = response.usage.get("total_tokens")
+    
+    def _build_kwargs(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """
-        Send a chat completion request via LiteLLM.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+        cache_key: str | None = None,
+    ) -> dict[str, Any]:
+        """Build acompletion() keyword arguments for a request."""
+        original_model = model or self.default_model
+        model = self._resolve_model(original_model)
         
-        Returns:
-            LLMResponse with content and/or tool calls.
-        """
-        model = self._resolve_model(model or self.default_model)
+        if self._supports_cache_control(original_model):
+            messages = self._apply_cache_control(messages)
         
         # Clamp max_tokens to at least 1 — negative or zero values cause
         # LiteLLM to reject the request with "max_tokens must be at least 1".
@@ -156,15 +227,89 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
-        try:
-            response = await acompletion(**kwargs)
-            return self._parse_response(response)
-        except Exception as e:
-            # Return error as content for graceful handling
-            return LLMResponse(
-                content=f"Error calling LLM: {str(e)}",
-                finish_reason="error",
-            )
+        # Route requests of one session to the same prompt cache (OpenAI);
+        # dropped by LiteLLM for providers that don't support it
+        if cache_key:
+            kwargs["prompt_cache_key"] = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()[:32]
+        
+        return kwargs
+    
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+            cache_key: Stable per-session key for prompt-cache routing.
+        
+        Returns:
+            LLMResponse with content and/or tool calls.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature, cache_key)
+        
+        async with self._limiter(kwargs["model"]).slot(self._estimate_tokens(kwargs)) as permit:
+            try:
+                result = self._parse_response(await acompletion(**kwargs))
+                self._settle(permit, response=result)
+                return result
+            except Exception as e:
+                self._settle(permit, error=e)
+                # Return error as content for graceful handling
+                return LLMResponse(
+                    content=f"Error calling LLM: {str(e)}",
+                    finish_reason="error",
+                    error_kind=self._classify_error(e),
+                )
+    
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        on_delta: StreamCallback,
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        """Stream a chat completion via LiteLLM, reporting text deltas as they arrive."""
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature, cache_key)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        
+        async with self._limiter(kwargs["model"]).slot(self._estimate_tokens(kwargs)) as permit:
+            try:
+                chunks = []
+                async for chunk in await acompletion(**kwargs):
+                    permit.mark_first_token()
+                    chunks.append(chunk)
+                    if chunk.choices and (delta := chunk.choices[0].delta.content):
+                        await on_delta(delta)
+                # Reassemble the chunks into a regular response (content, tool calls, usage)
+                response = litellm.stream_chunk_builder(chunks, messages=messages)
+                if response is None:
+                    raise RuntimeError("stream ended without a response")
+                result = self._parse_response(response)
+                self._settle(permit, response=result)
+                return result
+            except Exception as e:
+                self._settle(permit, error=e)
+                return LLMResponse(
+                    content=f"Error calling LLM: {str(e)}",
+                    finish_reason="error",
+                    error_kind=self._classify_error(e),
+                )
     
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
@@ -192,6 +337,13 @@ class LiteLLMProvider(LLMProvider):
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens,
             }
+            # Prompt-cache hits (OpenAI, DeepSeek) and Anthropic cache reads/writes,
+            # normalized by LiteLLM
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            if cached := getattr(details, "cached_tokens", None):
+                usage["cached_tokens"] = cached
+            if written := getattr(response.usage, "cache_creation_input_tokens", None):
+                usage["cache_creation_tokens"] = written
         
         reasoning_content = getattr(message, "reasoning_content", None)
         
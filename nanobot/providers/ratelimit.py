@@ -0,0 +1,180 @@
+"""Client-side rate limiting and adaptive concurrency for LLM providers."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator
+
+from loguru import logger
+
+# Request priorities: lower runs first when capacity is scarce
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority: ContextVar[int] = ContextVar("llm_priority", default=INTERACTIVE)
+
+SLOW_CALL_SECONDS = 90.0  # a call slower than this counts as a congestion signal
+SLOW_CALL_DECREASE = 0.9
+RATE_LIMIT_DECREASE = 0.5
+
+
+@contextmanager
+def background() -> Iterator[None]:
+    """Run LLM calls made in this block (and tasks it spawns) at background priority."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute``, holding at most a minute's worth.
+
+    ``take`` may drive the level negative (debt), so estimates can be
+    corrected after the fact with the real usage.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` (capped at capacity) can be taken; 0 if now."""
+        self._refill()
+        missing = min(amount, self.capacity) - self._level
+        return max(0.0, missing / self.rate) if self.rate else 0.0
+
+    def take(self, amount: float) -> None:
+        """Take (or, if negative, give back) ``amount``."""
+        self._refill()
+        self._level = min(self.capacity, self._level - amount)
+
+
+@dataclass
+class Permit:
+    """One admitted request; the caller reports what happened before releasing it."""
+    estimated_tokens: int
+    started: float
+    used_tokens: int | None = None
+    rate_limited: bool = False
+    failed: bool = False  # any other error: no signal either way for the concurrency limit
+    first_token: float | None = None  # set by streamed calls; their latency is time to first token
+
+    def mark_first_token(self) -> None:
+        if self.first_token is None:
+            self.first_token = time.monotonic()
+
+
+class RateLimiter:
+    """
+    Admission control for one provider/model.
+
+    - Requests per minute and tokens per minute are enforced with token
+      buckets. Tokens are reserved from an estimate and corrected with the
+      response's ``usage`` when the request finishes.
+    - Concurrency adapts AIMD-style between ``min_concurrency`` and
+      ``max_concurrency``: +1/limit per successful call, halved on a 429,
+      reduced by 10% when a call is slower than ``SLOW_CALL_SECONDS``
+      (streamed calls: until their first token). Other failures leave it
+      unchanged.
+    - Waiting requests are admitted by priority (interactive before
+      background), then in arrival order.
+    """
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_concurrency: int = 8, min_concurrency: int = 1):
+        self.requests = TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm) if tpm > 0 else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+        self._queue: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int = 0, priority: int | None = None) -> AsyncIterator[Permit]:
+        """Wait for capacity, then hold it for the duration of the block."""
+        permit = await self.acquire(estimated_tokens, current_priority() if priority is None else priority)
+        try:
+            yield permit
+        except BaseException:
+            permit.failed = not permit.rate_limited
+            raise
+        finally:
+            await self.release(permit)
+
+    async def acquire(self, estimated_tokens: int = 0, priority: int = INTERACTIVE) -> Permit:
+        entry = (priority, next(self._seq))
+        async with self._cond:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    delay = None
+                    if self._queue[0] == entry and self.in_flight < int(self.limit):
+                        delay = self._bucket_delay(estimated_tokens)
+                        if delay <= 0:
+                            break
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(estimated_tokens)
+            self.in_flight += 1
+            # The next waiter may fit too
+            self._cond.notify_all()
+        return Permit(estimated_tokens=estimated_tokens, started=time.monotonic())
+
+    def _bucket_delay(self, estimated_tokens: int) -> float:
+        delay = self.requests.delay(1) if self.requests else 0.0
+        if self.tokens:
+            delay = max(delay, self.tokens.delay(estimated_tokens))
+        return delay
+
+    async def release(self, permit: Permit) -> None:
+        async with self._cond:
+            self.in_flight -= 1
+            if self.tokens and permit.used_tokens is not None:
+                self.tokens.take(permit.used_tokens - permit.estimated_tokens)
+            self._adapt(permit)
+            self._cond.notify_all()
+
+    def _adapt(self, permit: Permit) -> None:
+        old = self.limit
+        latency = (permit.first_token or time.monotonic()) - permit.started
+        if permit.rate_limited:
+            self.limit = max(self.min_concurrency, self.limit * RATE_LIMIT_DECREASE)
+        elif permit.failed:
+            return
+        elif latency > SLOW_CALL_SECONDS:
+            self.limit = max(self.min_concurrency, self.limit * SLOW_CALL_DECREASE)
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        if int(self.limit) != int(old):
+            logger.info(f"LLM concurrency limit {int(old)} -> {int(self.limit)} (in flight: {self.in_flight})")
@@ -54,6 +54,13 @@ class ProviderSpec:
     # OAuth-based providers (e.g., OpenAI Codex) don't use API keys
     is_oauth: bool = False                   # if True, uses OAuth flow instead of API key
 
+    # token accounting for history budgeting (see providers/tokens.py)
+    context_window: int = 128_000            # prompt + completion tokens the model family accepts
+    chars_per_token: float = 4.0             # estimator ratio when no tokenizer is available
+
+    # prompt caching: mark the stable prompt prefix with cache_control breakpoints
+    supports_prompt_caching: bool = False
+
     @property
     def label(self) -> str:
         return self.display_name or self.name.title()
@@ -77,6 +84,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         skip_prefixes=("openai/",),
         is_gateway=True,
         strip_model_prefix=True,
+        context_window=128_000,
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 
     # === Gateways (detected by api_key / api_base, not model name) =========
@@ -98,6 +108,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://openrouter.ai/api/v1",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
+        chars_per_token=4.0,
+        supports_prompt_caching=True,       # accepts cache_control breakpoints
     ),
 
     # AiHubMix: global gateway, OpenAI-compatible interface.
@@ -118,6 +131,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://aihubmix.com/v1",
         strip_model_prefix=True,            # anthropic/claude-3 → claude-3 → openai/claude-3
         model_overrides=(),
+        context_window=128_000,
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 
     # === Standard providers (matched by model-name keywords) ===============
@@ -138,6 +154,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=200_000,
+        chars_per_token=3.5,
+        supports_prompt_caching=True,       # accepts cache_control breakpoints
     ),
 
     # OpenAI: LiteLLM recognizes "gpt-*" natively, no prefix needed.
@@ -156,6 +175,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,             # exact counts via tiktoken when available
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 
     # OpenAI Codex: uses OAuth, not API key.
@@ -175,6 +197,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         strip_model_prefix=False,
         model_overrides=(),
         is_oauth=True,                      # OAuth-based authentication
+        context_window=272_000,
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 
     # DeepSeek: needs "deepseek/" prefix for LiteLLM routing.
@@ -193,6 +218,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
+        chars_per_token=3.5,
+        supports_prompt_caching=False,
     ),
 
     # Gemini: needs "gemini/" prefix for LiteLLM.
@@ -211,6 +239,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=1_048_576,
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 
     # Zhipu: LiteLLM uses "zai/" prefix.
@@ -233,6 +264,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,             # CJK-heavy text packs fewer chars per token
+        chars_per_token=3.0,
+        supports_prompt_caching=False,
     ),
 
     # DashScope: Qwen models, needs "dashscope/" prefix.
@@ -251,6 +285,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
+        chars_per_token=3.0,
+        supports_prompt_caching=False,
     ),
 
     # Moonshot: Kimi models, needs "moonshot/" prefix.
@@ -275,6 +312,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         model_overrides=(
             ("kimi-k2.5", {"temperature": 1.0}),
         ),
+        context_window=256_000,
+        chars_per_token=3.0,
+        supports_prompt_caching=False,
     ),
 
     # MiniMax: needs "minimax/" prefix for LiteLLM routing.
@@ -294,6 +334,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="https://api.minimax.io/v1",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=200_000,
+        chars_per_token=3.5,
+        supports_prompt_caching=False,
     ),
 
     # === Local deployment (matched by config key, NOT by api_base) =========
@@ -315,6 +358,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",                # user must provide in config
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=32_768,              # conservative; set agents.defaults.contextWindow
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 
     # === Auxiliary (not a primary LLM provider) ============================
@@ -336,6 +382,9 @@ PROVIDERS: tuple[ProviderSpec, ...] = (
         default_api_base="",
         strip_model_prefix=False,
         model_overrides=(),
+        context_window=128_000,
+        chars_per_token=4.0,
+        supports_prompt_caching=False,
     ),
 )
 
@@ -0,0 +1,290 @@
+"""Retries, hedged requests and failover across LLM providers."""
+
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from nanobot.providers.base import LLMProvider, LLMResponse, StreamCallback
+from nanobot.providers.ratelimit import INTERACTIVE, current_priority
+
+RETRYABLE = frozenset({"timeout", "rate_limit", "server", "connection"})
+FAILOVER = RETRYABLE | {"auth"}  # errors another endpoint might not have
+LATENCY_SAMPLES = 200  # recent latencies kept per endpoint for the hedge threshold
+
+# Sends one request to an endpoint: (provider, model, on_delta) -> response
+Send = Callable[[LLMProvider, str | None, StreamCallback | None], Awaitable[LLMResponse]]
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one endpoint.
+
+    Opens after ``threshold`` failures in a row; after ``cooldown`` seconds
+    one probe request is let through (half-open), which closes the breaker
+    on success or reopens it on failure.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if self._probing else "open"
+
+    def allow(self) -> bool:
+        """Whether a request may go to the endpoint now."""
+        if self.opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        self._probing = True
+        return True
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def abandon(self) -> None:
+        """A request was cancelled before finishing; free the probe slot if it held it."""
+        self._probing = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class LatencyTracker:
+    """Recent latencies of successful calls, for the hedging threshold."""
+
+    def __init__(self, maxlen: int = LATENCY_SAMPLES):
+        self._samples: deque[float] = deque(maxlen=maxlen)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float, min_samples: int = 1) -> float | None:
+        """The ``p`` quantile (0-1), or None with fewer than ``min_samples`` samples."""
+        if len(self._samples) < max(1, min_samples):
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+@dataclass
+class Endpoint:
+    """A provider to send requests to, optionally pinned to its own model."""
+    name: str
+    provider: LLMProvider
+    model: str | None = None  # None = the model the caller asked for
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+    latency: LatencyTracker = field(default_factory=LatencyTracker)  # full call (chat)
+    first_delta: LatencyTracker = field(default_factory=LatencyTracker)  # time to first delta (chat_stream)
+
+
+class _Race:
+    """Shared state of the attempts for one request (the original and its hedge)."""
+
+    def __init__(self, on_delta: StreamCallback | None):
+        self.on_delta = on_delta
+        self.winner: int | None = None  # attempt whose text the caller is seeing
+
+    def emitter(self, attempt: int, endpoint: Endpoint, started: float) -> StreamCallback | None:
+        if self.on_delta is None:
+            return None
+
+        async def emit(delta: str) -> None:
+            if self.winner is None:
+                self.winner = attempt
+                endpoint.first_delta.record(time.monotonic() - started)
+            if self.winner != attempt:
+                raise asyncio.CancelledError()  # the other attempt is already streaming
+            await self.on_delta(delta)
+
+        return emit
+
+    def lost(self, attempt: int) -> bool:
+        return self.winner is not None and self.winner != attempt
+
+
+class ResilientProvider(LLMProvider):
+    """
+    Wraps one or more providers to hide transient failures and slow calls.
+
+    - Timeouts, 429s, 5xx and connection errors are retried up to
+      ``max_retries`` times per endpoint with full-jitter exponential backoff.
+    - After that (or right away on auth errors) the request fails over to
+      the next endpoint, in order. Each endpoint has a circuit breaker, so
+      endpoints that keep failing are skipped until their cooldown ends.
+    - With ``hedge``, an interactive request still unanswered after the
+      endpoint's recent ``hedge_percentile`` latency (time to first delta
+      when streaming) is sent once more; the first answer wins and the other
+      request is cancelled.
+    - Streamed requests are not retried once text has reached the caller.
+
+    Errors that are not worth retrying (bad requests, context overflows)
+    are returned as they are.
+    """
+
+    def __init__(
+        self,
+        endpoints: list[Endpoint],
+        max_retries: int = 2,
+        backoff_base: float = 1.0,
+        backoff_max: float = 20.0,
+        hedge: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_samples: int = 20,
+    ):
+        if not endpoints:
+            raise ValueError("ResilientProvider needs at least one endpoint")
+        primary = endpoints[0].provider
+        super().__init__(primary.api_key, primary.api_base)
+        self.endpoints = endpoints
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        async def send(provider: LLMProvider, model: str | None, on_delta: StreamCallback | None) -> LLMResponse:
+            return await provider.chat(
+                messages=messages, tools=tools, model=model,
+                max_tokens=max_tokens, temperature=temperature, cache_key=cache_key,
+            )
+
+        return await self._request(send, model, None)
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        on_delta: StreamCallback,
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        cache_key: str | None = None,
+    ) -> LLMResponse:
+        async def send(provider: LLMProvider, model: str | None, on_delta: StreamCallback | None) -> LLMResponse:
+            return await provider.chat_stream(
+                messages=messages, on_delta=on_delta, tools=tools, model=model,
+                max_tokens=max_tokens, temperature=temperature, cache_key=cache_key,
+            )
+
+        return await self._request(send, model, on_delta)
+
+    def get_default_model(self) -> str:
+        return self.endpoints[0].provider.get_default_model()
+
+    async def _request(self, send: Send, model: str | None, on_delta: StreamCallback | None) -> LLMResponse:
+        last: LLMResponse | None = None
+        race = _Race(on_delta)
+        for n, endpoint in enumerate(self.endpoints):
+            if not endpoint.breaker.allow() and (last or n < len(self.endpoints) - 1):
+                continue  # open circuit; with every circuit open, the last endpoint is still tried
+            if last:
+                logger.warning(f"Failing over to LLM endpoint {endpoint.name}")
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    await asyncio.sleep(self._backoff(attempt))
+                    if not endpoint.breaker.allow():
+                        break
+                response = await self._attempt(endpoint, send, endpoint.model or model, race)
+                if response.finish_reason != "error":
+                    return response
+                last = response
+                if race.winner is not None or response.error_kind not in FAILOVER:
+                    return response  # text already streamed, or retrying would not help
+                logger.warning(
+                    f"LLM call to {endpoint.name} failed ({response.error_kind}), "
+                    f"attempt {attempt + 1}/{self.max_retries + 1}"
+                )
+                if response.error_kind not in RETRYABLE:
+                    break
+        return last or LLMResponse(content="Error calling LLM: no endpoint available", finish_reason="error")
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    async def _attempt(self, endpoint: Endpoint, send: Send, model: str | None, race: _Race) -> LLMResponse:
+        """One try on an endpoint, hedged with a second identical request if it is slow."""
+        first = asyncio.create_task(self._timed(endpoint, send, model, race, 0))
+        delay = self._hedge_delay(endpoint, streaming=race.on_delta is not None)
+        if delay is None:
+            return await first
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done or race.winner is not None:
+            return await first
+
+        logger.info(f"LLM call to {endpoint.name} slower than p{self.hedge_percentile * 100:.0f} ({delay:.1f}s), hedging")
+        pending = {first, asyncio.create_task(self._timed(endpoint, send, model, race, 1))}
+        response: LLMResponse | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.cancelled() or task.exception():
+                        continue
+                    result = task.result()
+                    if result is not None and (result.finish_reason != "error" or response is None):
+                        response = result
+                if response is not None and response.finish_reason != "error":
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        return response or LLMResponse(content="Error calling LLM: hedged requests failed", finish_reason="error")
+
+    def _hedge_delay(self, endpoint: Endpoint, streaming: bool) -> float | None:
+        if not self.hedge or current_priority() != INTERACTIVE:
+            return None
+        tracker = endpoint.first_delta if streaming else endpoint.latency
+        return tracker.percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    async def _timed(
+        self, endpoint: Endpoint, send: Send, model: str | None, race: _Race, attempt: int
+    ) -> LLMResponse | None:
+        """Send one request and feed the outcome to the endpoint's breaker and latency stats."""
+        started = time.monotonic()
+        try:
+            response = await send(endpoint.provider, model, race.emitter(attempt, endpoint, started))
+        except asyncio.CancelledError:
+            endpoint.breaker.abandon()
+            raise
+        if race.lost(attempt):
+            endpoint.breaker.abandon()
+            return None  # the other attempt won the stream; this one was cut short
+        if response.finish_reason != "error":
+            endpoint.breaker.success()
+            if race.on_delta is None:
+                endpoint.latency.record(time.monotonic() - started)
+        elif response.error_kind not in FAILOVER:
+            endpoint.breaker.success()  # the endpoint answered; the request itself was bad
+        else:
+            endpoint.breaker.failure()
+            if endpoint.breaker.state == "open":
+                logger.error(f"LLM endpoint {endpoint.name} failing, circuit opened for {endpoint.breaker.cooldown:.0f}s")
+        return response
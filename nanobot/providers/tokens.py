@@ -0,0 +1,91 @@
+"""Token counting for prompt budgeting, keyed by model family from the provider registry."""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from typing import Any, Callable
+
+from loguru import logger
+
+from nanobot.providers.registry import find_by_model
+
+DEFAULT_CONTEXT_WINDOW = 128_000
+DEFAULT_CHARS_PER_TOKEN = 4.0
+MESSAGE_OVERHEAD_TOKENS = 4  # role + delimiters per chat message
+IMAGE_TOKENS = 1000  # rough cost of one attached image
+
+
+@lru_cache(maxsize=4)
+def _tiktoken_encoder(encoding_name: str) -> Callable[[str], list[int]] | None:
+    """Load a tiktoken encoding once per process; None if unavailable (e.g. offline)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name).encode
+    except Exception as e:
+        logger.debug(f"tiktoken encoding {encoding_name} unavailable, using estimator: {e}")
+        return None
+
+
+def _encoding_for(model: str) -> str | None:
+    """Pick the tiktoken encoding for OpenAI model families (others are estimated)."""
+    m = model.lower()
+    if any(k in m for k in ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4", "codex")):
+        return "o200k_base"
+    if "gpt-4" in m or "gpt-3.5" in m:
+        return "cl100k_base"
+    return None
+
+
+class TokenCounter:
+    """
+    Counts (or estimates) tokens for one model.
+
+    OpenAI-family models use a cached tiktoken encoding when it can be loaded;
+    everything else uses a chars-per-token ratio from the model's ProviderSpec.
+    """
+
+    def __init__(self, model: str, context_window: int | None = None):
+        spec = find_by_model(model)
+        self.model = model
+        self.context_window = context_window or (spec.context_window if spec else DEFAULT_CONTEXT_WINDOW)
+        self.chars_per_token = spec.chars_per_token if spec else DEFAULT_CHARS_PER_TOKEN
+        encoding = _encoding_for(model)
+        self._encode = _tiktoken_encoder(encoding) if encoding else None
+
+    def count_text(self, text: str) -> int:
+        """Count tokens in a plain string."""
+        if not text:
+            return 0
+        if self._encode:
+            try:
+                return len(self._encode(text))
+            except Exception:
+                pass
+        return int(len(text) / self.chars_per_token) + 1
+
+    def count_message(self, message: dict[str, Any]) -> int:
+        """Count tokens in one chat message, including tool calls and image parts."""
+        tokens = MESSAGE_OVERHEAD_TOKENS
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += self.count_text(content)
+        elif isinstance(content, list):
+            for part in content:
+                if part.get("type") == "image_url":
+                    tokens += IMAGE_TOKENS
+                else:
+                    tokens += self.count_text(part.get("text", ""))
+        if tool_calls := message.get("tool_calls"):
+            tokens += self.count_text(json.dumps(tool_calls, ensure_ascii=False))
+        return tokens
+
+    def count_messages(self, messages: list[dict[str, Any]]) -> int:
+        """Count tokens in a list of chat messages."""
+        return sum(self.count_message(m) for m in messages)
+
+    def count_tools(self, tools: list[dict[str, Any]] | None) -> int:
+        """Count tokens taken by tool (function) schemas."""
+        if not tools:
+            return 0
+        return self.count_text(json.dumps(tools, ensure_ascii=False))
@@ -0,0 +1,63 @@
+"""Base class for session storage backends."""
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from nanobot.session.manager import Session
+
+
+class SessionStore(ABC):
+    """
+    Abstract storage backend for sessions.
+
+    Stores persist what SessionManager hands them; caching lives in the
+    manager. A loaded session may hold only its most recent messages (see
+    ``Session.offset``), and saving such a session must keep the older
+    messages intact.
+    """
+
+    @abstractmethod
+    def load(self, key: str, tail_messages: int) -> Session | None:
+        """
+        Load a session.
+
+        Args:
+            key: Session key.
+            tail_messages: Minimum number of recent messages to load; messages
+                not consolidated yet are always loaded.
+
+        Returns:
+            The session, or None if it doesn't exist.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session (ideally only what changed since the last save)."""
+        pass
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """List sessions as dicts with 'key', 'created_at', 'updated_at', newest first."""
+        pass
+
+    def forget(self, key: str) -> None:
+        """Drop any per-session state, e.g. when the session leaves the cache."""
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+        pass
+
+    @staticmethod
+    def metadata_record(session: Session) -> dict[str, Any]:
+        """Session metadata with counts relative to the full history."""
+        return {
+            "_type": "metadata",
+            "key": session.key,
+            "created_at": session.created_at.isoformat(),
+            "updated_at": session.updated_at.isoformat(),
+            "metadata": session.metadata,
+            "last_consolidated": session.offset + session.last_consolidated,
+            "message_count": session.offset + len(session.messages),
+        }
@@ -0,0 +1,349 @@
+"""JSONL session storage: one append-only file per session."""
+
+import asyncio
+import itertools
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from loguru import logger
+
+from nanobot.session.base import SessionStore
+from nanobot.session.manager import Session
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+
+@dataclass
+class _FileState:
+    """What a session file on disk already contains."""
+
+    persisted: int = 0  # messages written to the file
+    last: dict[str, Any] | None = None  # last written message, to detect clear() and rewrites
+    trailers: int = 0  # metadata records appended since the last full write
+    generation: int = 0  # changes on every full rewrite
+    compacting: bool = False
+
+
+_generations = itertools.count(1)
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    Stores each session as a JSONL file in the sessions directory.
+
+    A file holds a metadata line, one line per message and a closing
+    metadata record. Saves only append the new messages plus a metadata
+    trailer record (the last metadata record wins on load), so a save costs
+    the same no matter how long the session is. Once ``compact_after``
+    trailers piled up, the file is compacted in a worker thread and swapped
+    in with an atomic rename.
+
+    fsync policy: "never", "compact" (fsync compacted files before the
+    rename; default) or "always" (also fsync every append).
+    """
+
+    def __init__(self, sessions_dir: Path, fsync: str = "compact", compact_after: int = 100):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self.fsync = fsync
+        self.compact_after = max(1, compact_after)
+        self._files: dict[str, _FileState] = {}
+        self._io_lock = threading.Lock()  # appends vs. the compaction swap
+
+    def _get_session_path(self, key: str) -> Path:
+        """Get the file path for a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def load(self, key: str, tail_messages: int) -> Session | None:
+        """Load a session, reading only the tail of its file when possible."""
+        path = self._get_session_path(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            loaded = self._load_tail(path, tail_messages) or self._load_full(key, path)
+            metadata, messages, offset, trailers = loaded
+
+            with self._io_lock:
+                self._files[key] = _FileState(
+                    persisted=len(messages),
+                    last=messages[-1] if messages else None,
+                    trailers=trailers,
+                    generation=next(_generations),
+                )
+            created_at = metadata.get("created_at")
+            return Session(
+                key=key,
+                messages=messages,
+                created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+                metadata=metadata.get("metadata", {}),
+                last_consolidated=max(0, metadata.get("last_consolidated", 0) - offset),
+                offset=offset,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load session {key}: {e}")
+            return None
+
+    def _load_full(self, key: str, path: Path) -> tuple[dict, list[dict], int, int]:
+        """Parse the whole file (files written before message counts were recorded)."""
+        messages = []
+        metadata: dict[str, Any] = {}
+        metadata_records = 0
+
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final append from a crash; everything before it is intact
+                    logger.warning(f"Skipping corrupt line in session {key}")
+                    continue
+
+                if data.get("_type") == "metadata":
+                    metadata = data
+                    metadata_records += 1
+                else:
+                    messages.append(data)
+
+        return metadata, messages, 0, max(0, metadata_records - 1)
+
+    def _load_tail(self, path: Path, tail_messages: int) -> tuple[dict, list[dict], int, int] | None:
+        """
+        Read the file backwards: the latest metadata record, then messages until
+        the tail is long enough. None if the file has no message counts.
+        """
+        metadata: dict[str, Any] | None = None
+        messages: list[dict[str, Any]] = []
+        after_metadata = 0  # messages appended after the latest metadata record (torn save)
+        trailers = 0
+        need = tail_messages
+        total = 0
+        reached_start = True
+
+        for line in _reverse_lines(path):
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if data.get("_type") == "metadata":
+                if metadata is None:
+                    if "message_count" not in data:
+                        return None
+                    metadata = data
+                    total = data["message_count"] + after_metadata
+                    # Keep everything consolidation has not processed yet
+                    need = max(need, total - data.get("last_consolidated", 0))
+                trailers += 1
+                continue
+            if metadata is not None and len(messages) >= need:
+                reached_start = False
+                break
+            messages.append(data)
+            if metadata is None:
+                after_metadata += 1
+
+        if metadata is None:
+            return None
+        messages.reverse()
+        offset = 0 if reached_start else max(0, total - len(messages))
+        # The header line counts as a metadata record but isn't a trailer
+        return metadata, messages, offset, max(0, trailers - 1) if reached_start else trailers
+    
+    def save(self, session: Session) -> None:
+        """Save a session, appending only what changed since the last save."""
+        path = self._get_session_path(session.key)
+
+        with self._io_lock:
+            state = self._files.get(session.key)
+            if state is None or not path.exists() or not self._extends_file(state, session):
+                # New file, or messages were cleared/replaced: rewrite it
+                state = self._rewrite(path, session)
+                self._files[session.key] = state
+            else:
+                lines = [json.dumps(m) for m in session.messages[state.persisted:]]
+                lines.append(json.dumps(self.metadata_record(session)))
+                with open(path, "a") as f:
+                    f.write("\n".join(lines) + "\n")
+                    if self.fsync == "always":
+                        f.flush()
+                        os.fsync(f.fileno())
+                state.persisted = len(session.messages)
+                state.last = session.messages[-1] if session.messages else None
+                state.trailers += 1
+
+            compact = state.trailers >= self.compact_after and not state.compacting
+            if compact:
+                state.compacting = True
+
+        if compact:
+            self._schedule_compaction(session, state.generation)
+
+    @staticmethod
+    def _extends_file(state: _FileState, session: Session) -> bool:
+        """Whether the file holds a prefix of the session's messages."""
+        if state.persisted > len(session.messages):
+            return False
+        return state.persisted == 0 or session.messages[state.persisted - 1] is state.last
+
+    def _rewrite(self, path: Path, session: Session) -> _FileState:
+        """Write the whole session to a temp file and rename it into place."""
+        messages = list(session.messages)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w") as f:
+            f.write(json.dumps(self.metadata_record(session)) + "\n")
+            # Messages that were never loaded are carried over from the old file
+            _copy_messages(path, session.offset, f)
+            for msg in messages:
+                f.write(json.dumps(msg) + "\n")
+            # Closing record too, so loads find the latest metadata on the last line
+            f.write(json.dumps(self.metadata_record(session)) + "\n")
+            self._sync(f)
+        os.replace(tmp, path)
+        return _FileState(
+            persisted=len(messages),
+            last=messages[-1] if messages else None,
+            generation=next(_generations),
+        )
+
+    def _sync(self, f: Any) -> None:
+        if self.fsync != "never":
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _schedule_compaction(self, session: Session, generation: int) -> None:
+        """Compact in a worker thread when called from the event loop, else inline."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._compact(session, generation)
+            return
+        loop.run_in_executor(None, self._compact, session, generation)
+
+    def _compact(self, session: Session, generation: int) -> None:
+        """Rewrite a session file without its trailer records."""
+        key = session.key
+        path = self._get_session_path(key)
+        tmp = path.with_name(path.name + ".compact")
+        try:
+            with self._io_lock:
+                state = self._files.get(key)
+                if state is None or state.generation != generation:
+                    return
+                snapshot = session.messages[:state.persisted]
+                offset = session.offset
+                header = self.metadata_record(session)
+
+            # The bulk of the work runs unlocked; saves keep appending to the old file
+            with open(tmp, "w") as f:
+                f.write(json.dumps(header) + "\n")
+                _copy_messages(path, offset, f)
+                for msg in snapshot:
+                    f.write(json.dumps(msg) + "\n")
+
+            with self._io_lock:
+                state = self._files.get(key)
+                if state is None or state.generation != generation:
+                    tmp.unlink(missing_ok=True)
+                    return
+                # Carry over whatever was appended while we were writing
+                with open(tmp, "a") as f:
+                    lines = [json.dumps(m) for m in session.messages[len(snapshot):state.persisted]]
+                    lines.append(json.dumps(self.metadata_record(session)))
+                    f.write("\n".join(lines) + "\n")
+                    self._sync(f)
+                os.replace(tmp, path)
+                state.trailers = 0
+            logger.debug(f"Compacted session {key} ({len(snapshot)} messages)")
+        except Exception as e:
+            logger.warning(f"Failed to compact session {key}: {e}")
+            tmp.unlink(missing_ok=True)
+        finally:
+            with self._io_lock:
+                if state := self._files.get(key):
+                    state.compacting = False
+    
+    def forget(self, key: str) -> None:
+        with self._io_lock:
+            self._files.pop(key, None)
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        sessions = []
+        
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                data = self._read_metadata(path)
+                if data:
+                    sessions.append({
+                        "key": data.get("key") or path.stem.replace("_", ":"),
+                        "created_at": data.get("created_at"),
+                        "updated_at": data.get("updated_at"),
+                        "path": str(path)
+                    })
+            except Exception:
+                continue
+        
+        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    @staticmethod
+    def _read_metadata(path: Path, tail_bytes: int = 65536) -> dict[str, Any] | None:
+        """Read the latest metadata record: the last trailer near the end, else the first line."""
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - tail_bytes))
+            tail = f.read().decode("utf-8", errors="ignore")
+            for line in reversed(tail.splitlines()):
+                if '"_type": "metadata"' in line:
+                    try:
+                        return json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+            f.seek(0)
+            data = json.loads(f.readline() or "{}")
+        return data if data.get("_type") == "metadata" else None
+
+
+def _reverse_lines(path: Path, block_size: int = 65536) -> Iterator[str]:
+    """Yield the non-empty lines of a file from last to first, reading it in blocks."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        rest = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + rest).split(b"\n")
+            rest = lines.pop(0)  # may continue in the previous block
+            for line in reversed(lines):
+                if line.strip():
+                    yield line.decode("utf-8", errors="replace").strip()
+        if rest.strip():
+            yield rest.decode("utf-8", errors="replace").strip()
+
+
+def _copy_messages(path: Path, count: int, out: TextIO) -> None:
+    """Copy the first ``count`` message lines of a session file to ``out``."""
+    if count <= 0 or not path.exists():
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('{"_type": "metadata"'):
+                continue
+            try:
+                json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            out.write(line + "\n")
+            count -= 1
+            if count <= 0:
+                return
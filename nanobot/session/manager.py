@@ -1,14 +1,19 @@
 """Session management for conversation history."""
 
-import json
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.utils.helpers import ensure_dir
+
+if TYPE_CHECKING:
+    from nanobot.session.base import SessionStore
 
 
 @dataclass
@@ -21,6 +26,10 @@ class Session:
     Important: Messages are append-only for LLM cache efficiency.
     The consolidation process writes summaries to MEMORY.md/HISTORY.md
     but does NOT modify the messages list or get_history() output.
+
+    A session loaded from disk may hold only the tail of its history:
+    ``offset`` older messages stay in the file, and ``last_consolidated``
+    counts from ``messages[0]``.
     """
 
     key: str  # channel:chat_id
@@ -29,6 +38,7 @@ class Session:
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
+    offset: int = 0  # Older messages not loaded into memory
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -49,6 +59,7 @@ class Session:
         """Clear all messages and reset session to initial state."""
         self.messages = []
         self.last_consolidated = 0
+        self.offset = 0
         self.updated_at = datetime.now()
 
 
@@ -56,18 +67,48 @@ class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Persistence is delegated to a SessionStore backend: "jsonl" (one
+    append-only file per session, the default) or "sqlite" (a single WAL-mode
+    database with indexed listing).
+
+    Loaded sessions are kept in an LRU cache bounded by ``max_sessions`` and
+    ``max_cache_bytes``; sessions idle for ``idle_ttl`` seconds are dropped.
+    Stores load only the last ``tail_messages`` messages of a session, or
+    more if consolidation has not reached them yet.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        backend: str = "jsonl",
+        fsync: str = "compact",
+        compact_after: int = 100,
+        max_sessions: int = 256,
+        max_cache_bytes: int = 64 * 1024 * 1024,
+        idle_ttl: float = 3600,
+        tail_messages: int = 500,
+        sessions_dir: Path | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(Path.home() / ".nanobot" / "sessions")
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
+        self.sessions_dir = ensure_dir(sessions_dir or Path.home() / ".nanobot" / "sessions")
+        self.max_sessions = max(1, max_sessions)
+        self.max_cache_bytes = max_cache_bytes
+        self.idle_ttl = idle_ttl
+        self.tail_messages = max(1, tail_messages)
+        self.store = self._make_store(backend, fsync, compact_after)
+        self._cache: OrderedDict[str, Session] = OrderedDict()  # least recently used first
+        self._last_used: dict[str, float] = {}
+        self._sizes: dict[str, int] = {}  # approximate bytes per cached session
+        self._in_use: Counter[str] = Counter()  # sessions background work holds (never evicted)
+
+    def _make_store(self, backend: str, fsync: str, compact_after: int) -> "SessionStore":
+        from nanobot.session.jsonl_store import JsonlSessionStore
+        if backend == "sqlite":
+            from nanobot.session.sqlite_store import SqliteSessionStore
+            return SqliteSessionStore(self.sessions_dir / "sessions.db", fsync=fsync)
+        if backend != "jsonl":
+            logger.warning(f"Unknown session backend {backend!r}, using jsonl")
+        return JsonlSessionStore(self.sessions_dir, fsync=fsync, compact_after=compact_after)
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -80,100 +121,77 @@ class SessionManager:
             The session.
         """
         if key in self._cache:
+            self._touch(key)
             return self._cache[key]
         
-        session = self._load(key)
+        session = self.store.load(key, self.tail_messages)
         if session is None:
             session = Session(key=key)
         
         self._cache[key] = session
+        self._sizes[key] = _estimate_size(session)
+        self._touch(key)
+        self._evict()
         return session
     
-    def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-
-        if not path.exists():
-            return None
-
+    def get_cached(self, key: str) -> Session | None:
+        """The cached session for ``key``, without loading it."""
+        return self._cache.get(key)
+
+    @contextmanager
+    def in_use(self, key: str) -> Iterator[None]:
+        """Keep a session cached while background work (e.g. consolidation) updates it."""
+        self._in_use[key] += 1
         try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path) as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
-        except Exception as e:
-            logger.warning(f"Failed to load session {key}: {e}")
-            return None
+            yield
+        finally:
+            self._in_use[key] -= 1
+            if not self._in_use[key]:
+                del self._in_use[key]
+
+    def _touch(self, key: str) -> None:
+        self._cache.move_to_end(key)
+        self._last_used[key] = time.monotonic()
+
+    def _evict(self) -> None:
+        """Drop the least recently used sessions while over budget, and idle ones."""
+        now = time.monotonic()
+        total = sum(self._sizes.get(k, 0) for k in self._cache)
+        for key in list(self._cache)[:-1]:  # never the one just used
+            if key in self._in_use:
+                continue
+            over_budget = len(self._cache) > self.max_sessions or total > self.max_cache_bytes
+            if not over_budget and now - self._last_used.get(key, now) <= self.idle_ttl:
+                break  # the rest were used more recently
+            logger.debug(f"Evicting session {key} from cache")
+            total -= self._sizes.get(key, 0)
+            self.invalidate(key)
     
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-
-        with open(path, "w") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg) + "\n")
-
+        """Save a session to the store and keep it cached."""
+        self.store.save(session)
         self._cache[session.key] = session
+        self._sizes[session.key] = _estimate_size(session)
+        self._touch(session.key)
+        self._evict()
     
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
         self._cache.pop(key, None)
+        self._last_used.pop(key, None)
+        self._sizes.pop(key, None)
+        self.store.forget(key)
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """
         List all sessions.
         
         Returns:
-            List of session info dicts.
+            List of session info dicts, most recently updated first.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path) as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            sessions.append({
-                                "key": path.stem.replace("_", ":"),
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
-                continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+        return self.store.list_sessions()
+
+
+def _estimate_size(session: Session) -> int:
+    """Rough in-memory footprint of a session's messages, in bytes."""
+    return sum(len(str(m.get("content") or "")) + 200 for m in session.messages)
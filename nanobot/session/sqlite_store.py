@@ -0,0 +1,191 @@
+"""SQLite session storage: one WAL-mode database for all sessions."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.session.base import SessionStore
+from nanobot.session.manager import Session
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    last_consolidated INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    session_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_key, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session_time ON messages (session_key, timestamp);
+"""
+
+# fsync policy -> PRAGMA synchronous (WAL mode)
+_SYNCHRONOUS = {"never": "OFF", "compact": "NORMAL", "always": "FULL"}
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Stores all sessions in one SQLite database in WAL mode.
+
+    Messages live in a table keyed by (session_key, seq) with an index on
+    timestamp; metadata, ``last_consolidated`` and the message count live in
+    a sessions table indexed by ``updated_at``, so listing never touches the
+    messages. On first use, existing JSONL session files in the same
+    directory are imported once (the files are left in place).
+    """
+
+    def __init__(self, path: Path, fsync: str = "compact"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={_SYNCHRONOUS.get(fsync, 'NORMAL')}")
+        # In-memory messages already stored: (count, last message) per session
+        self._persisted: dict[str, tuple[int, dict[str, Any] | None]] = {}
+
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            with self._lock, self._conn:
+                self._conn.executescript(_SCHEMA)
+            self._migrate_jsonl(path.parent)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def load(self, key: str, tail_messages: int) -> Session | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, metadata, last_consolidated, message_count FROM sessions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            created_at, metadata, last_consolidated, count = row
+            # Keep everything consolidation has not processed yet
+            offset = max(0, min(count - tail_messages, last_consolidated))
+            messages = [
+                json.loads(data)
+                for (data,) in self._conn.execute(
+                    "SELECT data FROM messages WHERE session_key = ? AND seq >= ? ORDER BY seq",
+                    (key, offset),
+                )
+            ]
+            self._persisted[key] = (len(messages), messages[-1] if messages else None)
+
+        return Session(
+            key=key,
+            messages=messages,
+            created_at=datetime.fromisoformat(created_at),
+            metadata=json.loads(metadata),
+            last_consolidated=last_consolidated - offset,
+            offset=offset,
+        )
+
+    def save(self, session: Session) -> None:
+        key = session.key
+        with self._lock, self._conn:
+            count, last = self._persisted.get(key, (0, None))
+            extends = key in self._persisted and count <= len(session.messages) and (
+                count == 0 or session.messages[count - 1] is last
+            )
+            if not extends:
+                # Cleared or unknown state: replace everything from the loaded window on
+                self._conn.execute(
+                    "DELETE FROM messages WHERE session_key = ? AND seq >= ?", (key, session.offset)
+                )
+                count = 0
+            self._conn.executemany(
+                "INSERT INTO messages (session_key, seq, timestamp, data) VALUES (?, ?, ?, ?)",
+                [
+                    (key, session.offset + i, m.get("timestamp"), json.dumps(m))
+                    for i, m in enumerate(session.messages[count:], start=count)
+                ],
+            )
+            self._upsert_session(session)
+            self._persisted[key] = (
+                len(session.messages), session.messages[-1] if session.messages else None
+            )
+
+    def _upsert_session(self, session: Session) -> None:
+        record = self.metadata_record(session)
+        self._conn.execute(
+            """
+            INSERT INTO sessions (key, created_at, updated_at, metadata, last_consolidated, message_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                metadata = excluded.metadata,
+                last_consolidated = excluded.last_consolidated,
+                message_count = excluded.message_count
+            """,
+            (
+                session.key, record["created_at"], record["updated_at"], json.dumps(record["metadata"]),
+                record["last_consolidated"], record["message_count"],
+            ),
+        )
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, created_at, updated_at FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created_at, "updated_at": updated_at, "path": str(self.path)}
+            for key, created_at, updated_at in rows
+        ]
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._persisted.pop(key, None)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _migrate_jsonl(self, sessions_dir: Path) -> None:
+        """Import existing JSONL session files (one-shot, on database creation)."""
+        from nanobot.session.jsonl_store import JsonlSessionStore
+
+        files = sorted(sessions_dir.glob("*.jsonl"))
+        if not files:
+            return
+        jsonl = JsonlSessionStore(sessions_dir)
+        migrated = 0
+        for path in files:
+            try:
+                metadata, messages, _, _ = jsonl._load_full(path.stem, path)
+            except Exception as e:
+                logger.warning(f"Skipping session file {path.name} during migration: {e}")
+                continue
+            # Older files only have the key in their (lossy) file name
+            key = metadata.get("key") or path.stem.replace("_", ":")
+            now = datetime.now().isoformat()
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM messages WHERE session_key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO messages (session_key, seq, timestamp, data) VALUES (?, ?, ?, ?)",
+                    [(key, i, m.get("timestamp"), json.dumps(m)) for i, m in enumerate(messages)],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        key, metadata.get("created_at") or now, metadata.get("updated_at") or now,
+                        json.dumps(metadata.get("metadata", {})),
+                        min(metadata.get("last_consolidated", 0), len(messages)), len(messages),
+                    ),
+                )
+            migrated += 1
+        logger.info(f"Migrated {migrated} JSONL sessions into {self.path.name}")
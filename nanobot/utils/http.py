@@ -0,0 +1,282 @@
+"""Process-wide pooled HTTP client shared by tools and providers."""
+
+import asyncio
+import importlib.util
+import ipaddress
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterable
+
+import httpcore
+import httpx
+from httpx._utils import get_environment_proxies  # the trust_env rules, incl. NO_PROXY
+from loguru import logger
+
+MAX_REDIRECTS = 5  # Limit redirects for callers that follow them (e.g. web_fetch)
+
+
+@dataclass
+class HostStats:
+    """Requests and new connections for one host; the difference is connection reuse."""
+    requests: int = 0
+    connections: int = 0
+    dns_lookups: int = 0
+    dns_cache_hits: int = 0
+
+    @property
+    def reuse_rate(self) -> float:
+        return 1 - self.connections / self.requests if self.requests else 0.0
+
+
+class _DnsCachingBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that caches DNS answers and counts new connections per host."""
+
+    def __init__(self, ttl: float, stats: Callable[[str], HostStats]):
+        self._backend = httpcore.AnyIOBackend()
+        self._ttl = ttl
+        self._stats = stats
+        self._cache: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self._lookups: dict[tuple[str, int], asyncio.Future[list[str]]] = {}  # in flight
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Iterable[Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        stats = self._stats(host)
+        stats.connections += 1
+        addresses = await self._resolve(host, port, stats)
+        for i, address in enumerate(addresses):
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                if i == len(addresses) - 1:
+                    self._cache.pop((host, port), None)  # maybe stale; resolve again next time
+                    raise
+        raise httpcore.ConnectError(f"no addresses for {host}")
+
+    async def _resolve(self, host: str, port: int, stats: HostStats) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        cached = self._cache.get((host, port))
+        if cached and cached[0] > time.monotonic():
+            stats.dns_cache_hits += 1
+            return cached[1]
+        if lookup := self._lookups.get((host, port)):
+            stats.dns_cache_hits += 1  # another connection is resolving the same name
+            return await asyncio.shield(lookup)
+        stats.dns_lookups += 1
+        lookup = asyncio.ensure_future(self._lookup(host, port))
+        self._lookups[(host, port)] = lookup
+        return await asyncio.shield(lookup)  # a cancelled caller must not cancel the shared lookup
+
+    async def _lookup(self, host: str, port: int) -> list[str]:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(str(e)) from e
+        finally:
+            self._lookups.pop((host, port), None)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[(host, port)] = (time.monotonic() + self._ttl, addresses)
+        return addresses
+
+    async def connect_unix_socket(self, *args: Any, **kwargs: Any) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(*args, **kwargs)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees its host slot once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release()
+                self._release = None
+
+
+class _HostLimitTransport(httpx.AsyncBaseTransport):
+    """Caps in-flight requests per host on top of the shared connection pool."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int, stats: Callable[[str], HostStats]):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._stats = stats
+        self._slots: dict[str, tuple[asyncio.Semaphore, int]] = {}  # host -> (semaphore, users)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self._stats(host).requests += 1
+        if self._max_per_host <= 0:
+            return await self._transport.handle_async_request(request)
+        semaphore = self._enter(host)
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            self._leave(host)
+            raise
+
+        def release() -> None:
+            semaphore.release()
+            self._leave(host)
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def _enter(self, host: str) -> asyncio.Semaphore:
+        semaphore, users = self._slots.get(host) or (asyncio.Semaphore(self._max_per_host), 0)
+        self._slots[host] = (semaphore, users + 1)
+        return semaphore
+
+    def _leave(self, host: str) -> None:
+        semaphore, users = self._slots[host]
+        if users <= 1:
+            del self._slots[host]
+        else:
+            self._slots[host] = (semaphore, users - 1)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class SharedHttp:
+    """
+    One pooled ``httpx.AsyncClient`` per process (and event loop) for tools and providers.
+
+    Connections are kept alive and reused across calls. HTTP/2 is used when
+    the ``h2`` package is installed. DNS answers are cached for ``dns_ttl``
+    seconds. ``max_per_host`` caps concurrent requests to one host. Borrowers
+    must not close the client; the owner (gateway / CLI) calls ``aclose``
+    on shutdown.
+    """
+
+    def __init__(
+        self,
+        proxy: str | None = None,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        dns_ttl: float = 300.0,
+    ):
+        self.configure(proxy, http2, max_connections, max_per_host, keepalive_expiry, dns_ttl)
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats: dict[str, HostStats] = {}
+
+    def configure(
+        self,
+        proxy: str | None = None,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        dns_ttl: float = 300.0,
+    ) -> None:
+        """Set the client options; applies to clients created after this call."""
+        self.proxy = proxy or None
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.dns_ttl = dns_ttl
+
+    def client(self) -> httpx.AsyncClient:
+        """The shared client for the running event loop (created on first use)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            # A client is bound to the loop it was created in
+            self._client, self._loop = self._create(), loop
+        return self._client
+
+    def _create(self) -> httpx.AsyncClient:
+        # An explicit transport makes httpx ignore HTTP(S)_PROXY / ALL_PROXY / NO_PROXY, so without a
+        # configured proxy the environment's proxies are mounted per URL pattern, as httpx would
+        transports: dict[str | None, httpx.AsyncBaseTransport] = {}
+
+        def transport_for(proxy: str | None) -> httpx.AsyncBaseTransport:
+            if proxy not in transports:
+                transports[proxy] = self._transport(proxy)
+            return transports[proxy]
+
+        default = transport_for(self.proxy)
+        env = {} if self.proxy else get_environment_proxies()
+        mounts = {pattern: transport_for(url) if url else None for pattern, url in env.items()}  # None = direct
+        proxy = self.proxy or ", ".join(f"{k}={v or 'direct'}" for k, v in env.items()) or "none"
+        logger.debug(f"HTTP client pool created (http2={self.http2}, proxy={proxy})")
+        return httpx.AsyncClient(transport=default, mounts=mounts, max_redirects=MAX_REDIRECTS, timeout=30.0)
+
+    def _transport(self, proxy: str | None) -> httpx.AsyncBaseTransport:
+        transport = httpx.AsyncHTTPTransport(
+            http2=self.http2,
+            proxy=proxy,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        # httpx has no public hook for the resolver; swap the pool's network backend
+        transport._pool._network_backend = _DnsCachingBackend(self.dns_ttl, self.host_stats)
+        return _HostLimitTransport(transport, self.max_per_host, self.host_stats)
+
+    def host_stats(self, host: str) -> HostStats:
+        return self._stats.setdefault(host, HostStats())
+
+    @property
+    def stats(self) -> dict[str, HostStats]:
+        """Request, connection and DNS counters per host."""
+        return dict(self._stats)
+
+    async def aclose(self) -> None:
+        """Close the pooled connections (the next ``client()`` call starts a new pool)."""
+        client, self._client = self._client, None
+        if client is not None and self._loop is asyncio.get_running_loop():
+            await client.aclose()
+        total = HostStats()
+        for s in self._stats.values():
+            total.requests += s.requests
+            total.connections += s.connections
+        if total.requests:
+            logger.info(
+                f"HTTP pool: {total.requests} requests over {total.connections} connections "
+                f"({total.reuse_rate:.0%} reused)"
+            )
+
+
+_shared = SharedHttp()
+
+
+def shared_http() -> SharedHttp:
+    """The process-wide HTTP client registry."""
+    return _shared
+
+
+def http_client() -> httpx.AsyncClient:
+    """Borrow the process-wide pooled HTTP client (do not close it)."""
+    return _shared.client()
@@ -0,0 +1,116 @@
+"""HTML to markdown / plain text conversion and page extraction.
+
+Everything here is a pure module-level function so it can run in the
+extraction worker processes (see ``nanobot.utils.workers``).
+"""
+
+import html
+import json
+import re
+
+_ATTRS = r"""[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*"""  # quoted attribute values may contain '>'
+# One tokenizer pass over the markup. It stops only at what shapes the output: dropped elements
+# (script, style, ...) with their content, comments, and the structural tags below. Text and
+# inline tags (span, b, ...) between matches are copied through; the inline tags are removed
+# from the result in one substitution.
+_TAG = re.compile(
+    r"<(?:(?:script|style|noscript|template)\b[^>]*>.*?</(?:script|style|noscript|template)\s*>"
+    r"|!--.*?(?:-->|$)"
+    r"|(/?)(a|li|h[1-6]|p|div|section|article|ul|ol|br|hr|tr|table|blockquote|pre)(?=[\s/>])(" + _ATTRS + r")>)",
+    re.S | re.I,
+)
+_INLINE = re.compile(r"<(?:/?[a-zA-Z][\w:-]*" + _ATTRS + r"|[!?][^>]*)>")
+_HREF = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.I)
+_BLOCKS = frozenset({"p", "div", "section", "article", "ul", "ol"})
+_TEXT_BLOCKS = _BLOCKS | {"li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "table"}
+_BREAKS = frozenset({"br", "hr"})
+_FRAMES = frozenset({"a", "li", "h1", "h2", "h3", "h4", "h5", "h6"})  # content becomes plain text
+
+
+def normalize(text: str) -> str:
+    """Collapse runs of spaces and blank lines."""
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _convert(raw_html: str, markdown: bool) -> str:
+    out: list[str] = []
+    frames: list[tuple[str, int, str]] = []  # open a / li / h*: (tag, position in out, href)
+    blocks = _BLOCKS if markdown else _TEXT_BLOCKS
+    block_end = "\n\n" if markdown else "\n"
+
+    def close(tag: str, start: int, href: str) -> None:
+        inner = _INLINE.sub("", "".join(out[start:])).strip()
+        del out[start:]
+        if tag == "a":
+            out.append(f"[{inner}]({href})")
+        elif tag == "li":
+            out.append(f"\n- {inner}")
+        else:
+            out.append(f"\n{'#' * int(tag[1])} {inner}\n")
+
+    pos = 0
+    for m in _TAG.finditer(raw_html):
+        start = m.start()
+        if start > pos:
+            out.append(raw_html[pos:start])
+        pos = m.end()
+        end, tag, attrs = m.groups()
+        if tag is None:
+            continue  # dropped element, comment
+        tag = tag.lower()
+        if not end:
+            if tag in _BREAKS:
+                out.append("\n")
+            elif markdown and tag in _FRAMES:
+                href = ""
+                if tag == "a":
+                    h = _HREF.search(attrs)
+                    if h is None:
+                        continue  # anchors without href are plain text
+                    href = h.group(1) or h.group(2) or h.group(3) or ""
+                elif tag == "li" and frames and frames[-1][0] == "li":
+                    close(*frames.pop())  # </li> is optional
+                frames.append((tag, len(out), href))
+        elif tag in blocks:
+            out.append(block_end)
+        elif markdown and tag in _FRAMES and any(f[0] == tag for f in reversed(frames)):
+            # Close the element, and any left open inside it
+            while frames:
+                open_tag, start, href = frames.pop()
+                close(open_tag, start, href)
+                if open_tag == tag:
+                    break
+    if pos < len(raw_html):
+        out.append(raw_html[pos:])
+    while frames:
+        close(*frames.pop())
+    # Entities are decoded once, after the markup is gone
+    return normalize(html.unescape(_INLINE.sub("", "".join(out))))
+
+
+def html_to_markdown(raw_html: str) -> str:
+    """Convert HTML to markdown (links, headings, list items, paragraphs) in one pass."""
+    return _convert(raw_html, markdown=True)
+
+
+def html_to_text(raw_html: str) -> str:
+    """Convert HTML to plain text, with a line break after each block element."""
+    return _convert(raw_html, markdown=False)
+
+
+def extract_page(body: str, content_type: str, mode: str, truncated: bool = False) -> tuple[str, str]:
+    """Extract (text, extractor) from a fetched page; ``mode`` is "markdown" or "text"."""
+    # JSON (a truncated document is returned as is)
+    if "application/json" in content_type and not truncated:
+        return json.dumps(json.loads(body), indent=2), "json"
+    # HTML
+    if "text/html" in content_type or body[:256].lower().startswith(("<!doctype", "<html")):
+        from readability import Document
+
+        doc = Document(body)
+        summary = doc.summary()
+        content = html_to_markdown(summary) if mode == "markdown" else html_to_text(summary)
+        title = doc.title()
+        return (f"# {title}\n\n{content}" if title else content), "readability"
+    return body, "raw"
@@ -0,0 +1,113 @@
+"""Bounded process pool for CPU-heavy work (HTML parsing) off the event loop."""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+INLINE_LIMIT = 16 * 1024  # inputs smaller than this are cheaper to convert in-process than to ship
+
+
+class ExtractionPool:
+    """
+    A small process pool with per-call timeouts.
+
+    Work that overruns its timeout cannot be cancelled inside a worker, so
+    the whole pool is terminated and replaced on the next call. With
+    ``workers=0`` calls run in a thread instead (the loop stays free, but
+    there is no hard timeout).
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = 20.0, max_tasks_per_child: int = 200):
+        self.configure(workers, timeout, max_tasks_per_child)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def configure(self, workers: int = 2, timeout: float = 20.0, max_tasks_per_child: int = 200) -> None:
+        """Set the pool options; applies to pools started after this call."""
+        self.workers = workers
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child  # recycle workers (lxml leaks on odd pages)
+
+    def _submit(self, fn: Callable[..., T], *args: Any) -> tuple[ProcessPoolExecutor, Future]:
+        with self._lock:
+            if self._executor is None:
+                # Never fork: the parent has threads (SQLite, HTTP, logging) that a fork would copy mid-flight
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+                logger.debug(f"Extraction pool started ({self.workers} workers, {method})")
+            executor = self._executor
+        try:
+            return executor, executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: float | None = None) -> T:
+        """Run ``fn(*args)`` in a worker process; raises TimeoutError after ``timeout`` seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        if self.workers <= 0:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout)
+        executor, future = self._submit(fn, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._kill(executor, fn, timeout)
+            raise TimeoutError(f"{fn.__name__} timed out after {timeout}s") from None
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def run_sync(self, fn: Callable[..., T], *args: Any, timeout: float | None = None) -> T:
+        """Blocking variant of ``run`` for code that already runs in a thread."""
+        timeout = self.timeout if timeout is None else timeout
+        if self.workers <= 0:
+            return fn(*args)
+        executor, future = self._submit(fn, *args)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self._kill(executor, fn, timeout)
+            raise TimeoutError(f"{fn.__name__} timed out after {timeout}s") from None
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def _kill(self, executor: ProcessPoolExecutor, fn: Callable[..., Any], timeout: float) -> None:
+        logger.warning(f"{fn.__name__} exceeded {timeout}s; restarting extraction workers")
+        # ProcessPoolExecutor has no API to stop a running task
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        self._discard(executor)
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (the next call starts a new pool)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool = ExtractionPool()
+
+
+def extraction_pool() -> ExtractionPool:
+    """The process-wide extraction pool."""
+    return _pool
@@ -0,0 +1,60 @@
+"""Micro-benchmark: single-pass HTML-to-markdown converter vs the former chain of re.sub passes.
+
+Run with ``python tests/bench_markdown.py [sections]``; not collected by pytest.
+"""
+
+import html
+import re
+import sys
+import timeit
+
+from nanobot.utils.markup import html_to_markdown
+
+
+def _strip_tags(text: str) -> str:
+    text = re.sub(r'<script[\s\S]*?</script>', '', text, flags=re.I)
+    text = re.sub(r'<style[\s\S]*?</style>', '', text, flags=re.I)
+    text = re.sub(r'<[^>]+>', '', text)
+    return html.unescape(text).strip()
+
+
+def legacy_to_markdown(raw_html: str) -> str:
+    """The converter web_fetch used before (kept here as the baseline)."""
+    text = re.sub(r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>([\s\S]*?)</a>',
+                  lambda m: f'[{_strip_tags(m[2])}]({m[1]})', raw_html, flags=re.I)
+    text = re.sub(r'<h([1-6])[^>]*>([\s\S]*?)</h\1>',
+                  lambda m: f'\n{"#" * int(m[1])} {_strip_tags(m[2])}\n', text, flags=re.I)
+    text = re.sub(r'<li[^>]*>([\s\S]*?)</li>', lambda m: f'\n- {_strip_tags(m[1])}', text, flags=re.I)
+    text = re.sub(r'</(p|div|section|article)>', '\n\n', text, flags=re.I)
+    text = re.sub(r'<(br|hr)\s*/?>', '\n', text, flags=re.I)
+    text = re.sub(r'[ \t]+', ' ', _strip_tags(text))
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+SECTION = """<section><h2 id="s{i}">Section {i} &amp; notes</h2>
+<p>Paragraph with <a href="https://example.com/{i}?a=1&amp;b=2" class="link">a link</a>, <b>bold</b>
+and <code>code</code> text that goes on for a while to look like a real article body.</p>
+<ul><li>First item</li><li>Second item with <a href='/rel/{i}'>another link</a></li><li>Third</li></ul>
+<script>window.track({i});</script><p>Closing words<br>on two lines.</p></section>
+"""
+
+
+def _run(label: str, page: str, runs: int = 5) -> None:
+    print(f"{label}: {len(page) / 1024:.0f} KiB")
+    for name, fn in (("legacy re.sub chain", legacy_to_markdown), ("single-pass tokenizer", html_to_markdown)):
+        best = min(timeit.repeat(lambda: fn(page), number=1, repeat=runs))
+        print(f"  {name:>22}: {best * 1000:8.1f} ms (best of {runs})")
+
+
+def main() -> None:
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    article = "<html><body><article>" + "".join(SECTION.format(i=i) for i in range(sections)) + "</article></body></html>"
+    _run(f"well-formed article, {sections} sections", article)
+    # </li> is optional in HTML; the lazy '<li>...</li>' pattern rescans to the end for every item
+    items = sections // 2
+    unclosed = "<ul>" + "".join(f"<li>item {i} <a href='/x/{i}'>link</a>" for i in range(items)) + "</ul>"
+    _run(f"list with {items} unclosed <li>", unclosed, runs=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Test per-session turn scheduling in AgentLoop."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.tools.message import MessageTool
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.session.manager import SessionManager
+
+
+def _make_loop(tmp_path: Path, max_concurrent_turns: int = 4) -> AgentLoop:
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    return AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        max_concurrent_turns=max_concurrent_turns,
+        session_manager=SessionManager(tmp_path),
+    )
+
+
+def _msg(chat_id: str, content: str) -> InboundMessage:
+    return InboundMessage(channel="test", sender_id="u", chat_id=chat_id, content=content)
+
+
+async def _wait_idle(loop: AgentLoop) -> None:
+    while loop._session_workers:
+        await asyncio.sleep(0.01)
+
+
+async def test_turns_are_fifo_within_session(tmp_path) -> None:
+    loop = _make_loop(tmp_path)
+    order: list[str] = []
+
+    async def fake_process(msg, **kwargs):
+        await asyncio.sleep(0.02 if msg.content == "first" else 0)
+        order.append(msg.content)
+        return None
+
+    loop._process_message = fake_process
+    for content in ("first", "second", "third"):
+        loop._schedule_turn(_msg("a", content))
+    await _wait_idle(loop)
+
+    assert order == ["first", "second", "third"]
+
+
+async def test_sessions_run_concurrently_up_to_limit(tmp_path) -> None:
+    loop = _make_loop(tmp_path, max_concurrent_turns=2)
+    active = 0
+    peak = 0
+
+    async def fake_process(msg, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return None
+
+    loop._process_message = fake_process
+    for chat_id in ("a", "b", "c", "d"):
+        loop._schedule_turn(_msg(chat_id, "hi"))
+    await _wait_idle(loop)
+
+    assert peak == 2
+
+
+async def test_tool_context_is_isolated_per_turn(tmp_path) -> None:
+    loop = _make_loop(tmp_path)
+    sent: list[OutboundMessage] = []
+
+    async def capture(msg: OutboundMessage) -> None:
+        sent.append(msg)
+
+    tool = loop.tools.get("message")
+    assert isinstance(tool, MessageTool)
+    tool.set_send_callback(capture)
+
+    async def fake_process(msg, **kwargs):
+        loop._set_tool_context(msg.channel, msg.chat_id)
+        await asyncio.sleep(0.01)
+        await tool.execute(content=msg.content)
+        return None
+
+    loop._process_message = fake_process
+    loop._schedule_turn(_msg("a", "to-a"))
+    loop._schedule_turn(_msg("b", "to-b"))
+    await _wait_idle(loop)
+
+    assert {(m.chat_id, m.content) for m in sent} == {("a", "to-a"), ("b", "to-b")}
@@ -0,0 +1,92 @@
+"""Test bounded inbound/outbound queues and overflow policies on MessageBus."""
+
+import asyncio
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.cli.commands import _make_bus
+from nanobot.config.schema import Config
+
+
+def _msg(chat_id: str, content: str, channel: str = "slack") -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id="u", chat_id=chat_id, content=content)
+
+
+async def _drain(bus: MessageBus) -> list[str]:
+    """Consume and start every pending message, returning the contents processed."""
+    processed = []
+    while bus.inbound.qsize():
+        msg = await bus.consume_inbound()
+        if bus.inbound_started(msg):
+            processed.append(msg.content)
+    return processed
+
+
+async def test_drop_oldest_keeps_newest_messages() -> None:
+    bus = MessageBus(max_per_session=2, overflow="drop_oldest")
+    for i in range(4):
+        assert await bus.publish_inbound(_msg("c1", f"m{i}"))
+    assert bus.inbound_size == 2
+    assert await _drain(bus) == ["m2", "m3"]
+    assert bus.inbound_stats.dropped == 2
+    assert bus.inbound_size == 0
+
+
+async def test_merge_folds_overflow_into_pending_message() -> None:
+    bus = MessageBus(max_per_session=1, overflow="merge")
+    assert await bus.publish_inbound(_msg("c1", "first"))
+    assert not await bus.publish_inbound(_msg("c1", "second"))
+    assert await _drain(bus) == ["first\nsecond"]
+
+
+async def test_default_config_never_drops_messages_silently() -> None:
+    bus = _make_bus(Config())
+    burst = [f"m{i}" for i in range(bus.max_per_session + 5)]
+    for content in burst:
+        await bus.publish_inbound(_msg("c1", content))
+    assert bus.inbound_stats.dropped == 0
+    assert "\n".join(await _drain(bus)) == "\n".join(burst)
+
+
+async def test_reject_sends_one_busy_reply_per_backlog() -> None:
+    bus = MessageBus(max_per_channel=1, overflow="reject", busy_message="busy")
+    assert await bus.publish_inbound(_msg("c1", "a"))
+    assert not await bus.publish_inbound(_msg("c2", "b"))
+    assert not await bus.publish_inbound(_msg("c2", "c"))
+    assert bus.outbound_size == 1
+    reply = await bus.consume_outbound()
+    assert (reply.chat_id, reply.content) == ("c2", "busy")
+    assert reply.queue_wait is not None
+
+
+async def test_global_limit_applies_backpressure() -> None:
+    bus = MessageBus(max_inbound=1)
+    await bus.publish_inbound(_msg("c1", "a"))
+    blocked = asyncio.create_task(bus.publish_inbound(_msg("c2", "b")))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    msg = await bus.consume_inbound()
+    assert bus.inbound_started(msg)
+    assert msg.queue_wait is not None and msg.queue_wait >= 0
+    assert await asyncio.wait_for(blocked, 1.0)
+
+
+async def test_system_messages_are_never_shed() -> None:
+    bus = MessageBus(max_per_channel=1, overflow="reject")
+    for i in range(3):
+        assert await bus.publish_inbound(_msg("cli:direct", f"s{i}", channel="system"))
+    assert await _drain(bus) == ["s0", "s1", "s2"]
+    assert bus.outbound_size == 0
+
+
+async def test_outbound_queue_is_bounded() -> None:
+    bus = MessageBus(max_outbound=1)
+    await bus.publish_outbound(OutboundMessage(channel="slack", chat_id="c1", content="a"))
+    blocked = asyncio.create_task(
+        bus.publish_outbound(OutboundMessage(channel="slack", chat_id="c1", content="b"))
+    )
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+    assert (await bus.consume_outbound()).content == "a"
+    await asyncio.wait_for(blocked, 1.0)
@@ -0,0 +1,84 @@
+"""Test merging bursts of inbound messages per chat in BaseChannel."""
+
+import asyncio
+from types import SimpleNamespace
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.config.schema import Config
+
+
+class BurstyChannel(BaseChannel):
+    name = "fake"
+
+    def __init__(self, window: float, max_hold: float = 0.0):
+        super().__init__(config=SimpleNamespace(allow_from=[]), bus=MessageBus())
+        self.coalesce_window = window
+        self.coalesce_max = max_hold
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        pass
+
+
+def _published(channel: BaseChannel) -> list:
+    queue = channel.bus.inbound
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+async def test_burst_is_merged_into_one_message() -> None:
+    channel = BurstyChannel(window=0.05)
+    await channel._handle_message("u1", "c1", "hey", media=["/tmp/a.png"])
+    await channel._handle_message("u1", "c1", "quick question")
+    await channel._handle_message("u1", "c2", "other chat")
+    await channel._handle_message("u1", "c1", "", media=["/tmp/b.png"])
+    assert _published(channel) == []
+
+    await asyncio.sleep(0.1)
+    merged, other = sorted(_published(channel), key=lambda m: m.chat_id)
+    assert merged.content == "hey\nquick question"
+    assert merged.media == ["/tmp/a.png", "/tmp/b.png"]
+    assert merged.metadata["coalesced_count"] == 3
+    assert other.content == "other chat"
+
+
+async def test_commands_and_sender_changes_flush_first() -> None:
+    channel = BurstyChannel(window=10)
+    await channel._handle_message("u1", "g1", "first")
+    await channel._handle_message("u2", "g1", "second")
+    await channel._handle_message("u2", "g1", "/new")
+    assert [(m.sender_id, m.content) for m in _published(channel)] == [
+        ("u1", "first"), ("u2", "second"), ("u2", "/new"),
+    ]
+
+
+async def test_max_hold_bounds_the_delay() -> None:
+    channel = BurstyChannel(window=0.05, max_hold=0.08)
+    for i in range(6):
+        await channel._handle_message("u1", "c1", f"m{i}")
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.1)
+    published = _published(channel)
+    assert len(published) >= 2
+    assert "\n".join(m.content for m in published) == "\n".join(f"m{i}" for i in range(6))
+
+
+def test_coalescing_is_opt_in() -> None:
+    config = Config()
+    manager = ChannelManager(config, MessageBus())
+    channel = BurstyChannel(window=0)
+    manager._configure_coalescing("telegram", channel)
+    assert channel.coalesce_window == 0
+
+    config.channels.coalesce_ms = 1000
+    manager._configure_coalescing("telegram", channel)
+    assert channel.coalesce_window == 1.0
+    manager._configure_coalescing("mochat", channel)  # buffers bursts itself
+    assert channel.coalesce_window == 0
@@ -0,0 +1,150 @@
+"""Test single-flight, batched memory consolidation."""
+
+import asyncio
+import fcntl
+from unittest.mock import MagicMock
+
+import pytest
+
+from nanobot.agent.consolidation import ConsolidationScheduler
+from nanobot.agent.loop import AgentLoop
+from nanobot.agent.memory import MemoryStore
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.base import LLMResponse
+from nanobot.session.manager import Session, SessionManager
+
+
+async def _wait_idle(scheduler: ConsolidationScheduler) -> None:
+    while scheduler._workers:
+        await asyncio.sleep(0.01)
+
+
+async def test_requests_coalesce_while_job_runs() -> None:
+    scheduler = ConsolidationScheduler()
+    runs = 0
+
+    async def job() -> None:
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.02)
+
+    for _ in range(5):
+        scheduler.request("s", job)
+    await asyncio.sleep(0.005)
+    for _ in range(5):
+        scheduler.request("s", job)
+    await _wait_idle(scheduler)
+
+    assert runs == 2
+
+
+async def test_global_cap_and_non_coalescing_jobs() -> None:
+    scheduler = ConsolidationScheduler(max_concurrent=1)
+    active = peak = runs = 0
+
+    async def job() -> None:
+        nonlocal active, peak, runs
+        active += 1
+        runs += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+
+    scheduler.request("a", job)
+    scheduler.request("b", job)
+    scheduler.request("b", job, coalesce=False)
+    scheduler.request("b", job, coalesce=False)
+    await _wait_idle(scheduler)
+
+    assert peak == 1
+    assert runs == 4
+
+
+def _make_loop(tmp_path, provider) -> AgentLoop:
+    provider.get_default_model.return_value = "big-model"
+    return AgentLoop(
+        bus=MessageBus(),
+        provider=provider,
+        workspace=tmp_path,
+        memory_window=4,
+        consolidation_model="small-model",
+        session_manager=SessionManager(tmp_path, sessions_dir=tmp_path),
+    )
+
+
+async def test_consolidation_uses_its_model_and_retries_on_concurrent_edit(tmp_path) -> None:
+    provider = MagicMock()
+    loop = _make_loop(tmp_path, provider)
+    memory = loop.context.memory
+    calls: list[str] = []
+
+    async def chat(messages, model=None, **kwargs):
+        calls.append(model)
+        if len(calls) == 1:
+            memory.write_long_term("edited by the agent")  # lands while the LLM is busy
+        return LLMResponse(content='{"history_entry": "[2026-01-01 00:00] chat", "memory_update": "merged"}')
+
+    provider.chat = chat
+    session = Session(key="test:1")
+    for i in range(6):
+        session.add_message("user", f"msg{i}")
+
+    await loop._consolidate_memory(session)
+
+    assert calls == ["small-model", "small-model"]
+    assert memory.read_long_term() == "merged"
+    assert memory.history_file.read_text(encoding="utf-8").count("chat") == 1
+    assert session.last_consolidated == 4
+
+
+async def test_messages_added_during_consolidation_are_kept_for_later(tmp_path) -> None:
+    provider = MagicMock()
+    loop = _make_loop(tmp_path, provider)
+    session = Session(key="test:2")
+    for i in range(6):
+        session.add_message("user", f"msg{i}")
+
+    async def chat(messages, model=None, **kwargs):
+        for i in range(6, 9):
+            session.add_message("user", f"msg{i}")  # the next turns land while the LLM is busy
+        return LLMResponse(content='{"history_entry": "[2026-01-01 00:00] chat", "memory_update": "m"}')
+
+    provider.chat = chat
+    await loop._consolidate_memory(session)
+
+    assert session.last_consolidated == 4  # msg0-msg3 were summarized; msg4-msg8 were not
+    # Persisted right away, not only by the next turn's save
+    assert SessionManager(tmp_path, sessions_dir=tmp_path).get_or_create("test:2").last_consolidated == 4
+
+
+async def test_session_stays_cached_while_consolidating(tmp_path) -> None:
+    provider = MagicMock()
+    loop = _make_loop(tmp_path, provider)
+    loop.sessions.max_sessions = 1
+    session = loop.sessions.get_or_create("test:3")
+    for i in range(6):
+        session.add_message("user", f"msg{i}")
+    loop.sessions.save(session)
+
+    async def chat(messages, model=None, **kwargs):
+        loop.sessions.get_or_create("test:other")  # another chat pushes the cache over its limit
+        assert loop.sessions.get_or_create("test:3") is session
+        return LLMResponse(content='{"history_entry": "[2026-01-01 00:00] chat", "memory_update": "m"}')
+
+    provider.chat = chat
+    await loop._consolidate_if_due("test:3")
+
+    assert session.last_consolidated == 4
+    loop.sessions.get_or_create("test:other")
+    assert loop.sessions.get_cached("test:3") is None  # evictable again once done
+
+
+def test_memory_lock_excludes_other_processes(tmp_path) -> None:
+    memory = MemoryStore(tmp_path)
+    with memory.locked():
+        # flock is per open file, so a second open stands in for another process
+        with open(memory.memory_dir / ".memory.lock", "a") as other:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    with open(memory.memory_dir / ".memory.lock", "a") as other:
+        fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -0,0 +1,50 @@
+"""Test token-budgeted history assembly in ContextBuilder."""
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.providers.tokens import TokenCounter
+
+
+def _history(n: int, size: int = 400) -> list[dict]:
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"{i} " + "x" * size}
+        for i in range(n)
+    ]
+
+
+def test_counter_uses_registry_context_window() -> None:
+    assert TokenCounter("anthropic/claude-opus-4-5").context_window == 200_000
+    assert TokenCounter("some-unknown-model").context_window == 128_000
+    assert TokenCounter("anthropic/claude-opus-4-5", context_window=8000).context_window == 8000
+
+
+def test_history_filled_newest_first_within_budget(tmp_path) -> None:
+    tokens = TokenCounter("anthropic/claude-opus-4-5")
+    builder = ContextBuilder(tmp_path, tokens=tokens, max_history_tokens=1000)
+    history = _history(20)
+
+    messages = builder.build_messages(history=history, current_message="hi")
+    kept = messages[1:-1]
+
+    assert 0 < len(kept) < len(history)
+    assert kept[-1] is history[-1]
+    assert kept[0]["role"] == "user"
+    assert tokens.count_messages(kept) <= 1000
+
+
+def test_reserved_tokens_shrink_history(tmp_path) -> None:
+    tokens = TokenCounter("anthropic/claude-opus-4-5", context_window=20_000)
+    builder = ContextBuilder(tmp_path, tokens=tokens)
+    history = _history(200)
+
+    roomy = builder.build_messages(history=history, current_message="hi")
+    tight = builder.build_messages(history=history, current_message="hi", reserved_tokens=15_000)
+
+    assert len(tight) < len(roomy)
+    assert tokens.count_messages(tight) <= 5_000
+
+
+def test_without_counter_history_is_untouched(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    history = _history(10)
+    messages = builder.build_messages(history=history, current_message="hi")
+    assert messages[1:-1] == history
@@ -94,6 +94,22 @@ def test_extract_text_body_falls_back_to_html() -> None:
     assert "world" in text
 
 
+def test_html_body_survives_extraction_pool_failure(monkeypatch) -> None:
+    class StuckPool:
+        def run_sync(self, fn, *args, timeout=None):
+            raise TimeoutError("html_to_text timed out after 20s")
+
+    monkeypatch.setattr("nanobot.channels.email.extraction_pool", lambda: StuckPool())
+    msg = EmailMessage()
+    msg["From"] = "alice@example.com"
+    msg["To"] = "bot@example.com"
+    msg["Subject"] = "Newsletter"
+    msg.add_alternative("<p>Big &amp; news</p>" + "<div>filler</div>" * 2000, subtype="html")
+
+    text = EmailChannel._extract_text_body(msg)
+    assert text.startswith("Big & news")
+
+
 @pytest.mark.asyncio
 async def test_start_returns_immediately_without_consent(monkeypatch) -> None:
     cfg = _make_config()
@@ -0,0 +1,58 @@
+"""Test the single-pass HTML converter and the extraction worker pool."""
+
+import os
+import time
+
+import pytest
+
+from nanobot.utils.markup import extract_page, html_to_markdown, html_to_text
+from nanobot.utils.workers import ExtractionPool
+
+ARTICLE = "<html><body><article>" + "<p>Install with pip, then read <a href='/docs'>the docs</a>. " * 20 + "</article></body></html>"
+PAGE = """<div><h2 class="x">Install &amp; run</h2>
+<p>Use <a href="https://a.b/?x=1&amp;y=2" title='a>b'>the <b>docs</b></a> now.</p>
+<script>var a = "<p>not content</p>";</script><style>p { color: red }</style>
+<ul><li>one</li><li>two <a href='/t'>link</a></li></ul>
+<a name="top">plain</a> text<br/>next line<hr>x < y<!-- comment --></div>"""
+
+
+def test_markdown_conversion() -> None:
+    assert html_to_markdown(PAGE) == (
+        "## Install & run\n\n"
+        "Use [the docs](https://a.b/?x=1&y=2) now.\n\n"
+        "- one\n- two [link](/t)\n\n"
+        "plain text\nnext line\nx < y"
+    )
+
+
+def test_text_conversion() -> None:
+    assert html_to_text(PAGE) == "Install & run\n\nUse the docs now.\n\none\ntwo link\n\nplain text\nnext line\nx < y"
+    assert html_to_text("<p>Hello<br>world</p>") == "Hello\nworld"
+
+
+def test_unclosed_elements_are_finished() -> None:
+    assert html_to_markdown('<ul><li>a<li>b <a href="/x">c') == "- a\n- b [c](/x)"
+
+
+async def test_pool_runs_in_worker_and_recovers_from_timeouts() -> None:
+    pool = ExtractionPool(workers=1, timeout=10)
+    try:
+        text, extractor = await pool.run(extract_page, ARTICLE, "text/html", "markdown")
+        assert extractor == "readability"
+        assert "read [the docs](/docs)." in text
+        assert await pool.run(os.getpid) != os.getpid()
+
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await pool.run(time.sleep, 30, timeout=0.5)
+        assert time.monotonic() - started < 5
+
+        # The stuck worker was killed; a fresh pool serves the next call
+        assert pool.run_sync(html_to_text, "<p>ok</p>") == "ok"
+    finally:
+        pool.shutdown()
+
+
+async def test_thread_fallback_without_workers() -> None:
+    pool = ExtractionPool(workers=0)
+    assert await pool.run(html_to_text, "<p>ok</p>") == "ok"
@@ -0,0 +1,105 @@
+"""Test the shared pooled HTTP client."""
+
+import asyncio
+
+import httpx
+
+from nanobot.utils.http import SharedHttp
+
+
+class KeepAliveServer:
+    """Minimal HTTP/1.1 server that keeps connections open and tracks concurrency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+
+    async def __aenter__(self) -> "KeepAliveServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(self.delay)
+                self.active -= 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def test_connections_are_reused() -> None:
+    http = SharedHttp(http2=False)
+    async with KeepAliveServer() as server:
+        client = http.client()
+        for _ in range(5):
+            r = await client.get(f"http://localhost:{server.port}/")
+            assert r.text == "ok"
+        assert http.client() is client
+        await http.aclose()
+
+    stats = http.stats["localhost"]
+    assert server.connections == 1
+    assert (stats.requests, stats.connections) == (5, 1)
+    assert stats.reuse_rate == 0.8
+
+
+async def test_requests_per_host_are_capped() -> None:
+    http = SharedHttp(http2=False, max_per_host=2)
+    async with KeepAliveServer(delay=0.02) as server:
+        client = http.client()
+        responses = await asyncio.gather(*(client.get(f"http://localhost:{server.port}/") for _ in range(6)))
+        await http.aclose()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert server.peak == 2
+    stats = http.stats["localhost"]
+    assert stats.connections == 2
+    assert (stats.dns_lookups, stats.dns_cache_hits) == (1, 1)
+
+
+async def test_closed_client_is_recreated() -> None:
+    http = SharedHttp(http2=False)
+    first = http.client()
+    await http.aclose()
+    assert first.is_closed
+    assert http.client() is not first
+    await http.aclose()
+
+
+async def test_environment_proxies_are_honoured(monkeypatch) -> None:
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.internal:3128")
+    monkeypatch.setenv("NO_PROXY", "localhost,.corp.example")
+    for name in ("HTTP_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+
+    shared = SharedHttp()
+    client = shared.client()
+    try:
+        def proxy_of(url: str) -> bytes | None:
+            pool = client._transport_for_url(httpx.URL(url))._transport._pool
+            return pool._proxy_url.host if hasattr(pool, "_proxy_url") else None  # httpcore proxy pools
+
+        assert proxy_of("https://api.search.brave.com/res") == b"proxy.internal"
+        assert proxy_of("http://example.com/") is None
+        assert proxy_of("https://wiki.corp.example/") is None
+
+        shared.configure(proxy="http://explicit:8080")
+        await shared.aclose()
+        client = shared.client()
+        assert proxy_of("http://example.com/") == b"explicit"
+    finally:
+        await shared.aclose()
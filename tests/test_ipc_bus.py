@@ -0,0 +1,157 @@
+"""Test the multi-process gateway transport (front and workers in one process)."""
+
+import asyncio
+import multiprocessing
+
+import pytest
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.ipc import HashRing, IpcFront, IpcWorker, _pack, decode_inbound, encode_message
+from nanobot.bus.queue import MessageBus
+from nanobot.cron.service import CronService
+from nanobot.cron.types import CronSchedule
+
+
+def test_hash_ring_is_stable_and_spreads_sessions() -> None:
+    ring = HashRing(4)
+    keys = [f"telegram:{i}" for i in range(400)]
+    nodes = [ring.node_for(k) for k in keys]
+    assert nodes == [HashRing(4).node_for(k) for k in keys]
+    assert all(nodes.count(n) > 40 for n in range(4))
+    # Adding a worker only moves the sessions that land on it
+    grown = HashRing(5)
+    assert all(grown.node_for(k) in (n, 4) for k, n in zip(keys, nodes))
+
+
+def test_messages_survive_encoding() -> None:
+    msg = InboundMessage(channel="slack", sender_id="u", chat_id="c", content="hi", metadata={"ts": 1.5})
+    msg.enqueued_at = 123.0
+    decoded = decode_inbound(encode_message(msg))
+    assert (decoded.content, decoded.timestamp, decoded.metadata) == ("hi", msg.timestamp, {"ts": 1.5})
+    assert decoded.enqueued_at is None
+
+
+async def _echo_agent(index: int, bus: MessageBus) -> None:
+    while True:
+        msg = await bus.consume_inbound()
+        bus.inbound_started(msg)
+        await bus.publish_outbound(OutboundMessage(
+            channel=msg.channel, chat_id=msg.chat_id, content=f"w{index}:{msg.content}"
+        ))
+
+
+async def test_front_routes_sessions_to_workers(tmp_path) -> None:
+    front_bus = MessageBus()
+    front = IpcFront(front_bus, tmp_path / "gw.sock", workers=2)
+    await front.start()
+    tasks = [asyncio.create_task(front.run())]
+    for i in range(2):
+        bus = MessageBus()
+
+        async def direct(content, session_key, channel, chat_id, i=i):
+            return f"w{i} did {content}"
+
+        tasks.append(asyncio.create_task(IpcWorker(bus, front.socket_path, i, direct).run()))
+        tasks.append(asyncio.create_task(_echo_agent(i, bus)))
+    try:
+        chats = [f"chat{n}" for n in range(6)]
+        for chat in chats * 2:
+            await front_bus.publish_inbound(
+                InboundMessage(channel="telegram", sender_id="u", chat_id=chat, content=chat)
+            )
+        replies = [await asyncio.wait_for(front_bus.consume_outbound(), 5) for _ in range(12)]
+        for reply in replies:
+            worker = front.ring.node_for(f"telegram:{reply.chat_id}")
+            assert reply.content == f"w{worker}:{reply.chat_id}"
+
+        result = await asyncio.wait_for(front.process_direct("the job", session_key="cron:1"), 5)
+        assert result == f"w{front.ring.node_for('cron:1')} did the job"
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await front.close()
+    assert not front.socket_path.exists()
+
+
+class FakeWriter:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        if self.fail:
+            raise ConnectionResetError("worker went away")
+        self.sent.append(data)
+
+    async def drain(self) -> None:
+        pass
+
+
+async def test_frame_that_failed_to_send_is_resent_first(tmp_path) -> None:
+    front = IpcFront(MessageBus(), tmp_path / "gw.sock", workers=1)
+    frames = [{"op": "inbound", "n": n} for n in range(3)]
+    for frame in frames:
+        front._outgoing[0].put_nowait(frame)
+
+    await front._send_loop(0, FakeWriter(fail=True))  # connection lost while sending frame 0
+    reconnected = FakeWriter()
+    sender = asyncio.create_task(front._send_loop(0, reconnected))
+    while len(reconnected.sent) < 3:
+        await asyncio.sleep(0.001)
+    sender.cancel()
+    assert reconnected.sent == [_pack(f) for f in frames]
+
+
+async def test_cron_run_keeps_jobs_changed_by_other_processes(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    worker = CronService(path)  # e.g. the cron tool in an agent worker
+    every = CronSchedule(kind="every", every_ms=3_600_000)
+    doomed = worker.add_job("doomed", every, "bye")
+
+    async def on_job(job):
+        await asyncio.sleep(0.01)
+        worker.add_job("added", every, "hi")
+        worker.remove_job(doomed.id)
+        return "done"
+
+    front = CronService(path, on_job=on_job)
+    due = front.add_job("due", every, "tick")
+    due.state.next_run_at_ms = 1
+    await front._on_timer()
+    front.stop()
+
+    jobs = {j.name: j for j in CronService(path).list_jobs()}
+    assert set(jobs) == {"due", "added"}
+    assert jobs["due"].state.last_status == "ok" and jobs["due"].state.next_run_at_ms > 1
+
+
+def _add_cron_jobs(path, prefix: str) -> None:
+    service = CronService(path)
+    for i in range(10):
+        service.add_job(f"{prefix}{i}", CronSchedule(kind="every", every_ms=60_000), "hi")
+
+
+def test_cron_store_changes_from_many_processes_are_kept(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_add_cron_jobs, args=(path, f"w{n}-")) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0] * 4
+    assert len(CronService(path).list_jobs()) == 40
+    assert [f.name for f in tmp_path.iterdir() if f.suffix == ".tmp"] == []
+
+
+async def test_unreadable_cron_store_is_never_overwritten(tmp_path) -> None:
+    path = tmp_path / "jobs.json"
+    path.write_text('{"version": 1, "jobs": [{"id": "x", "na')  # e.g. edited by hand and broken
+    service = CronService(path)
+    assert service.list_jobs() == []
+    with pytest.raises(RuntimeError):
+        service.add_job("new", CronSchedule(kind="every", every_ms=60_000), "hi")
+    await service.start()
+    service.stop()
+    assert path.read_text() == '{"version": 1, "jobs": [{"id": "x", "na'
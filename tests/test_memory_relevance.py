@@ -0,0 +1,88 @@
+"""Test relevance-based selection of MEMORY.md facts."""
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.memory import MemoryStore
+
+MEMORY = """# Long-term Memory
+
+## Pinned
+- User's name is Dana; always answer in English.
+
+## Preferences
+- Prefers green tea over coffee.
+- Likes concise answers without emoji.
+
+## Projects
+- Works on a Rust web server called ferrite.
+  Deploys it with Docker on a Hetzner VPS.
+- Learning Japanese, studies kanji every morning.
+- 用户喜欢在周末爬山。
+"""
+
+
+def _store(tmp_path) -> MemoryStore:
+    store = MemoryStore(tmp_path)
+    store.write_long_term(MEMORY)
+    return store
+
+
+def test_small_memory_is_injected_whole(tmp_path) -> None:
+    store = _store(tmp_path)
+    assert store.get_memory_context("hello", max_facts=50, max_tokens=5000).endswith(MEMORY)
+
+
+def test_relevant_and_pinned_facts_are_selected(tmp_path) -> None:
+    store = _store(tmp_path)
+    assert len(store.get_facts().facts) == 6
+
+    context = store.get_memory_context("How should I deploy ferrite?", max_facts=2)
+    assert "Dana" in context  # pinned
+    assert "Hetzner VPS" in context  # continuation line stays with its fact
+    assert "## Projects" in context
+    assert "green tea" not in context and "kanji" not in context
+
+    context = store.get_memory_context("周末去爬山吗", max_facts=2)
+    assert "爬山" in context
+
+    context = store.get_memory_context("ferrite", max_facts=2, include_pinned=False)
+    assert "Dana" not in context
+
+
+def test_facts_are_parsed_once_per_file_version(tmp_path, monkeypatch) -> None:
+    store = _store(tmp_path)
+    reads = 0
+    read_long_term = store.read_long_term
+
+    def counting_read() -> str:
+        nonlocal reads
+        reads += 1
+        return read_long_term()
+
+    monkeypatch.setattr(store, "read_long_term", counting_read)
+    first = store.get_facts()
+    for query in ("ferrite", "tea", "kanji"):
+        store.get_memory_context(query, max_facts=2)
+    assert store.get_facts() is first and reads == 1
+
+    # Another process (or the agent's edit_file) rewrites MEMORY.md
+    store.memory_file.write_text(MEMORY + "- Owns a cat named Miso.\n", encoding="utf-8")
+    assert "Miso" in store.get_memory_context("cat", max_facts=2)
+    assert reads == 2
+
+
+def test_token_cap_limits_selection(tmp_path) -> None:
+    store = _store(tmp_path)
+    context = store.get_memory_context(
+        "tea coffee docker kanji", max_tokens=12, count_tokens=lambda text: len(text.split()),
+    )
+    assert "Dana" in context
+    assert "kanji" not in context
+
+
+def test_context_builder_uses_current_message_and_history(tmp_path) -> None:
+    _store(tmp_path)
+    builder = ContextBuilder(tmp_path, memory_top_k=2)
+    history = [{"role": "user", "content": "Tell me about my tea habits"}]
+    messages = builder.build_messages(history, "what about coffee?")
+    assert "green tea" in messages[0]["content"]
+    assert "ferrite" not in messages[0]["content"]
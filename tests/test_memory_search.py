@@ -0,0 +1,30 @@
+"""Test the incremental HISTORY.md index and the memory_search tool."""
+
+from nanobot.agent.memory import MemoryStore
+from nanobot.agent.tools.memory import MemorySearchTool
+
+
+async def test_search_ranks_appended_entries(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-02 10:00] User planned a trip to Lisbon in May.")
+    store.append_history("[2026-01-03 09:30] Discussed the quarterly budget and the Lisbon trip budget.")
+    store.append_history("[2026-01-04 18:00] Fixed a bug in the deploy script.")
+
+    results = store.search_history("lisbon budget", limit=2)
+    assert [ts for ts, _ in results] == ["2026-01-03 09:30", "2026-01-02 10:00"]
+
+    tool = MemorySearchTool(store)
+    assert "deploy script" in await tool.execute(query="deploy")
+    assert "No history entries" in await tool.execute(query="kubernetes")
+
+
+def test_external_edits_are_picked_up(tmp_path) -> None:
+    store = MemoryStore(tmp_path)
+    store.append_history("[2026-01-02 10:00] Talked about cats.")
+    with open(store.history_file, "a", encoding="utf-8") as f:
+        f.write("[2026-01-05 12:00] Talked about dogs.\n\n")
+    assert store.search_history("dogs")[0][0] == "2026-01-05 12:00"
+
+    store.history_file.write_text("[2026-02-01 08:00] Only birds now.\n\n", encoding="utf-8")
+    assert store.search_history("cats") == []
+    assert len(store.search_history("birds")) == 1
@@ -0,0 +1,72 @@
+"""Test per-channel outbound delivery through the bus dispatcher."""
+
+import asyncio
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+
+
+def _out(channel: str, chat_id: str, content: str) -> OutboundMessage:
+    return OutboundMessage(channel=channel, chat_id=chat_id, content=content)
+
+
+async def test_slow_channel_does_not_stall_others() -> None:
+    bus = MessageBus()
+    stalled = asyncio.Event()
+    fast: list[str] = []
+
+    async def slow_send(msg: OutboundMessage) -> None:
+        await stalled.wait()
+
+    async def fast_send(msg: OutboundMessage) -> None:
+        fast.append(msg.content)
+
+    bus.subscribe_outbound("discord", slow_send)
+    bus.subscribe_outbound("telegram", fast_send)
+    task = asyncio.create_task(bus.dispatch_outbound())
+    try:
+        await bus.publish_outbound(_out("discord", "d1", "stuck"))
+        for i in range(3):
+            await bus.publish_outbound(_out("telegram", "t1", f"m{i}"))
+        for _ in range(50):
+            if len(fast) == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert fast == ["m0", "m1", "m2"]
+        assert bus.dispatcher.pending("telegram") == 0
+        assert bus.dispatcher.stats["telegram"].sent == 3
+    finally:
+        stalled.set()
+        bus.stop()
+        await asyncio.wait_for(task, 3)
+
+
+async def test_per_chat_order_and_send_timeout() -> None:
+    bus = MessageBus(outbound_workers=3, send_timeout=0.05)
+    delivered: dict[str, list[str]] = {}
+
+    async def send(msg: OutboundMessage) -> None:
+        if msg.content == "hang":
+            await asyncio.sleep(10)
+        await asyncio.sleep(0.001 * (hash(msg.content) % 3))
+        delivered.setdefault(msg.chat_id, []).append(msg.content)
+
+    bus.subscribe_outbound("slack", send)
+    task = asyncio.create_task(bus.dispatch_outbound())
+    try:
+        await bus.publish_outbound(_out("slack", "c0", "hang"))
+        for i in range(10):
+            for chat in ("c1", "c2"):
+                await bus.publish_outbound(_out("slack", chat, str(i)))
+        for _ in range(100):
+            stats = bus.dispatcher.stats.get("slack")
+            if stats and stats.sent + stats.timed_out == 21:
+                break
+            await asyncio.sleep(0.01)
+        assert delivered["c1"] == delivered["c2"] == [str(i) for i in range(10)]
+        stats = bus.dispatcher.stats["slack"]
+        assert (stats.sent, stats.timed_out) == (20, 1)
+        assert stats.max_latency >= stats.avg_latency > 0
+    finally:
+        bus.stop()
+        await asyncio.wait_for(task, 3)
@@ -0,0 +1,50 @@
+"""Test the prompt-cache-friendly context layout and cache_control markers."""
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+
+def test_volatile_context_moves_out_of_system_prompt(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path, cache_friendly=True)
+    builder.memory.write_long_term("likes tea")
+
+    a = builder.build_messages([], "hi", channel="telegram", chat_id="1")
+    b = builder.build_messages([], "hi", channel="slack", chat_id="2")
+
+    assert a[0] == b[0]
+    assert "Current Time" not in a[0]["content"]
+    assert "likes tea" not in a[0]["content"]
+    user = a[-1]["content"]
+    assert user.startswith("[Runtime Context]")
+    assert "Chat ID: 1" in user and "likes tea" in user
+    assert user.endswith("\n\nhi")
+
+
+def test_default_layout_keeps_session_in_system_prompt(tmp_path) -> None:
+    messages = ContextBuilder(tmp_path).build_messages([], "hi", channel="cli", chat_id="x")
+    assert "Chat ID: x" in messages[0]["content"]
+    assert messages[-1]["content"] == "hi"
+
+
+def test_cache_control_marks_system_and_last_message() -> None:
+    provider = LiteLLMProvider(default_model="anthropic/claude-opus-4-5")
+    messages = [
+        {"role": "system", "content": "stable"},
+        {"role": "user", "content": "q"},
+        {"role": "tool", "tool_call_id": "1", "name": "exec", "content": "out"},
+    ]
+
+    kwargs = provider._build_kwargs(messages, None, None, 100, 0.7, cache_key="telegram:1")
+    sent = kwargs["messages"]
+
+    assert sent[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert sent[1] == messages[1]
+    assert sent[2]["cache_control"] == {"type": "ephemeral"}
+    assert messages[0]["content"] == "stable"
+    assert len(kwargs["prompt_cache_key"]) == 32
+
+
+def test_no_cache_control_for_unsupported_models() -> None:
+    provider = LiteLLMProvider(default_model="deepseek/deepseek-chat")
+    messages = [{"role": "system", "content": "stable"}, {"role": "user", "content": "q"}]
+    assert provider._build_kwargs(messages, None, None, 100, 0.7)["messages"] == messages
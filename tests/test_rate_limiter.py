@@ -0,0 +1,131 @@
+"""Test client-side rate limiting and adaptive concurrency for LLM calls."""
+
+import asyncio
+
+from nanobot.providers.ratelimit import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimiter,
+    TokenBucket,
+    background,
+    current_priority,
+)
+
+
+async def test_interactive_requests_jump_ahead_of_background() -> None:
+    limiter = RateLimiter(max_concurrency=1)
+    order: list[str] = []
+    held = await limiter.acquire()
+
+    async def call(name: str, priority: int) -> None:
+        async with limiter.slot(priority=priority):
+            order.append(name)
+
+    tasks = [asyncio.create_task(call("bg1", BACKGROUND)), asyncio.create_task(call("bg2", BACKGROUND))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(call("user", INTERACTIVE)))
+    await asyncio.sleep(0)
+    await limiter.release(held)
+    await asyncio.gather(*tasks)
+
+    assert order == ["user", "bg1", "bg2"]
+    assert limiter.in_flight == 0
+
+
+async def test_background_context_sets_priority() -> None:
+    assert current_priority() == INTERACTIVE
+    with background():
+        assert current_priority() == BACKGROUND
+        assert await asyncio.create_task(asyncio.sleep(0, result=current_priority())) == BACKGROUND
+    assert current_priority() == INTERACTIVE
+
+
+def test_token_bucket_delay_and_debt() -> None:
+    bucket = TokenBucket(per_minute=60)
+    assert bucket.delay(60) == 0
+    bucket.take(60)
+    assert 0.9 < bucket.delay(1) <= 1.0
+    bucket.take(-30)  # an over-estimate is given back
+    assert bucket.delay(30) == 0
+    bucket.take(90)  # debt
+    assert bucket.delay(1) > 60
+
+
+async def test_requests_per_minute_delay_admission() -> None:
+    limiter = RateLimiter(rpm=1)
+    async with limiter.slot():
+        pass
+    try:
+        await asyncio.wait_for(limiter.acquire(), timeout=0.2)
+        raise AssertionError("second request should wait for the bucket to refill")
+    except asyncio.TimeoutError:
+        pass
+    assert limiter.in_flight == 0
+    assert limiter._queue == []
+
+
+async def test_tokens_are_corrected_with_actual_usage() -> None:
+    limiter = RateLimiter(tpm=6000)
+    async with limiter.slot(estimated_tokens=5000) as permit:
+        permit.used_tokens = 1000
+    # Only the real usage stays reserved, so a large request fits right away
+    await asyncio.wait_for(limiter.acquire(estimated_tokens=4900), timeout=0.2)
+
+
+async def test_concurrency_halves_on_rate_limit_and_grows_back() -> None:
+    limiter = RateLimiter(max_concurrency=8)
+    async with limiter.slot() as permit:
+        permit.rate_limited = True
+    assert int(limiter.limit) == 4
+    async with limiter.slot() as permit:
+        permit.rate_limited = True
+    assert int(limiter.limit) == 2
+
+    for _ in range(3):
+        async with limiter.slot():
+            pass
+    assert int(limiter.limit) == 3
+    for _ in range(100):
+        async with limiter.slot():
+            pass
+    assert limiter.limit == 8
+
+
+async def test_concurrency_limit_caps_in_flight_calls() -> None:
+    limiter = RateLimiter(max_concurrency=2)
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call() for _ in range(6)))
+    assert peak == 2
+
+
+async def test_failed_calls_do_not_raise_the_limit() -> None:
+    limiter = RateLimiter(max_concurrency=8)
+    async with limiter.slot() as permit:
+        permit.rate_limited = True
+    for _ in range(10):
+        async with limiter.slot() as permit:
+            permit.failed = True
+    try:
+        async with limiter.slot():
+            raise TimeoutError
+    except TimeoutError:
+        pass
+    assert limiter.limit == 4
+
+
+async def test_streamed_calls_are_timed_to_first_token() -> None:
+    limiter = RateLimiter(max_concurrency=8)
+    async with limiter.slot() as permit:
+        permit.started -= 300  # a long answer...
+        permit.first_token = permit.started + 1  # ...that started streaming quickly
+    assert limiter.limit == 8
+    async with limiter.slot() as permit:
+        permit.started -= 300
+    assert limiter.limit < 8
@@ -0,0 +1,141 @@
+"""Test retries, failover, circuit breaking and hedging of LLM calls."""
+
+import asyncio
+from typing import Any
+
+from nanobot.providers.base import LLMProvider, LLMResponse, classify_error
+from nanobot.providers.ratelimit import background
+from nanobot.providers.resilient import CircuitBreaker, Endpoint, ResilientProvider
+
+
+class ScriptedProvider(LLMProvider):
+    """Returns scripted results in order: an error kind, a delay in seconds, or text."""
+
+    def __init__(self, script: list[Any], default: Any = "ok"):
+        super().__init__()
+        self.script = list(script)
+        self.default = default
+        self.calls: list[str | None] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7, cache_key=None):
+        self.calls.append(model)
+        step = self.script.pop(0) if self.script else self.default
+        if isinstance(step, (int, float)):
+            await asyncio.sleep(step)
+            return LLMResponse(content=f"slow {step}")
+        if step in ("timeout", "rate_limit", "server", "connection", "auth", "client"):
+            return LLMResponse(content=f"Error calling LLM: {step}", finish_reason="error", error_kind=step)
+        return LLMResponse(content=step)
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+def _resilient(*providers: LLMProvider, **kwargs: Any) -> ResilientProvider:
+    endpoints = [Endpoint(name=f"p{i}", provider=p, model=None if i == 0 else f"fallback-{i}")
+                 for i, p in enumerate(providers)]
+    return ResilientProvider(endpoints, backoff_base=0.001, backoff_max=0.001, **kwargs)
+
+
+async def _ask(provider: LLMProvider) -> LLMResponse:
+    return await provider.chat([{"role": "user", "content": "hi"}], model="main")
+
+
+def test_classify_error() -> None:
+    class StatusError(Exception):
+        def __init__(self, status_code: int):
+            self.status_code = status_code
+
+    assert classify_error(StatusError(429)) == "rate_limit"
+    assert classify_error(StatusError(503)) == "server"
+    assert classify_error(StatusError(401)) == "auth"
+    assert classify_error(StatusError(400)) == "client"
+    assert classify_error(TimeoutError()) == "timeout"
+    assert classify_error(ConnectionResetError()) == "connection"
+    assert classify_error(ValueError("bad")) == "client"
+
+
+async def test_transient_errors_are_retried() -> None:
+    primary = ScriptedProvider(["timeout", "server", "fine"])
+    response = await _ask(_resilient(primary, max_retries=2))
+    assert response.content == "fine"
+    assert len(primary.calls) == 3
+
+
+async def test_client_errors_are_returned_without_retry() -> None:
+    primary = ScriptedProvider(["client"])
+    fallback = ScriptedProvider([])
+    response = await _ask(_resilient(primary, fallback))
+    assert response.finish_reason == "error"
+    assert len(primary.calls) == 1
+    assert fallback.calls == []
+
+
+async def test_failover_after_retries_and_auth_errors() -> None:
+    primary = ScriptedProvider([], default="rate_limit")
+    fallback = ScriptedProvider(["auth"])
+    last = ScriptedProvider(["backup"])
+    response = await _ask(_resilient(primary, fallback, last, max_retries=1))
+    assert response.content == "backup"
+    assert len(primary.calls) == 2
+    assert fallback.calls == ["fallback-1"]  # auth errors fail over without retrying
+    assert last.calls == ["fallback-2"]
+
+
+async def test_open_circuit_skips_endpoint_until_cooldown() -> None:
+    primary = ScriptedProvider([], default="server")
+    fallback = ScriptedProvider([])
+    provider = _resilient(primary, fallback, max_retries=0)
+    provider.endpoints[0].breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+
+    for _ in range(2):
+        assert (await _ask(provider)).content == "ok"
+    assert provider.endpoints[0].breaker.state == "open"
+    await _ask(provider)
+    assert len(primary.calls) == 2
+
+    await asyncio.sleep(0.06)
+    primary.default = "recovered"
+    assert (await _ask(provider)).content == "recovered"
+    assert provider.endpoints[0].breaker.state == "closed"
+
+
+async def test_slow_interactive_call_is_hedged() -> None:
+    primary = ScriptedProvider([0.01] * 5 + [1.0, 0.01])
+    provider = _resilient(primary, hedge=True, hedge_min_samples=5)
+    for _ in range(5):
+        await _ask(provider)
+
+    response = await asyncio.wait_for(_ask(provider), timeout=0.5)
+    assert response.content == "slow 0.01"
+    assert len(primary.calls) == 7
+
+
+async def test_background_calls_are_not_hedged() -> None:
+    primary = ScriptedProvider([0.01] * 5 + [0.1])
+    provider = _resilient(primary, hedge=True, hedge_min_samples=5)
+    for _ in range(5):
+        await _ask(provider)
+    with background():
+        response = await _ask(provider)
+    assert response.content == "slow 0.1"
+    assert len(primary.calls) == 6
+
+
+async def test_stream_is_not_retried_after_text_was_sent() -> None:
+    class BrokenStream(ScriptedProvider):
+        async def chat_stream(self, messages, on_delta, **kwargs):
+            self.calls.append(kwargs.get("model"))
+            await on_delta("partial")
+            return LLMResponse(content="Error calling LLM: reset", finish_reason="error", error_kind="connection")
+
+    primary = BrokenStream([])
+    deltas: list[str] = []
+
+    async def on_delta(text: str) -> None:
+        deltas.append(text)
+
+    response = await _resilient(primary).chat_stream([{"role": "user", "content": "hi"}], on_delta)
+    assert response.finish_reason == "error"
+    assert deltas == ["partial"]
+    assert len(primary.calls) == 1
@@ -0,0 +1,150 @@
+"""Test the persistent LLM response cache."""
+
+import dataclasses
+import json
+import time
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.queue import MessageBus
+from nanobot.cli.commands import _cache_scheduled
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.cache import CachingProvider, ResponseCache, cache_responses, make_key
+from nanobot.session.manager import SessionManager
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7, cache_key=None):
+        self.calls += 1
+        return LLMResponse(
+            content=f"answer {self.calls}",
+            tool_calls=[ToolCallRequest(id="call_1", name="read_file", arguments={"path": "HEARTBEAT.md"})],
+            usage={"total_tokens": 10},
+        )
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+
+class PlainProvider(CountingProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7, cache_key=None):
+        self.calls += 1
+        return LLMResponse(content="HEARTBEAT_OK")
+
+
+def _messages(time_line: str = "2026-01-01 09:00") -> list[dict]:
+    return [
+        {"role": "system", "content": "You are nanobot."},
+        {"role": "user", "content": f"[Runtime Context]\n## Current Time\n{time_line}\n[/Runtime Context]\n\nping"},
+    ]
+
+
+def test_key_is_canonical() -> None:
+    tools = [{"type": "function", "function": {"name": "a", "parameters": {"b": 1, "a": 2}}}]
+    reordered = [{"function": {"parameters": {"a": 2, "b": 1}, "name": "a"}, "type": "function"}]
+    assert make_key("m", _messages(), tools, 100, 0) == make_key("m", _messages(), reordered, 100, 0)
+    assert make_key("m", _messages(), tools, 100, 0) != make_key("m", _messages(), tools, 100, 0.5)
+    assert make_key("m", _messages(), None, 100, 0) != make_key("m", _messages("10:00"), None, 100, 0)
+    assert make_key("m", _messages(), None, 100, 0, ignore_time=True) == \
+        make_key("m", _messages("10:00"), None, 100, 0, ignore_time=True)
+    assert make_key("m", _messages("2026-01-01 09:05 (Thursday) (UTC)"), None, 100, 0, hourly=True) == \
+        make_key("m", _messages("2026-01-01 09:35 (Thursday) (UTC)"), None, 100, 0, hourly=True)
+    assert make_key("m", _messages("2026-01-01 09:35 (Thursday) (UTC)"), None, 100, 0, hourly=True) != \
+        make_key("m", _messages("2026-01-01 10:05 (Thursday) (UTC)"), None, 100, 0, hourly=True)
+
+
+async def test_hits_only_inside_cache_block(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+
+    await provider.chat(_messages(), temperature=0)
+    await provider.chat(_messages(), temperature=0)
+    assert inner.calls == 2
+
+    with cache_responses("heartbeat"):
+        first = await provider.chat(_messages(), temperature=0)
+        second = await provider.chat(_messages(), temperature=0)
+    assert inner.calls == 3
+    assert second.content == first.content
+    assert second.tool_calls[0].id != first.tool_calls[0].id  # replayed tool calls get fresh ids
+    assert second.tool_calls[0].arguments == {"path": "HEARTBEAT.md"}
+
+    stats = provider.cache.stats
+    assert (stats.hits, stats.misses, stats.stores, stats.entries) == (1, 1, 1, 1)
+
+
+async def test_temperature_and_sites_gate_caching(tmp_path: Path) -> None:
+    inner = CountingProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"), sites={"cron"})
+
+    with cache_responses("cron"):
+        await provider.chat(_messages(), temperature=0.7)
+        await provider.chat(_messages(), temperature=0.7)
+    assert inner.calls == 2
+
+    with cache_responses("cron", allow_temperature=True):
+        await provider.chat(_messages(), temperature=0.7)
+        await provider.chat(_messages(), temperature=0.7)
+    assert inner.calls == 3
+
+    with cache_responses("heartbeat"):
+        await provider.chat(_messages(), temperature=0)
+        await provider.chat(_messages(), temperature=0)
+    assert inner.calls == 5
+
+
+def test_ttl_and_lru_eviction(tmp_path: Path) -> None:
+    entry_size = len(json.dumps(dataclasses.asdict(LLMResponse(content="x" * 100))))
+    cache = ResponseCache(tmp_path / "cache.db", max_bytes=entry_size * 2 + 10)  # room for two entries
+    cache.put("old", LLMResponse(content="x" * 100))
+    cache.put("expired", LLMResponse(content="y"), ttl=-1)
+    assert cache.get("expired") is None
+
+    time.sleep(0.01)
+    cache.put("used", LLMResponse(content="z" * 100))
+    time.sleep(0.01)
+    assert cache.get("old") is not None  # now more recently used than "used"
+    cache.put("new", LLMResponse(content="w" * 100))
+
+    assert cache.get("used") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
+    assert cache.stats.evictions >= 2
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    ResponseCache(tmp_path / "cache.db").put("k", LLMResponse(content="kept", usage={"total_tokens": 3}))
+    cached = ResponseCache(tmp_path / "cache.db").get("k")
+    assert cached.content == "kept"
+    assert cached.usage == {"total_tokens": 3}
+
+
+async def test_heartbeats_hit_through_agent_loop(tmp_path: Path, monkeypatch) -> None:
+    clock = ["2026-01-01 09:05 (Thursday)"]
+    monkeypatch.setattr(ContextBuilder, "_current_time", staticmethod(lambda: f"{clock[0]} (UTC)"))
+    inner = PlainProvider()
+    provider = CachingProvider(inner, ResponseCache(tmp_path / "cache.db"))
+    loop = AgentLoop(
+        bus=MessageBus(), provider=provider, workspace=tmp_path,
+        session_manager=SessionManager(tmp_path, sessions_dir=tmp_path),
+    )  # default temperature (0.7)
+
+    for now in ("09:05", "09:35", "09:55"):  # each run appends to the "heartbeat" session's history
+        clock[0] = f"2026-01-01 {now} (Thursday)"
+        with _cache_scheduled("heartbeat"):
+            assert await loop.process_direct("Check HEARTBEAT.md", session_key="heartbeat") == "HEARTBEAT_OK"
+
+    assert len(loop.sessions.get_or_create("heartbeat").messages) == 6
+    assert inner.calls == 1
+    assert (provider.cache.stats.hits, provider.cache.stats.misses) == (2, 1)
+
+    # A new hour is decided afresh ("at 10:00 send the report")
+    clock[0] = "2026-01-01 10:05 (Thursday)"
+    with _cache_scheduled("heartbeat"):
+        await loop.process_direct("Check HEARTBEAT.md", session_key="heartbeat")
+    assert inner.calls == 2
@@ -0,0 +1,129 @@
+"""Test append-only session saves and background compaction."""
+
+import asyncio
+import json
+
+from nanobot.session.manager import SessionManager
+
+
+def _manager(tmp_path, **kwargs) -> SessionManager:
+    return SessionManager(tmp_path, sessions_dir=tmp_path, **kwargs)
+
+
+def _lines(manager: SessionManager, key: str) -> list[dict]:
+    text = manager.store._get_session_path(key).read_text()
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_saves_append_only_new_messages(tmp_path) -> None:
+    manager = _manager(tmp_path)
+    session = manager.get_or_create("test:append")
+    session.add_message("user", "one")
+    manager.save(session)
+    before = manager.store._get_session_path(session.key).read_text()
+
+    session.add_message("assistant", "two")
+    session.last_consolidated = 1
+    manager.save(session)
+
+    lines = _lines(manager, session.key)
+    assert [line.get("content") for line in lines] == [None, "one", None, "two", None]
+    assert manager.store._get_session_path(session.key).read_text().startswith(before)
+
+    manager.invalidate(session.key)
+    reloaded = manager.get_or_create(session.key)
+    assert [m["content"] for m in reloaded.messages] == ["one", "two"]
+    assert reloaded.last_consolidated == 1
+
+
+def test_clear_rewrites_file(tmp_path) -> None:
+    manager = _manager(tmp_path)
+    session = manager.get_or_create("test:clear")
+    session.add_message("user", "old")
+    manager.save(session)
+
+    session.clear()
+    session.add_message("user", "new")
+    manager.save(session)
+
+    assert [line.get("content") for line in _lines(manager, session.key)] == [None, "new", None]
+
+
+def test_torn_last_line_is_skipped(tmp_path) -> None:
+    manager = _manager(tmp_path)
+    session = manager.get_or_create("test:torn")
+    session.add_message("user", "kept")
+    manager.save(session)
+    with open(manager.store._get_session_path(session.key), "a") as f:
+        f.write('{"role": "user", "cont')
+
+    manager.invalidate(session.key)
+    assert [m["content"] for m in manager.get_or_create(session.key).messages] == ["kept"]
+
+
+async def test_compaction_runs_off_loop_and_keeps_everything(tmp_path) -> None:
+    manager = _manager(tmp_path, compact_after=3)
+    session = manager.get_or_create("test:compact")
+    for i in range(5):
+        session.add_message("user", f"msg{i}")
+        manager.save(session)
+
+    while manager.store._files[session.key].compacting:
+        await asyncio.sleep(0.01)
+
+    lines = _lines(manager, session.key)
+    assert sum(1 for line in lines if line.get("_type") == "metadata") <= 3
+    assert [line["content"] for line in lines if "content" in line] == [f"msg{i}" for i in range(5)]
+    assert manager.list_sessions()[0]["key"] == "test:compact"
+
+
+def _fill(manager: SessionManager, key: str, count: int, last_consolidated: int = 0):
+    session = manager.get_or_create(key)
+    for i in range(count):
+        session.add_message("user", f"msg{i}")
+    session.last_consolidated = last_consolidated
+    manager.save(session)
+    manager.invalidate(key)
+    return session
+
+
+def test_lazy_load_reads_only_unconsolidated_tail(tmp_path) -> None:
+    manager = _manager(tmp_path, tail_messages=10)
+    _fill(manager, "test:lazy", 100, last_consolidated=80)
+
+    session = manager.get_or_create("test:lazy")
+    assert session.offset == 80
+    assert session.messages[0]["content"] == "msg80"
+    assert session.last_consolidated == 0
+
+    _fill(manager, "test:lazy2", 100, last_consolidated=95)
+    session = manager.get_or_create("test:lazy2")
+    assert len(session.messages) == 10
+    assert session.last_consolidated == 5
+
+
+def test_rewrite_of_lazy_session_keeps_unloaded_messages(tmp_path) -> None:
+    manager = _manager(tmp_path, tail_messages=5)
+    _fill(manager, "test:keep", 30, last_consolidated=30)
+
+    session = manager.get_or_create("test:keep")
+    session.add_message("user", "new")
+    manager.invalidate(session.key)  # forget file state: the next save rewrites
+    manager.save(session)
+
+    manager.invalidate(session.key)
+    manager.tail_messages = 1000
+    reloaded = manager.get_or_create(session.key)
+    assert [m["content"] for m in reloaded.messages] == [f"msg{i}" for i in range(30)] + ["new"]
+    assert reloaded.last_consolidated == 30
+
+
+def test_lru_evicts_by_count_and_idle_time(tmp_path) -> None:
+    manager = _manager(tmp_path, max_sessions=2)
+    for key in ("a", "b", "c"):
+        manager.get_or_create(key)
+    assert list(manager._cache) == ["b", "c"]
+
+    manager.idle_ttl = 0
+    manager.get_or_create("d")
+    assert list(manager._cache) == ["d"]
@@ -0,0 +1,65 @@
+"""Test the SQLite session store and the JSONL migration."""
+
+from nanobot.session.manager import Session, SessionManager
+
+
+def _manager(tmp_path, **kwargs) -> SessionManager:
+    return SessionManager(tmp_path, backend="sqlite", sessions_dir=tmp_path, **kwargs)
+
+
+def test_roundtrip_and_listing_order(tmp_path) -> None:
+    manager = _manager(tmp_path)
+    for key in ("telegram:1", "slack:C1:thread"):
+        session = manager.get_or_create(key)
+        session.add_message("user", f"hello from {key}")
+        manager.save(session)
+
+    session = manager.get_or_create("telegram:1")
+    session.add_message("assistant", "hi")
+    session.last_consolidated = 1
+    manager.save(session)
+
+    assert [s["key"] for s in manager.list_sessions()] == ["telegram:1", "slack:C1:thread"]
+
+    fresh = _manager(tmp_path)
+    reloaded = fresh.get_or_create("telegram:1")
+    assert [m["content"] for m in reloaded.messages] == ["hello from telegram:1", "hi"]
+    assert reloaded.last_consolidated == 1
+
+
+def test_tail_loading_and_clear(tmp_path) -> None:
+    manager = _manager(tmp_path, tail_messages=5)
+    session = manager.get_or_create("cli:direct")
+    for i in range(20):
+        session.add_message("user", f"msg{i}")
+    session.last_consolidated = 20
+    manager.save(session)
+    manager.invalidate(session.key)
+
+    tail = manager.get_or_create("cli:direct")
+    assert tail.offset == 15
+    assert tail.messages[0]["content"] == "msg15"
+
+    tail.add_message("user", "new")
+    manager.invalidate(tail.key)  # unknown state: the save replaces the loaded window only
+    manager.save(tail)
+    manager.tail_messages = 100
+    manager.invalidate(tail.key)
+    assert len(manager.get_or_create("cli:direct").messages) == 21
+
+    session = manager.get_or_create("cli:direct")
+    session.clear()
+    manager.save(session)
+    manager.invalidate(session.key)
+    assert manager.get_or_create("cli:direct").messages == []
+
+
+def test_jsonl_sessions_are_migrated_once(tmp_path) -> None:
+    jsonl = SessionManager(tmp_path, sessions_dir=tmp_path)
+    old = Session(key="telegram:42")
+    old.add_message("user", "from the old store")
+    jsonl.save(old)
+
+    manager = _manager(tmp_path)
+    assert manager.list_sessions()[0]["key"] == "telegram:42"
+    assert manager.get_or_create("telegram:42").messages[0]["content"] == "from the old store"
@@ -0,0 +1,187 @@
+"""Test streamed replies: provider fallback and progressive channel edits."""
+
+import io
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import litellm
+from rich.console import Console
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.telegram import TelegramChannel
+from nanobot.cli import commands
+from nanobot.config.schema import TelegramConfig
+from nanobot.providers import litellm_provider
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.litellm_provider import LiteLLMProvider
+from nanobot.session.manager import SessionManager
+
+
+class EditingChannel(BaseChannel):
+    name = "fake"
+    supports_streaming = True
+    stream_edit_interval = 0
+
+    def __init__(self):
+        super().__init__(config=None, bus=MessageBus())
+        self.events: list[tuple[str, str]] = []
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, msg: OutboundMessage) -> None:
+        self.events.append(("send", msg.content))
+
+    async def _stream_start(self, msg: OutboundMessage, text: str) -> Any:
+        self.events.append(("start", text))
+        return "m1"
+
+    async def _stream_edit(self, chat_id: str, handle: Any, text: str) -> None:
+        self.events.append(("edit", text))
+
+
+def _delta(text: str) -> OutboundMessage:
+    return OutboundMessage(channel="fake", chat_id="c", content=text, stream_id="s1", delta=True)
+
+
+async def test_deltas_render_as_edits_and_final_replaces() -> None:
+    channel = EditingChannel()
+    for part in ("Hel", "lo"):
+        await channel.send_delta(_delta(part))
+    final = OutboundMessage(channel="fake", chat_id="c", content="Hello!", stream_id="s1")
+    assert await channel.finish_stream(final)
+    assert channel.events == [("start", "Hel"), ("edit", "Hello"), ("edit", "Hello!")]
+
+
+async def test_final_without_deltas_is_sent_normally() -> None:
+    channel = EditingChannel()
+    final = OutboundMessage(channel="fake", chat_id="c", content="Hi", stream_id="s2")
+    assert not await channel.finish_stream(final)
+
+
+async def test_edits_are_throttled() -> None:
+    channel = EditingChannel()
+    channel.stream_edit_interval = 60
+    for part in ("a", "b", "c"):
+        await channel.send_delta(_delta(part))
+    assert channel.events == [("start", "a")]
+
+
+class StaticProvider(LLMProvider):
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7, cache_key=None):
+        return LLMResponse(content="full answer")
+
+    def get_default_model(self) -> str:
+        return "static"
+
+
+async def test_chat_stream_falls_back_to_single_delta() -> None:
+    deltas: list[str] = []
+
+    async def on_delta(text: str) -> None:
+        deltas.append(text)
+
+    response = await StaticProvider().chat_stream([{"role": "user", "content": "hi"}], on_delta=on_delta)
+    assert response.content == "full answer"
+    assert deltas == ["full answer"]
+
+
+class ToolThenAnswerProvider(LLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7, cache_key=None):
+        self.calls += 1
+        if self.calls == 1:
+            return LLMResponse(content="Checking.", tool_calls=[ToolCallRequest(id="1", name="missing", arguments={})])
+        return LLMResponse(content="Done.")
+
+    def get_default_model(self) -> str:
+        return "static"
+
+
+async def test_iterations_are_streamed_with_a_separator(tmp_path: Path) -> None:
+    loop = AgentLoop(
+        bus=MessageBus(), provider=ToolThenAnswerProvider(), workspace=tmp_path,
+        session_manager=SessionManager(tmp_path, sessions_dir=tmp_path),
+    )
+    deltas: list[str] = []
+
+    async def on_delta(text: str) -> None:
+        deltas.append(text)
+
+    content, _ = await loop._run_agent_loop([{"role": "user", "content": "hi"}], on_delta=on_delta)
+    assert content == "Done."
+    assert deltas == ["Checking.", "\n\n", "Done."]
+
+
+async def test_stream_without_a_response_is_an_error(monkeypatch) -> None:
+    async def chunks():
+        yield SimpleNamespace(choices=[])
+
+    async def acompletion(**kwargs):
+        return chunks()
+
+    monkeypatch.setattr(litellm_provider, "acompletion", acompletion)
+    monkeypatch.setattr(litellm, "stream_chunk_builder", lambda chunks, messages=None: None)
+    provider = LiteLLMProvider(default_model="deepseek/deepseek-chat")
+
+    async def on_delta(text: str) -> None:
+        pass
+
+    response = await provider.chat_stream([{"role": "user", "content": "hi"}], on_delta=on_delta)
+    assert response.finish_reason == "error"
+    (limiter,) = provider._limiters.values()
+    assert limiter.in_flight == 0
+
+
+class FakeBot:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.calls.append(("send", text))
+        return SimpleNamespace(message_id=7)
+
+    async def edit_message_text(self, chat_id, message_id, text, parse_mode=None):
+        self.calls.append(("edit", text))
+
+
+async def test_telegram_stops_editing_at_the_limit_and_sends_the_rest() -> None:
+    channel = TelegramChannel(TelegramConfig(), MessageBus())
+    channel.stream_edit_interval = 0
+    bot = FakeBot()
+    channel._app = SimpleNamespace(bot=bot)
+    first, second = "a" * 3000 + "\n", "b" * 2000
+    for part in (first, "b" * 500, "b" * 500, "b" * 1000):
+        await channel.deliver(OutboundMessage(channel="telegram", chat_id="1", content=part, stream_id="s", delta=True))
+    # Past 4000 chars the message shows the first chunk and is no longer edited
+    assert bot.calls == [("send", first), ("edit", first + "b" * 500), ("edit", "a" * 3000)]
+
+    await channel.deliver(OutboundMessage(channel="telegram", chat_id="1", content=first + second, stream_id="s"))
+    assert bot.calls[-1] == ("send", second)
+    assert not channel._stream_previews
+
+
+async def test_cli_prints_final_response_that_was_not_streamed(monkeypatch) -> None:
+    out = io.StringIO()
+    monkeypatch.setattr(commands, "console", Console(file=out, width=200))
+
+    printer = commands._StreamPrinter()
+    await printer("Let me check the logs.")
+    printer.finish("Let me check the logs.", render_markdown=False)
+    assert out.getvalue().count("Let me check the logs.") == 1
+
+    # Text streamed before a tool call, then a final answer that was not streamed
+    printer = commands._StreamPrinter()
+    await printer("Let me check the logs.")
+    printer.finish("The build failed on step 3.", render_markdown=False)
+    assert "The build failed on step 3." in out.getvalue()
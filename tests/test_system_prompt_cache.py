@@ -0,0 +1,76 @@
+"""Test mtime-based caching of system prompt sections."""
+
+import os
+
+from nanobot.agent import context
+from nanobot.agent.context import ContextBuilder
+
+
+def _bump_mtime(path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_sections_are_cached_until_a_file_changes(tmp_path, monkeypatch) -> None:
+    (tmp_path / "SOUL.md").write_text("calm", encoding="utf-8")
+    builder = ContextBuilder(tmp_path)
+    assert "calm" in builder.build_system_prompt()
+
+    reads = 0
+    load_bootstrap = builder._load_bootstrap_files
+
+    def counting_load() -> str:
+        nonlocal reads
+        reads += 1
+        return load_bootstrap()
+
+    monkeypatch.setattr(builder, "_load_bootstrap_files", counting_load)
+    builder.build_system_prompt()
+    assert reads == 0
+
+    soul = tmp_path / "SOUL.md"
+    soul.write_text("cheerful", encoding="utf-8")
+    _bump_mtime(soul)
+    assert "cheerful" in builder.build_system_prompt()
+    assert reads == 1
+
+
+def test_new_memory_and_skills_invalidate_cache(tmp_path) -> None:
+    builder = ContextBuilder(tmp_path)
+    builder.build_system_prompt()
+
+    builder.memory.write_long_term("likes tea")
+    assert "likes tea" in builder.build_system_prompt()
+
+    skill = tmp_path / "skills" / "brew-tea"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\ndescription: Brew tea\n---\nSteep 3 min.", encoding="utf-8")
+    assert "Brew tea" in builder.build_system_prompt()
+
+
+def test_skill_files_and_path_are_rechecked_at_most_once_a_second(tmp_path, monkeypatch) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(context.time, "monotonic", lambda: clock[0])
+    skill = tmp_path / "skills" / "brew-tea" / "SKILL.md"
+    skill.parent.mkdir(parents=True)
+    skill.write_text("---\ndescription: Brew tea\n---\nSteep 3 min.", encoding="utf-8")
+    builder = ContextBuilder(tmp_path)
+    assert "Brew tea" in builder.build_system_prompt()
+
+    listed = 0
+    list_skills = builder.skills.list_skills
+
+    def counting_list(*args, **kwargs):
+        nonlocal listed
+        listed += 1
+        return list_skills(*args, **kwargs)
+
+    monkeypatch.setattr(builder.skills, "list_skills", counting_list)
+    skill.write_text("---\ndescription: Brew green tea\n---\nSteep 2 min.", encoding="utf-8")
+    _bump_mtime(skill)
+    for _ in range(3):
+        assert "Brew green tea" not in builder.build_system_prompt()
+    assert listed == 0
+
+    clock[0] += 1
+    assert "Brew green tea" in builder.build_system_prompt()
@@ -0,0 +1,53 @@
+"""Test spilling oversized tool results and paging them back."""
+
+import re
+
+from nanobot.agent.tools.results import ReadResultTool, ToolResultStore
+
+
+def _handle(preview: str) -> str:
+    match = re.search(r'handle "([\w-]+)"', preview)
+    assert match
+    return match.group(1)
+
+
+def test_small_results_pass_through(tmp_path) -> None:
+    store = ToolResultStore(tmp_path, max_chars=100)
+    assert store.spill(store.new_turn(), "exec", "short") == "short"
+
+
+async def test_large_result_is_previewed_and_pageable(tmp_path) -> None:
+    store = ToolResultStore(tmp_path, max_chars=3000)
+    turn = store.new_turn()
+    result = "".join(f"{i:05d}\n" for i in range(2000))
+
+    preview = store.spill(turn, "read_file", result)
+    assert len(preview) < len(result)
+    assert preview.startswith(result[:100])
+
+    tool = ReadResultTool(store)
+    page = await tool.execute(handle=_handle(preview), offset=6000, limit=12)
+    assert page.startswith("01000\n01001\n")
+    assert "next offset=6012" in page
+
+    store.discard(turn)
+    assert "not found" in await tool.execute(handle=_handle(preview))
+
+
+async def test_invalid_handle_is_rejected(tmp_path) -> None:
+    tool = ReadResultTool(ToolResultStore(tmp_path))
+    assert "Invalid result handle" in await tool.execute(handle="../../etc-passwd")
+
+
+async def test_pages_and_previews_fit_in_max_chars(tmp_path) -> None:
+    store = ToolResultStore(tmp_path, max_chars=1000)
+    turn = store.new_turn()
+    result = "x" * 1500
+
+    preview = store.spill(turn, "exec", result)
+    assert len(preview) <= 1000
+
+    page = await ReadResultTool(store).execute(handle=_handle(preview))
+    assert len(page) <= 1000
+    assert store.spill(turn, "read_result", page) == page
+    assert store.spill(turn, "read_result", "y" * 5000) == "y" * 5000  # never re-spilled
@@ -1,6 +1,7 @@
+import asyncio
 from typing import Any
 
-from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.base import BARRIER, Tool
 from nanobot.agent.tools.registry import ToolRegistry
 
 
@@ -86,3 +87,95 @@ async def test_registry_returns_validation_error() -> None:
     reg.register(SampleTool())
     result = await reg.execute("sample", {"query": "hi"})
     assert "Invalid parameters" in result
+
+
+class SleepTool(Tool):
+    def __init__(self, name: str, read_only: bool, log: list[str]):
+        self._name = name
+        self._read_only = read_only
+        self._log = log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleeps then echoes"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {"key": {"type": "string"}, "delay": {"type": "number"}},
+        }
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    def conflict_key(self, params: dict[str, Any]) -> str | None:
+        return params.get("key")
+
+    async def execute(self, key: str | None = None, delay: float = 0, **kwargs: Any) -> str:
+        self._log.append(f"start {self.name} {key}")
+        await asyncio.sleep(delay)
+        self._log.append(f"end {self.name} {key}")
+        return f"{self.name}:{key}"
+
+
+async def test_execute_many_keeps_call_order_and_runs_concurrently() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("fetch", True, log))
+    results = await reg.execute_many([
+        ("fetch", {"key": "a", "delay": 0.05}),
+        ("fetch", {"key": "b", "delay": 0}),
+    ])
+    assert results == ["fetch:a", "fetch:b"]
+    assert log.index("end fetch b") < log.index("end fetch a")
+
+
+async def test_execute_many_serializes_conflicting_writes() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("write", False, log))
+    reg.register(SleepTool("read", True, log))
+    results = await reg.execute_many([
+        ("write", {"key": "p", "delay": 0.05}),
+        ("read", {"key": "p", "delay": 0}),
+        ("write", {"key": "q", "delay": 0}),
+    ])
+    assert results == ["write:p", "read:p", "write:q"]
+    assert log.index("end write p") < log.index("start read p")
+    assert log.index("end write q") < log.index("end write p")
+
+
+async def test_exec_is_a_barrier_for_file_tools(tmp_path) -> None:
+    from nanobot.agent.tools.filesystem import ReadFileTool
+    from nanobot.agent.tools.shell import ExecTool
+
+    reg = ToolRegistry()
+    reg.register(ExecTool(working_dir=str(tmp_path)))
+    reg.register(ReadFileTool())
+    # The shell's relative path and read_file's absolute path share no key
+    results = await reg.execute_many([
+        ("exec", {"command": "sleep 0.1; echo fresh > out.txt"}),
+        ("read_file", {"path": str(tmp_path / "out.txt")}),
+    ])
+    assert "fresh" in results[1]
+
+
+async def test_read_only_calls_overlap_a_barrier() -> None:
+    log: list[str] = []
+    reg = ToolRegistry()
+    reg.register(SleepTool("shell", False, log))
+    reg.register(SleepTool("fetch", True, log))
+    reg.register(SleepTool("write", False, log))
+    reg.get("shell").conflict_key = lambda params: BARRIER
+    await reg.execute_many([
+        ("shell", {"delay": 0.05}),
+        ("fetch", {"delay": 0}),  # read-only and unkeyed: runs alongside
+        ("write", {"key": "p", "delay": 0}),  # side effects: waits for the shell
+    ])
+    assert log.index("end fetch None") < log.index("end shell None") < log.index("start write p")
@@ -0,0 +1,129 @@
+"""Test the revalidating disk cache of web_fetch."""
+
+import asyncio
+import json
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.agent.tools.web_cache import CachedPage, FetchCache, freshness
+from nanobot.utils.http import shared_http
+
+PAGE = b"<html><head><title>Docs</title></head><body><article><p>Install with pip.</p></article></body></html>"
+
+
+class PageServer:
+    """Serves PAGE with the given cache headers and answers If-None-Match with 304."""
+
+    def __init__(self, cache_headers: str):
+        self.cache_headers = cache_headers
+        self.full = 0
+        self.not_modified = 0
+
+    async def __aenter__(self) -> "PageServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/docs"
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        await shared_http().aclose()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while request := await reader.readuntil(b"\r\n\r\n"):
+                if b'if-none-match: "v1"' in request.lower():
+                    self.not_modified += 1
+                    writer.write(f'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\n{self.cache_headers}\r\n'.encode())
+                else:
+                    self.full += 1
+                    writer.write(
+                        f'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\nETag: "v1"\r\n'
+                        f"{self.cache_headers}Content-Length: {len(PAGE)}\r\n\r\n".encode() + PAGE
+                    )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class CountingFetchTool(WebFetchTool):
+    extractions = 0
+
+    def _extract(self, page, mode):
+        self.extractions += 1
+        return super()._extract(page, mode)
+
+
+async def _fetch(tool: WebFetchTool, url: str, mode: str = "markdown") -> dict:
+    return json.loads(await tool.execute(url, extractMode=mode))
+
+
+def test_freshness_rules() -> None:
+    now = formatdate(usegmt=True)
+    assert freshness({"cache-control": "max-age=60", "age": "10"}) == 50
+    assert freshness({"cache-control": "no-store, max-age=60"}) is None
+    assert freshness({"cache-control": "no-cache", "expires": formatdate(usegmt=True)}) == 0
+    assert freshness({"date": now, "expires": formatdate(time.time() + 120, usegmt=True)}) >= 119
+    week_old = formatdate(time.time() - 7 * 24 * 3600, usegmt=True)
+    assert 60000 < freshness({"date": now, "last-modified": week_old}) <= 24 * 3600
+    assert freshness({}) == 0
+
+
+async def test_fresh_pages_are_served_from_cache(tmp_path: Path) -> None:
+    tool = CountingFetchTool(cache=FetchCache(tmp_path / "web.db"))
+    async with PageServer("Cache-Control: max-age=60\r\n") as server:
+        first = await _fetch(tool, server.url)
+        second = await _fetch(tool, server.url)
+        text_mode = await _fetch(tool, server.url, mode="text")
+
+    assert (first["cache"], second["cache"], text_mode["cache"]) == ("miss", "hit", "hit")
+    assert second["text"] == first["text"] and "Install with pip." in first["text"]
+    assert server.full == 1
+    assert tool.extractions == 2  # once per extract mode
+
+
+async def test_stale_pages_are_revalidated_without_reparsing(tmp_path: Path) -> None:
+    tool = CountingFetchTool(cache=FetchCache(tmp_path / "web.db"))
+    async with PageServer("Cache-Control: no-cache\r\n") as server:
+        first = await _fetch(tool, server.url)
+        second = await _fetch(tool, server.url)
+
+    assert (first["cache"], second["cache"]) == ("miss", "revalidated")
+    assert second["text"] == first["text"]
+    assert (server.full, server.not_modified) == (1, 1)
+    assert tool.extractions == 1
+
+
+async def test_no_store_is_never_cached(tmp_path: Path) -> None:
+    tool = CountingFetchTool(cache=FetchCache(tmp_path / "web.db"))
+    async with PageServer("Cache-Control: no-store\r\n") as server:
+        await _fetch(tool, server.url)
+        second = await _fetch(tool, server.url)
+
+    assert second["cache"] == "miss"
+    assert server.full == 2
+    assert tool.extractions == 2
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path: Path) -> None:
+    cache = FetchCache(tmp_path / "web.db", max_bytes=2400)  # a (with extraction) 900, b 800, c 800
+    headers = {"cache-control": "max-age=60"}
+
+    def page(url: str) -> CachedPage:
+        return CachedPage(url=url, final_url=url, status=200, content_type="text/plain",
+                          encoding="utf-8", body=url.encode() * 100)
+
+    assert cache.put(page("http://a"), headers)
+    cache.put_extraction("http://a", "text", page("http://a").body_hash, "a" * 100, "raw")
+    assert cache.put(page("http://b"), headers)
+    assert cache.get("http://a") is not None  # a is now more recent than b
+    assert cache.put(page("http://c"), headers)
+
+    assert cache.get("http://b") is None
+    assert cache.get("http://a") is not None
+    assert cache.get("http://c") is not None
+    assert cache.get_extraction("http://a", "text", page("http://a").body_hash) == ("a" * 100, "raw")
@@ -0,0 +1,74 @@
+"""Test that web_fetch streams bodies and stops at the download cap."""
+
+import asyncio
+import json
+
+from nanobot.agent.tools.web import WebFetchTool
+from nanobot.utils.http import shared_http
+
+
+class StreamServer:
+    """Serves chunked bodies per path: endless text, a PNG, binary labelled as HTML, and UTF-8 text."""
+
+    async def __aenter__(self) -> "StreamServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}"
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+        await shared_http().aclose()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            path = request.split(b" ")[1].decode()
+            ctype, chunk, count = {
+                "/endless": ("text/plain; charset=utf-8", b"x" * 4096, None),
+                "/image": ("image/png", b"\x89PNG" + b"\x00" * 4092, None),
+                "/mislabeled": ("text/html", b"\x00\x01\x02" * 1000, 1),
+                "/utf8": ("text/plain; charset=utf-8", "é".encode() * 1000, 1),
+            }[path]
+            writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {ctype}\r\nTransfer-Encoding: chunked\r\n\r\n".encode())
+            n = 0
+            while count is None or n < count:
+                writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                await writer.drain()
+                n += 1
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _fetch(url: str, max_chars: int) -> dict:
+    return json.loads(await WebFetchTool().execute(url, extractMode="text", maxChars=max_chars))
+
+
+async def test_endless_stream_is_cut_at_the_cap() -> None:
+    async with StreamServer() as server:
+        # Buffering the whole response would never finish
+        result = await asyncio.wait_for(_fetch(f"{server.base}/endless", 1000), timeout=10)
+
+    assert result["truncated"] is True
+    assert result["length"] == 1000
+
+
+async def test_binary_content_is_rejected() -> None:
+    async with StreamServer() as server:
+        image = await _fetch(f"{server.base}/image", 1000)
+        mislabeled = await _fetch(f"{server.base}/mislabeled", 1000)
+
+    assert "binary" in image["error"]
+    assert "binary" in mislabeled["error"]
+
+
+async def test_multibyte_characters_are_not_split() -> None:
+    async with StreamServer() as server:
+        result = await _fetch(f"{server.base}/utf8", 101)
+
+    assert result["truncated"] is True
+    assert result["text"] == "é" * 101
@@ -0,0 +1,82 @@
+"""Test web_search caching, single-flight and multi-query merging."""
+
+import asyncio
+
+from nanobot.agent.tools.web import WebSearchTool
+from nanobot.agent.tools.web_cache import SearchCache, normalize_query
+
+RESULTS = {
+    "python asyncio tutorial": [
+        {"title": "Asyncio docs", "url": "https://docs.python.org/3/library/asyncio.html", "description": "Docs"},
+        {"title": "Real Python", "url": "https://realpython.com/async-io-python/", "description": ""},
+    ],
+    "asyncio examples": [
+        {"title": "Docs again", "url": "https://www.docs.python.org/3/library/asyncio.html/", "description": ""},
+        {"title": "Examples", "url": "https://example.com/asyncio#top", "description": "Snippets"},
+    ],
+}
+
+
+class FakeSearchTool(WebSearchTool):
+    """Answers from RESULTS instead of the Brave API, after a short delay."""
+
+    def __init__(self, cache: SearchCache):
+        super().__init__(api_key="test", cache=cache)
+        self.requests: list[str] = []
+
+    async def _request(self, query: str, count: int) -> list[dict]:
+        self.requests.append(query)
+        await asyncio.sleep(0.02)
+        if query == "broken":
+            raise RuntimeError("HTTP 500")
+        return RESULTS[normalize_query(query)][:count]
+
+
+def test_query_normalization() -> None:
+    assert normalize_query("Python  asyncio TUTORIAL") == normalize_query("the python asyncio tutorial?")
+    assert normalize_query('"The Who" site:example.com') == normalize_query('"the who"   site:example.com')
+    assert normalize_query('"the who"') != normalize_query("who")
+    assert normalize_query("the") == "the"  # only stopwords: keep them
+
+
+def test_term_order_is_kept() -> None:
+    assert normalize_query("flights from paris to london") != normalize_query("flights from london to paris")
+    assert normalize_query("convert java to python") != normalize_query("convert python to java")
+    assert normalize_query("flights to paris") != normalize_query("flights from paris")
+    assert normalize_query("python asyncio tutorial") != normalize_query("tutorial asyncio python")
+
+
+async def test_results_are_cached_across_tools() -> None:
+    cache = SearchCache(ttl=60)
+    first, second = FakeSearchTool(cache), FakeSearchTool(cache)  # e.g. the agent and a subagent
+
+    a = await first.execute("python asyncio tutorial", count=2)
+    b = await second.execute("The Python asyncio tutorial", count=1)  # smaller count is served from the entry
+
+    assert first.requests == ["python asyncio tutorial"] and second.requests == []
+    assert "Asyncio docs" in a and "Asyncio docs" in b and "Real Python" not in b
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_concurrent_identical_searches_share_one_request() -> None:
+    tool = FakeSearchTool(SearchCache(ttl=0))  # no caching: only in-flight sharing
+    outputs = await asyncio.gather(*(tool.execute("python asyncio tutorial") for _ in range(5)))
+
+    assert tool.requests == ["python asyncio tutorial"]
+    assert len(set(outputs)) == 1
+    await tool.execute("python asyncio tutorial")
+    assert len(tool.requests) == 2
+
+
+async def test_multiple_queries_are_merged_and_deduplicated() -> None:
+    tool = FakeSearchTool(SearchCache(ttl=60))
+    out = await tool.execute(
+        "python asyncio tutorial", queries=["asyncio examples", "Python asyncio tutorial", "broken"], count=2
+    )
+
+    assert sorted(tool.requests) == ["asyncio examples", "broken", "python asyncio tutorial"]
+    assert out.startswith("Results for: python asyncio tutorial; asyncio examples; broken")
+    # Interleaved by rank; the www./trailing-slash duplicate of the docs page is dropped
+    assert out.index("Asyncio docs") < out.index("Real Python") < out.index("Examples")
+    assert "Docs again" not in out
+    assert "Error for 'broken': HTTP 500" in out